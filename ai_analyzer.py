@@ -1,25 +1,306 @@
 import os
 import json
+import queue
 import logging
 import re
 import requests
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from requests.adapters import HTTPAdapter
 import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from urllib.parse import urlsplit
+from result_cache import ResultCache, make_cache_key, normalize_text
+from circuit_breaker import CircuitBreaker
+from deadline import DeadlineExceeded, current_deadline, remaining_timeout, with_current_context
+from rule_packs import rule_bundles
+from scoring import score_batch
+from skill_taxonomy import skill_matcher
+from job_description import parse_job_description, job_description_fingerprint
+from text_locator import TextLocator
+from json_extractor import JsonStreamExtractor, extract_array_objects, extract_json_object
 
 # Groq API configuration
 GROQ_API_KEY = os.environ.get("XAI_API_KEY", "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")
 GROQ_MODEL = "llama3-70b-8192"  # Using Llama-3 70B model
 
-# Initialize Groq client
-groq_client = None
+# Bump when the analysis or scoring prompts change so cached results are not reused
+PROMPT_VERSION = "2"
+# Bump when the cover letter prompt or its style settings change
+ANSCHREIBEN_PROMPT_VERSION = "1"
+ANSCHREIBEN_TEMPERATURE = 0.7
+
+# Stored with analysis results so that only results of the current model and prompts are reused
+ANALYSIS_MODEL_VERSION = f"{GROQ_MODEL}:{PROMPT_VERSION}"
+RULES_MODEL_VERSION = "rules"
+# Stored with LLM analyses that lack the suggestions of failed chunks; shown, but neither cached nor reused
+PARTIAL_MODEL_VERSION = f"{ANALYSIS_MODEL_VERSION}:partial"
+
+# Analysis mode: 'split' sends separate correction and scoring requests,
+# 'combined' asks for both in a single request
+ANALYSIS_MODE = os.environ.get("ANALYSIS_MODE", "split")
+
+# Long CVs are analyzed in chunks of this many characters instead of being truncated
+ANALYSIS_CHUNK_CHARS = int(os.environ.get("ANALYSIS_CHUNK_CHARS", "2500"))
+# Maximum number of chunk requests in flight per CV
+ANALYSIS_CHUNK_CONCURRENCY = int(os.environ.get("ANALYSIS_CHUNK_CONCURRENCY", "4"))
+# Characters of (whitespace-condensed) CV text sent with scoring requests
+SCORE_MAX_CHARS = int(os.environ.get("SCORE_MAX_CHARS", "6000"))
+# Category scores every score must have
+SCORE_CATEGORIES = ("content", "format", "language", "conciseness")
+
+# Shared pool for chunk requests; the per-CV limit is enforced in analyze_in_chunks
+chunk_executor = ThreadPoolExecutor(max_workers=int(os.environ.get("ANALYSIS_CHUNK_WORKERS", "16")), thread_name_prefix="chunk")
+
+# Caches for LLM results (only successful API results are stored)
+analysis_cache = ResultCache("analysis")
+score_cache = ResultCache("score")
+anschreiben_cache = ResultCache("anschreiben")
+
+# Model versions of the analysis parts produced in the current context (see track_result_versions)
+_result_versions = contextvars.ContextVar("result_versions", default=None)
+
+# Compile the rule packs at startup so an invalid pack fails before serving requests
+rule_bundles.load()
+
+# Connection pool configuration shared by all outbound provider calls
+HTTP_POOL_CONNECTIONS = int(os.environ.get("HTTP_POOL_CONNECTIONS", "10"))  # Number of hosts to keep pools for
+HTTP_POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", "20"))  # Keep-alive connections per host
+HTTP_KEEPALIVE_EXPIRY = float(os.environ.get("HTTP_KEEPALIVE_EXPIRY", "60"))  # Seconds an idle connection is kept (both clients)
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.environ.get("HTTP_READ_TIMEOUT", "45"))
+
+# Pooled clients are created lazily once per process, so forked workers never share sockets
+_http_pool_lock = threading.Lock()
+_http_session = None
+_http_session_pid = None
+_groq_client = None
+_groq_client_pid = None
+_groq_client_failed = False
+
 try:
     from groq import Groq
-    groq_client = Groq(api_key=GROQ_API_KEY)
-    logging.info("Groq client initialized successfully")
+    import httpx
 except ImportError:
+    Groq = None
     logging.error("Failed to import Groq client. Make sure the groq package is installed.")
-except Exception as e:
-    logging.error(f"Error initializing Groq client: {str(e)}")
+
+
+class KeepaliveExpiryAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that drops pooled connections after they were idle for a while.
+    
+    urllib3 keeps idle connections until the server closes them, unlike httpx's
+    keepalive_expiry. Here a host's idle connections are closed when the next request
+    to it is sent more than keepalive_expiry seconds after the previous one finished.
+    """
+    
+    def __init__(self, keepalive_expiry, **kwargs):
+        self.keepalive_expiry = keepalive_expiry
+        self._last_used = {}  # (scheme, host) -> time.monotonic() of the last request
+        self._last_used_lock = threading.Lock()
+        super().__init__(**kwargs)
+    
+    def send(self, request, **kwargs):
+        host = urlsplit(request.url)[:2]
+        with self._last_used_lock:
+            last_used = self._last_used.get(host)
+        if last_used is not None and time.monotonic() - last_used > self.keepalive_expiry:
+            self._close_idle_connections(request, kwargs)
+        try:
+            return super().send(request, **kwargs)
+        finally:
+            with self._last_used_lock:
+                self._last_used[host] = time.monotonic()
+    
+    def _close_idle_connections(self, request, kwargs):
+        pool = self.get_connection_with_tls_context(request, kwargs.get("verify", True),
+                                                    kwargs.get("proxies"), kwargs.get("cert"))
+        idle = pool.pool
+        if idle is None:
+            return
+        connections = []
+        while True:
+            try:
+                connections.append(idle.get(block=False))
+            except queue.Empty:
+                break
+        # The pool holds None for each free slot; new connections are opened on demand
+        for connection in connections:
+            if connection is not None:
+                connection.close()
+            idle.put(None)
+
+
+def get_http_session():
+    """
+    Get the per-process pooled HTTP session for REST provider calls.
+    
+    Returns:
+        requests.Session: Session with keep-alive connection pools per host
+    """
+    global _http_session, _http_session_pid
+    
+    pid = os.getpid()
+    if _http_session is None or _http_session_pid != pid:
+        with _http_pool_lock:
+            if _http_session is None or _http_session_pid != pid:
+                session = requests.Session()
+                adapter = KeepaliveExpiryAdapter(HTTP_KEEPALIVE_EXPIRY, pool_connections=HTTP_POOL_CONNECTIONS,
+                                                 pool_maxsize=HTTP_POOL_MAXSIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _http_session = session
+                _http_session_pid = pid
+    return _http_session
+
+
+def get_groq_client():
+    """
+    Get the per-process Groq client backed by a keep-alive connection pool.
+    
+    Returns:
+        Groq: The client, or None if the groq package is unavailable
+    """
+    global _groq_client, _groq_client_pid, _groq_client_failed
+    
+    if Groq is None or _groq_client_failed:
+        return None
+    
+    pid = os.getpid()
+    if _groq_client is None or _groq_client_pid != pid:
+        with _http_pool_lock:
+            if _groq_client is None or _groq_client_pid != pid:
+                try:
+                    http_client = httpx.Client(
+                        limits=httpx.Limits(
+                            max_connections=HTTP_POOL_MAXSIZE,
+                            max_keepalive_connections=HTTP_POOL_MAXSIZE,
+                            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+                        ),
+                        timeout=httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT)
+                    )
+                    _groq_client = Groq(api_key=GROQ_API_KEY, http_client=http_client)
+                    _groq_client_pid = pid
+                    logging.info("Groq client initialized successfully")
+                except Exception as e:
+                    _groq_client_failed = True
+                    logging.error(f"Error initializing Groq client: {str(e)}")
+                    return None
+    return _groq_client
+
+
+# Circuit breakers let requests skip a degraded provider and go straight to the rule-based path
+groq_breaker = CircuitBreaker("groq")
+huggingface_breaker = CircuitBreaker("huggingface")
+
+
+def groq_call_allowed():
+    """
+    Check whether a Groq call should be attempted.
+    
+    Returns:
+        bool: True if the client is available and the circuit breaker lets the call through
+    """
+    if not get_groq_client():
+        return False
+    if not groq_breaker.allow_request():
+        logging.warning("Groq circuit breaker is open, using rule-based fallback")
+        return False
+    return True
+
+
+def record_provider_failure(breaker, start_time):
+    """
+    Record a failed provider call in its circuit breaker.
+    
+    Calls that failed because the request deadline ran out are not recorded:
+    running out of request budget says nothing about the provider's health.
+    
+    Args:
+        breaker (CircuitBreaker): Breaker of the provider
+        start_time (float): time.monotonic() when the call started
+    """
+    deadline = current_deadline()
+    if deadline is None or not deadline.expired:
+        breaker.record_failure(time.monotonic() - start_time)
+
+
+def deadline_bound_groq_client():
+    """Get the Groq client, bounded by the request deadline if one is active."""
+    client = get_groq_client()
+    # Retries would overrun the budget
+    if current_deadline() is not None:
+        client = client.with_options(timeout=remaining_timeout(HTTP_READ_TIMEOUT), max_retries=0)
+    return client
+
+
+def groq_chat_completion(**kwargs):
+    """
+    Create a Groq chat completion and record its outcome in the circuit breaker.
+    
+    When a request deadline is active, the call times out when the budget runs out.
+    Use groq_chat_stream for streamed completions.
+    
+    Args:
+        **kwargs: Arguments for chat.completions.create (the model is filled in)
+        
+    Returns:
+        The Groq response
+    """
+    client = deadline_bound_groq_client()
+    start_time = time.monotonic()
+    try:
+        response = client.chat.completions.create(model=GROQ_MODEL, **kwargs)
+    except Exception:
+        record_provider_failure(groq_breaker, start_time)
+        raise
+    groq_breaker.record_success(time.monotonic() - start_time)
+    return response
+
+
+def groq_chat_stream(**kwargs):
+    """
+    Stream a Groq chat completion and record its outcome in the circuit breaker.
+    
+    The outcome is recorded once, when the stream ends, with the latency of the
+    whole stream: a stream that breaks off is one failed call, not a success
+    followed by a failure. A stream the caller stops reading is not recorded.
+    
+    The timeout only bounds each read, so a stream that keeps trickling could
+    outlast the request deadline; the budget is checked after every chunk and
+    the stream is closed once it is spent.
+    
+    Args:
+        **kwargs: Arguments for chat.completions.create (the model and stream flag are filled in)
+        
+    Yields:
+        Completion chunks
+    """
+    client = deadline_bound_groq_client()
+    start_time = time.monotonic()
+    stream = None
+    try:
+        stream = client.chat.completions.create(model=GROQ_MODEL, stream=True, **kwargs)
+        deadline = current_deadline()
+        for chunk in stream:
+            if deadline is not None and deadline.expired:
+                raise DeadlineExceeded(f"{deadline.name} deadline of {deadline.budget_seconds}s exceeded while streaming")
+            yield chunk
+    except GeneratorExit:
+        raise
+    except Exception:
+        record_provider_failure(groq_breaker, start_time)
+        raise
+    else:
+        groq_breaker.record_success(time.monotonic() - start_time)
+    finally:
+        if stream is not None:
+            stream.close()
+
 
 # Headers for API requests (REST API fallback)
 groq_headers = {
@@ -37,6 +318,33 @@ huggingface_headers = {
     "Content-Type": "application/json"
 }
 
+@contextmanager
+def track_result_versions():
+    """
+    Record which model produced each part of the analyses run inside the block.
+    
+    The dictionary is shared with executor threads started through
+    with_current_context, so parts computed there are recorded as well.
+    
+    Yields:
+        dict: "analysis" and/or "score" -> ANALYSIS_MODEL_VERSION, PARTIAL_MODEL_VERSION
+        (analysis only) or RULES_MODEL_VERSION
+    """
+    versions = {}
+    token = _result_versions.set(versions)
+    try:
+        yield versions
+    finally:
+        _result_versions.reset(token)
+
+
+def record_result_version(part, model_version):
+    """Record the model version of an analysis part if track_result_versions is active."""
+    versions = _result_versions.get()
+    if versions is not None:
+        versions[part] = model_version
+
+
 def analyze_resume(resume_text, language='en'):
     """
     Analyze CV text using AI to provide improvement suggestions.
@@ -52,12 +360,29 @@ def analyze_resume(resume_text, language='en'):
         # First try to use Groq API for comprehensive analysis
         logging.info(f"Analyzing resume with language: {language}")
         
-        if groq_client:
+        # Return a cached result if the same CV was analyzed recently
+        cache_key = make_cache_key("analysis", normalize_text(resume_text), language, GROQ_MODEL, PROMPT_VERSION)
+        cached_corrections = analysis_cache.get(cache_key)
+        if cached_corrections is not None:
+            logging.info(f"Using cached analysis with {len(cached_corrections)} suggestions")
+            record_result_version("analysis", ANALYSIS_MODEL_VERSION)
+            return relocate_corrections(resume_text, cached_corrections)
+        
+        if groq_call_allowed():
             try:
                 logging.info("Attempting to use Groq API for CV analysis")
-                corrections = analyze_with_groq(resume_text, language)
+                if len(resume_text) > ANALYSIS_CHUNK_CHARS:
+                    corrections, complete = analyze_in_chunks(resume_text, language)
+                else:
+                    corrections, complete = analyze_with_groq(resume_text, language)
+                if corrections and not complete:
+                    logging.warning(f"Groq API analysis incomplete, returning {len(corrections)} suggestions without caching them")
+                    record_result_version("analysis", PARTIAL_MODEL_VERSION)
+                    return corrections
                 if corrections:
                     logging.info(f"Groq API analysis successful, found {len(corrections)} suggestions")
+                    analysis_cache.set(cache_key, corrections)
+                    record_result_version("analysis", ANALYSIS_MODEL_VERSION)
                     return corrections
                 logging.warning("Groq API returned no corrections")
             except Exception as api_error:
@@ -66,6 +391,7 @@ def analyze_resume(resume_text, language='en'):
         # Fallback to rules-based analysis
         logging.info("Using enhanced fallback analysis for CV corrections")
         fallback_corrections = perform_enhanced_analysis(resume_text, language)
+        record_result_version("analysis", RULES_MODEL_VERSION)
         return fallback_corrections
     
     except Exception as e:
@@ -74,8 +400,201 @@ def analyze_resume(resume_text, language='en'):
         
         # Instead of raising the exception, return basic fallback corrections
         logging.info("Using basic fallback analysis due to error.")
+        record_result_version("analysis", RULES_MODEL_VERSION)
         return perform_fallback_analysis(resume_text)
 
+def split_text_into_chunks(text, max_chunk_length=ANALYSIS_CHUNK_CHARS):
+    """
+    Split text into chunks at section, line or sentence boundaries, keeping offsets.
+    
+    Unlike split_text_into_segments, chunks are exact slices of the input, so
+    positions found inside a chunk map back to the full text by adding its offset.
+    
+    Args:
+        text (str): The text to split
+        max_chunk_length (int): Maximum length of each chunk
+        
+    Returns:
+        list: (start offset, chunk text) tuples covering the whole text
+    """
+    # Candidate split points, from most to least preferred
+    boundary_patterns = [r'\n\s*\n', r'\n', r'(?<=[.!?])\s+', r'\s+']
+    
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + max_chunk_length, len(text))
+        if end < len(text):
+            window = text[start:end]
+            split_at = None
+            for pattern in boundary_patterns:
+                # Use the last boundary in the window, but not one that leaves a tiny chunk
+                matches = [m for m in re.finditer(pattern, window) if m.end() > max_chunk_length // 2]
+                if matches:
+                    split_at = start + matches[-1].end()
+                    break
+            if split_at:
+                end = split_at
+        
+        chunk = text[start:end]
+        if chunk.strip():
+            chunks.append((start, chunk))
+        start = end
+    
+    return chunks
+
+def merge_corrections(correction_lists):
+    """
+    Merge corrections from several chunks, dropping duplicates.
+    
+    Args:
+        correction_lists (list): Lists of corrections with full-text positions
+        
+    Returns:
+        list: Corrections ordered by position, each span and suggestion reported once
+    """
+    merged = []
+    seen = set()
+    for correction in sorted((c for corrections in correction_lists for c in corrections),
+                             key=lambda c: (c["position"]["start"], c["position"]["end"])):
+        key = (correction["position"]["start"], correction["position"]["end"], correction["suggestion"].strip().lower())
+        if key in seen:
+            continue
+        seen.add(key)
+        merged.append(correction)
+    return merged
+
+def analyze_in_chunks(resume_text, language='en'):
+    """
+    Analyze a long CV by sending its chunks to Groq concurrently.
+    
+    Args:
+        resume_text (str): The full CV text
+        language (str): Language for the analysis ('en' or 'de')
+        
+    Returns:
+        tuple: (deduplicated corrections with positions in the full text,
+        False if any chunk failed or timed out and its suggestions are missing)
+    """
+    chunks = split_text_into_chunks(resume_text, ANALYSIS_CHUNK_CHARS)
+    logging.info(f"Analyzing long CV ({len(resume_text)} chars) in {len(chunks)} chunks")
+    
+    results = []
+    failed_chunks = 0
+    pending = list(chunks)
+    in_flight = {}
+    
+    # Keep at most ANALYSIS_CHUNK_CONCURRENCY chunk requests running for this CV
+    while pending or in_flight:
+        while pending and len(in_flight) < ANALYSIS_CHUNK_CONCURRENCY:
+            chunk_start, chunk_text = pending.pop(0)
+            future = chunk_executor.submit(with_current_context(analyze_with_groq), chunk_text, language)
+            in_flight[future] = chunk_start
+        
+        future = next(as_completed(in_flight))
+        chunk_start = in_flight.pop(future)
+        try:
+            chunk_corrections, complete = future.result()
+        except Exception as e:
+            logging.error(f"Error analyzing chunk at offset {chunk_start}: {str(e)}")
+            failed_chunks += 1
+            continue
+        if not complete:
+            logging.warning(f"Analysis of chunk at offset {chunk_start} is incomplete")
+            failed_chunks += 1
+        
+        # Map chunk-relative positions to full-text offsets
+        for correction in chunk_corrections:
+            correction["position"] = {
+                "start": correction["position"]["start"] + chunk_start,
+                "end": correction["position"]["end"] + chunk_start
+            }
+        results.append(chunk_corrections)
+    
+    if failed_chunks:
+        logging.warning(f"{failed_chunks} of {len(chunks)} chunks failed, the analysis is partial")
+    return merge_corrections(results), not failed_chunks
+
+def condense_resume_text(resume_text, max_length=SCORE_MAX_CHARS):
+    """
+    Shrink CV text for prompts that need the whole document but not exact offsets.
+    
+    Args:
+        resume_text (str): The CV text
+        max_length (int): Maximum length of the result
+        
+    Returns:
+        str: Text with runs of spaces collapsed and blank lines reduced, truncated to max_length
+    """
+    text = re.sub(r'[ \t\r\f\v]+', ' ', resume_text)
+    text = re.sub(r' ?\n ?', '\n', text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    return text.strip()[:max_length]
+
+def relocate_corrections(resume_text, corrections):
+    """
+    Re-anchor cached corrections to the current CV text.
+    
+    Cache keys ignore whitespace, so a cached result may have been computed for a
+    text whose offsets differ slightly from the submitted one.
+    
+    Args:
+        resume_text (str): The CV text the corrections should point into
+        corrections (list): Cached correction dictionaries
+        
+    Returns:
+        list: Copies of the corrections with positions valid for resume_text
+    """
+    relocated = []
+    moved = []
+    for correction in corrections:
+        original_text = correction.get("original", "")
+        start_pos = correction.get("position", {}).get("start")
+        
+        correction = dict(correction)
+        if start_pos is None or resume_text[start_pos:start_pos + len(original_text)] != original_text:
+            moved.append(correction)
+        else:
+            correction["position"] = {"start": start_pos, "end": start_pos + len(original_text)}
+        relocated.append(correction)
+    
+    if moved:
+        # Resolve all corrections whose offsets shifted in one pass over the text
+        spans = TextLocator(resume_text).locate_all([correction.get("original", "") for correction in moved])
+        for correction, span in zip(moved, spans):
+            if span is None:
+                correction["position"] = None
+                continue
+            correction["original"] = resume_text[span[0]:span[1]]
+            correction["position"] = {"start": span[0], "end": span[1]}
+    
+    return [correction for correction in relocated if correction["position"] is not None]
+
+def get_cache_stats():
+    """
+    Get hit/miss counters for the LLM result caches.
+    
+    Returns:
+        dict: Statistics per cache name
+    """
+    return {
+        "analysis": analysis_cache.get_stats(),
+        "score": score_cache.get_stats(),
+        "anschreiben": anschreiben_cache.get_stats()
+    }
+
+def get_provider_stats():
+    """
+    Get the circuit breaker state for each provider.
+    
+    Returns:
+        dict: Breaker statistics per provider name
+    """
+    return {
+        "groq": groq_breaker.get_stats(),
+        "huggingface": huggingface_breaker.get_stats()
+    }
+
 def split_text_into_segments(text, max_segment_length=200):
     """
     Split text into manageable segments for API processing.
@@ -132,17 +651,31 @@ def analyze_segment(segment, full_text):
         if not HUGGINGFACE_API_KEY:
             logging.error("No Hugging Face API key provided")
             return []
+        
+        if not huggingface_breaker.allow_request():
+            logging.warning("Hugging Face circuit breaker is open, skipping segment")
+            return []
             
         # Prepare payload
         payload = json.dumps({"inputs": segment})
         
         # Make request to Hugging Face API
-        response = requests.post(
-            HUGGINGFACE_API_URL,
-            headers=huggingface_headers,
-            data=payload,
-            timeout=10  # 10 second timeout
-        )
+        start_time = time.monotonic()
+        try:
+            response = get_http_session().post(
+                HUGGINGFACE_API_URL,
+                headers=huggingface_headers,
+                data=payload,
+                timeout=(HTTP_CONNECT_TIMEOUT, remaining_timeout(10))  # 10 second read timeout
+            )
+        except requests.exceptions.RequestException:
+            record_provider_failure(huggingface_breaker, start_time)
+            raise
+        
+        if response.status_code >= 500:
+            huggingface_breaker.record_failure(time.monotonic() - start_time)
+        else:
+            huggingface_breaker.record_success(time.monotonic() - start_time)
         
         # Check for successful response
         if response.status_code == 200:
@@ -203,142 +736,68 @@ def perform_fallback_analysis(text):
     Returns:
         list: List of corrections
     """
-    corrections = []
-    
-    # Common CV improvements to check for
-    checks = [
-        {
-            "pattern": r"\bresponsible for\b",
-            "replacement": "managed",
-            "explanation": "Use action verbs instead of passive phrases",
-            "category": "clarity"
-        },
-        {
-            "pattern": r"\bhelped\b",
-            "replacement": "assisted",
-            "explanation": "Use more professional terminology",
-            "category": "professional language"
-        },
-        {
-            "pattern": r"\bi\b",
-            "replacement": "",
-            "explanation": "Avoid using first-person pronouns in CVs",
-            "category": "professional language"
-        },
-        {
-            "pattern": r"\bteam player\b",
-            "replacement": "collaborative professional",
-            "explanation": "Avoid overused phrases and clichés",
-            "category": "content"
-        },
-        {
-            "pattern": r"\bms office\b",
-            "replacement": "Microsoft Office",
-            "explanation": "Use proper capitalization for product names",
-            "category": "formatting"
-        },
-        {
-            "pattern": r"\b(?:gute|sehr gute|ausgezeichnete)\s+kenntnisse\b",
-            "replacement": "Fortgeschrittene Kenntnisse",
-            "explanation": "Be more specific and professional in describing skills",
-            "category": "professional language"
-        },
-        {
-            "pattern": r"\bargts", 
-            "replacement": "arbeitet",
-            "explanation": "Use full words instead of abbreviations",
-            "category": "professional language"
-        },
-        {
-            "pattern": r"\binteragirt\b",
-            "replacement": "interagiert",
-            "explanation": "Fix spelling errors",
-            "category": "spelling"
-        },
-    ]
-    
-    for check in checks:
-        for match in re.finditer(check["pattern"], text, re.IGNORECASE):
-            start_pos = match.start()
-            end_pos = match.end()
-            original_text = text[start_pos:end_pos]
-            
-            # Create replacement based on case of original
-            if original_text.isupper():
-                replacement = check["replacement"].upper()
-            elif original_text[0].isupper():
-                replacement = check["replacement"].capitalize()
-            else:
-                replacement = check["replacement"]
-                
-            # Skip if replacement would be empty
-            if not replacement:
-                continue
-                
-            correction = {
-                "original": original_text,
-                "position": {"start": start_pos, "end": end_pos},
-                "suggestion": replacement,
-                "explanation": check["explanation"],
-                "category": check["category"]
-            }
-            
-            corrections.append(correction)
+    return rule_bundles.get_engine('fallback').apply(text)
+
+
+def anschreiben_cache_key(resume_text, job_description):
+    """
+    Build the cache key of a generated cover letter.
     
-    return corrections
+    Args:
+        resume_text (str): The CV text
+        job_description (str): The job description text
+        
+    Returns:
+        str: Key covering the CV, the job ad (or a near-identical one), the prompt style and the model
+    """
+    return make_cache_key("anschreiben", normalize_text(resume_text), job_description_fingerprint(job_description),
+                          ANSCHREIBEN_PROMPT_VERSION, ANSCHREIBEN_TEMPERATURE, GROQ_MODEL)
 
 
-def generate_anschreiben(resume_text, job_description):
+def get_cached_anschreiben(cache_key):
+    """Look up a generated cover letter and log the cache's hit rate on a hit."""
+    cached_text = anschreiben_cache.get(cache_key)
+    if cached_text is not None:
+        logging.info(f"Using cached Anschreiben (hit rate {anschreiben_cache.get_stats()['hit_rate']})")
+    return cached_text
+
+
+def generate_anschreiben(resume_text, job_description, regenerate=False):
     """
     Generate a personalized cover letter (Anschreiben) based on CV and job description.
     
+    Letters generated by Groq are cached per CV and job description, so repeated
+    requests for the same pair are answered without a new completion.
+    
     Args:
         resume_text (str): The CV text to analyze
         job_description (str): The job description text
+        regenerate (bool): Skip the cache and generate a new letter (which replaces the cached one)
         
     Returns:
         str: Generated cover letter text
     """
+    cache_key = anschreiben_cache_key(resume_text, job_description)
+    if not regenerate:
+        cached_text = get_cached_anschreiben(cache_key)
+        if cached_text is not None:
+            return cached_text
+    
     try:
         # Extract key info from resume and job description
         skills_info = extract_skills_from_resume(resume_text)
-        job_title = extract_job_title(job_description)
-        company_name = extract_company_name(job_description)
+        job = parse_job_description(job_description)
+        job_title, company_name = job.title, job.company
         
         # First try using Groq
-        if groq_client:
+        if groq_call_allowed():
             try:
                 logging.info("Using Groq to generate Anschreiben")
                 
-                system_prompt = """You are an expert in writing professional cover letters (Anschreiben) for 
-                German job applications. Create a formal, professional cover letter that matches the applicant's 
-                qualifications to the job requirements. Follow German business letter standards."""
-                
-                user_prompt = f"""Create a personalized cover letter (Anschreiben) in German based on the following information:
-                
-                CV Highlights:
-                Technical Skills: {', '.join(skills_info['technical_skills'][:5])}
-                Languages: {', '.join(skills_info['languages'][:3])}
-                Education: {', '.join(skills_info['education'][:2])}
-                Experience: {', '.join(skills_info['experience'][:3])}
-                
-                Job Position: {job_title}
-                Company: {company_name}
-                
-                Job Description:
-                {job_description[:500]}
-                
-                Format as a proper German business letter with all standard sections.
-                """
-                
                 # Make API call to Groq
-                response = groq_client.chat.completions.create(
-                    model=GROQ_MODEL,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    temperature=0.7,
+                response = groq_chat_completion(
+                    messages=build_anschreiben_messages(job_description, job_title, company_name, skills_info),
+                    temperature=ANSCHREIBEN_TEMPERATURE,
                     max_tokens=1000
                 )
                 
@@ -346,6 +805,8 @@ def generate_anschreiben(resume_text, job_description):
                 if response and response.choices and len(response.choices) > 0:
                     logging.info("Groq successfully generated Anschreiben")
                     anschreiben_text = response.choices[0].message.content
+                    if anschreiben_text:
+                        anschreiben_cache.set(cache_key, anschreiben_text)
                     return anschreiben_text
                 else:
                     logging.warning("Empty response from Groq API")
@@ -366,76 +827,163 @@ def generate_anschreiben(resume_text, job_description):
         try:
             logging.info("Using template-based approach as fallback")
             skills_info = extract_skills_from_resume(resume_text)
-            job_title = extract_job_title(job_description)
-            company_name = extract_company_name(job_description)
-            return generate_template_anschreiben(resume_text, job_description, job_title, company_name, skills_info)
+            job = parse_job_description(job_description)
+            return generate_template_anschreiben(resume_text, job_description, job.title, job.company, skills_info)
         except Exception as template_err:
             logging.error(f"Error in template fallback: {str(template_err)}")
             logging.error(f"Template fallback stack trace: {traceback.format_exc()}")
             return "Fehler bei der Erstellung des Anschreibens. Bitte versuchen Sie es später erneut."
 
 
-def extract_skills_from_resume(resume_text):
+def build_anschreiben_messages(job_description, job_title, company_name, skills_info):
     """
-    Extract skills and key information from CV text.
+    Build the chat messages for cover letter generation.
     
     Args:
-        resume_text (str): The CV text to analyze
+        job_description (str): The job description text
+        job_title (str): The extracted job title
+        company_name (str): The extracted company name
+        skills_info (dict): Extracted skills and information from the CV
         
     Returns:
-        dict: Extracted skills and information
+        list: System and user messages for the chat completion
     """
-    skills = {
-        "technical_skills": [],
-        "languages": [],
-        "education": [],
-        "experience": []
-    }
+    system_prompt = """You are an expert in writing professional cover letters (Anschreiben) for 
+    German job applications. Create a formal, professional cover letter that matches the applicant's 
+    qualifications to the job requirements. Follow German business letter standards."""
     
-    # Extract languages (simplified approach)
-    language_patterns = [
-        r"\b(?:Deutsch|Englisch|Französisch|Spanisch|Italienisch|Russisch|Chinesisch|Japanisch)\b(?:\s+\((?:Muttersprache|[BCG][12]|fließend|verhandlungssicher|Grundkenntnisse)\))?",
-        r"\b(?:German|English|French|Spanish|Italian|Russian|Chinese|Japanese)\b(?:\s+\((?:native|[BCG][12]|fluent|business|basic)\))?"
-    ]
+    user_prompt = f"""Create a personalized cover letter (Anschreiben) in German based on the following information:
     
-    for pattern in language_patterns:
-        matches = re.findall(pattern, resume_text, re.IGNORECASE)
-        skills["languages"].extend(matches)
+    CV Highlights:
+    Technical Skills: {', '.join(skills_info['technical_skills'][:5])}
+    Languages: {', '.join(skills_info['languages'][:3])}
+    Education: {', '.join(skills_info['education'][:2])}
+    Experience: {', '.join(skills_info['experience'][:3])}
     
-    # Extract technical skills (simplified)
-    tech_patterns = [
-        r"\b(?:Java|Python|C\+\+|JavaScript|SQL|PHP|HTML|CSS|React|Angular|Vue|Node\.js|Excel|Word|PowerPoint|SAP)\b"
-    ]
+    Job Position: {job_title}
+    Company: {company_name}
+    
+    Job Description:
+    {job_description[:500]}
     
-    for pattern in tech_patterns:
-        matches = re.findall(pattern, resume_text, re.IGNORECASE)
-        skills["technical_skills"].extend(matches)
+    Format as a proper German business letter with all standard sections.
+    """
     
-    # Extract education information (simplified)
-    edu_patterns = [
-        r"(?:Universität|Hochschule|Fachhochschule|University|College|Institute)[^\n.]{3,50}",
-        r"(?:Bachelor|Master|Diplom|Promotion|PhD|Dr\.)[^\n.]{3,50}"
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
     ]
+
+
+def generate_anschreiben_stream(resume_text, job_description, regenerate=False):
+    """
+    Generate a cover letter and yield the text as it is produced.
     
-    for pattern in edu_patterns:
-        matches = re.findall(pattern, resume_text, re.IGNORECASE)
-        skills["education"].extend(matches)
+    Tokens are forwarded as soon as Groq streams them. If streaming is not available
+    or fails before any text was produced, the template-based letter is yielded
+    as a single chunk. A cached letter for the same CV and job description is
+    yielded as a single chunk unless regenerate is set.
     
-    # Extract job experiences (simplified)
-    exp_patterns = [
-        r"(?:Software Engineer|Developer|Entwickler|Projektmanager|Manager|Consultant|Berater)[^\n.]{3,50}"
-    ]
+    Args:
+        resume_text (str): The CV text to analyze
+        job_description (str): The job description text
+        regenerate (bool): Skip the cache and generate a new letter (which replaces the cached one)
+        
+    Yields:
+        str: Successive pieces of the cover letter text
+    """
+    cache_key = anschreiben_cache_key(resume_text, job_description)
+    if not regenerate:
+        cached_text = get_cached_anschreiben(cache_key)
+        if cached_text is not None:
+            yield cached_text
+            return
+    
+    skills_info = extract_skills_from_resume(resume_text)
+    job = parse_job_description(job_description)
+    job_title, company_name = job.title, job.company
+    
+    produced_text = False
+    if groq_call_allowed():
+        try:
+            logging.info("Streaming Anschreiben from Groq")
+            stream = groq_chat_stream(
+                messages=build_anschreiben_messages(job_description, job_title, company_name, skills_info),
+                temperature=ANSCHREIBEN_TEMPERATURE,
+                max_tokens=1000
+            )
+            
+            parts = []
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if content:
+                    produced_text = True
+                    parts.append(content)
+                    yield content
+            
+            if produced_text:
+                logging.info("Groq finished streaming Anschreiben")
+                anschreiben_cache.set(cache_key, "".join(parts))
+                return
+            logging.warning("Empty streaming response from Groq API")
+            
+        except Exception as groq_error:
+            logging.error(f"Groq streaming error: {str(groq_error)}")
+            if produced_text:
+                # Part of the letter has already been sent, so do not append a second letter
+                raise
     
-    for pattern in exp_patterns:
-        matches = re.findall(pattern, resume_text, re.IGNORECASE)
-        skills["experience"].extend(matches)
+    logging.info("Using template-based approach for streamed Anschreiben")
+    yield generate_template_anschreiben(resume_text, job_description, job_title, company_name, skills_info)
+
+
+# Free-text CV details extracted alongside the taxonomy skills. The patterns are
+# lower-case and run on the lower-cased CV, which is much faster than IGNORECASE.
+EDUCATION_PATTERNS = [
+    re.compile(r"(?:universität|hochschule|fachhochschule|university|college|institute)[^\n.]{3,50}"),
+    re.compile(r"(?:bachelor|master|diplom|promotion|phd|dr\.)[^\n.]{3,50}")
+]
+EXPERIENCE_PATTERNS = [
+    re.compile(r"(?:software engineer|developer|entwickler|projektmanager|manager|consultant|berater)[^\n.]{3,50}")
+]
+
+
+def find_free_text(patterns, resume_text):
+    """
+    Find case-insensitive matches of lower-case patterns, without duplicates.
     
-    # Remove duplicates
-    skills["languages"] = list(set(skills["languages"]))
-    skills["technical_skills"] = list(set(skills["technical_skills"]))
-    skills["education"] = list(set(skills["education"]))
-    skills["experience"] = list(set(skills["experience"]))
+    Args:
+        patterns (list): Compiled lower-case patterns
+        resume_text (str): The CV text
+        
+    Returns:
+        list: Matched text in its original spelling, per pattern in order of appearance
+    """
+    lowered = resume_text.lower()
+    if len(lowered) != len(resume_text):
+        # A few characters change length when lower-cased, so offsets would not line up
+        matches = (match for pattern in patterns for match in re.findall(pattern.pattern, resume_text, re.IGNORECASE))
+    else:
+        matches = (resume_text[match.start():match.end()] for pattern in patterns for match in pattern.finditer(lowered))
+    return list(dict.fromkeys(matches))
+
+
+def extract_skills_from_resume(resume_text):
+    """
+    Extract skills and key information from CV text.
     
+    Args:
+        resume_text (str): The CV text to analyze
+        
+    Returns:
+        dict: Extracted skills and information; technical skills and languages are
+        canonical taxonomy names, most mentioned first
+    """
+    skills = skill_matcher.extract(resume_text)
+    skills["education"] = find_free_text(EDUCATION_PATTERNS, resume_text)
+    skills["experience"] = find_free_text(EXPERIENCE_PATTERNS, resume_text)
     return skills
 
 
@@ -490,151 +1038,85 @@ def parse_anschreiben_from_response(api_response):
         return "Error generating Anschreiben. Please try again."
 
 
-def extract_job_title(job_description):
+def score_resume(resume_text, language='en'):
     """
-    Extract job title from job description.
+    Score CV on a scale from 1-100 based on German standards.
     
     Args:
-        job_description (str): The job description text
+        resume_text (str): The CV text to analyze
+        language (str): Language for the summary and tips ('en' or 'de')
         
     Returns:
-        str: Extracted job title
+        dict: Score details including overall score and category scores
     """
-    # Try to find common job title patterns
-    title_patterns = [
-        r"(?:Stellenanzeige|Stelle|Position|Job)[:\s]+([^\n.]{5,50})",
-        r"(?:Wir suchen|Gesucht)[:\s]+([^\n.]{5,50})",
-        r"^([^\n.]{5,50})(?:\n|$)"
-    ]
+    # Return a cached score if the same CV was scored recently
+    cache_key = make_cache_key("score", normalize_text(resume_text), language, GROQ_MODEL, PROMPT_VERSION)
+    cached_score = score_cache.get(cache_key)
+    if cached_score is not None:
+        logging.info("Using cached CV score")
+        record_result_version("score", ANALYSIS_MODEL_VERSION)
+        return cached_score
     
-    for pattern in title_patterns:
-        matches = re.findall(pattern, job_description, re.IGNORECASE)
-        if matches:
-            return matches[0].strip()
-    
-    # Default title if no match found
-    return "die ausgeschriebene Stelle"
+    try:
+        # Try using DeepInfra API for scoring
+        if not groq_call_allowed():
+            raise Exception("Groq API unavailable")
+        score_data = score_resume_with_api(resume_text, language)
+        score_cache.set(cache_key, score_data)
+        record_result_version("score", ANALYSIS_MODEL_VERSION)
+        return score_data
+    except Exception as e:
+        logging.error(f"API-based scoring failed: {str(e)}")
+        logging.error(traceback.format_exc())
+        
+        # Fallback to rule-based scoring
+        record_result_version("score", RULES_MODEL_VERSION)
+        return score_resume_with_rules(resume_text, language)
 
 
-def extract_company_name(job_description):
+def validate_score_data(score_data, language='en'):
     """
-    Extract company name from job description.
+    Check that an LLM score has every field the results page and the database need.
     
     Args:
-        job_description (str): The job description text
+        score_data (dict): Score parsed from the model's response
+        language (str): Language for a generated summary ('en' or 'de')
         
     Returns:
-        str: Extracted company name
+        dict: The score with whole-number values, and a generated summary if the model left it out
+        
+    Raises:
+        ValueError: If the overall score or a category score is missing or not a number
     """
-    # Try to find common company name patterns
-    company_patterns = [
-        r"(?:Firma|Unternehmen|Company)[:\s]+([^\n.]{2,30})",
-        r"(?:bei der|bei|at|für die|für)\s+([A-Z][^\n.]{2,30})\s+(?:GmbH|AG|SE|KG|OHG|LLC|Inc|Ltd)"
-    ]
-    
-    for pattern in company_patterns:
-        matches = re.findall(pattern, job_description, re.IGNORECASE)
-        if matches:
-            return matches[0].strip()
+    if not isinstance(score_data, dict) or not isinstance(score_data.get("categories"), dict):
+        raise ValueError("Score is missing its categories")
+    try:
+        validated = {
+            "overall": round(float(score_data["overall"])),
+            "categories": {category: round(float(score_data["categories"][category])) for category in SCORE_CATEGORIES}
+        }
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"Score is incomplete: {json.dumps(score_data)[:200]}")
     
-    # Default if no match found
-    return "Ihrem Unternehmen"
+    summary = score_data.get("summary")
+    validated["summary"] = summary if isinstance(summary, str) and summary.strip() else get_score_summary(validated["overall"], language)
+    return validated
 
 
-def score_resume(resume_text, language='en'):
+def score_resume_with_rules(resume_text, language='en'):
     """
-    Score CV on a scale from 1-100 based on German standards.
+    Score CV on a scale from 1-100 using rule-based heuristics.
     
     Args:
         resume_text (str): The CV text to analyze
-        language (str): Language for the summary and tips ('en' or 'de')
+        language (str): Language for the summary ('en' or 'de')
         
     Returns:
         dict: Score details including overall score and category scores
     """
-    try:
-        # Try using DeepInfra API for scoring
-        return score_resume_with_api(resume_text, language)
-    except Exception as e:
-        logging.error(f"API-based scoring failed: {str(e)}")
-        logging.error(traceback.format_exc())
-        
-        # Fallback to rule-based scoring
-        scores = {}
-        
-        # Content score (40%)
-        content_score = 0
-        
-        # Check for achievements with numbers
-        achievement_pattern = r"\b(?:increased|improved|reduced|saved|achieved|developed|launched|managed|led)\b.*?\b\d+(?:\.\d+)?%?\b"
-        achievements = re.findall(achievement_pattern, resume_text, re.IGNORECASE)
-        content_score += min(len(achievements) * 5, 20)  # 5 points per achievement, max 20
-        
-        # Check for skills section
-        if re.search(r"\b(?:skills|fähigkeiten|kenntnisse|kompetenzen)\b", resume_text, re.IGNORECASE):
-            content_score += 10
-            
-        # Check for education details
-        if re.search(r"\b(?:bachelor|master|diplom|doktor|phd|ausbildung|studium|university|hochschule|universität)\b", resume_text, re.IGNORECASE):
-            content_score += 10
-        
-        # Format score (30%)
-        format_score = 0
-        
-        # Check for bullet points
-        bullet_points = re.findall(r"(?:^|\n)\s*(?:•|-|\*|\d+\.)\s+", resume_text)
-        format_score += min(len(bullet_points) * 2, 15)  # 2 points per bullet, max 15
-        
-        # Check for sections
-        section_headers = re.findall(r"(?:^|\n)(?:[A-Z][A-Za-z\s]+:|\b(?:EDUCATION|EXPERIENCE|SKILLS|PROJECTS|AUSBILDUNG|BERUFSERFAHRUNG|FÄHIGKEITEN|PROJEKTE)\b)", resume_text)
-        format_score += min(len(section_headers) * 3, 15)  # 3 points per section, max 15
-        
-        # Language score (15%)
-        language_score = 0
-        
-        # Check for grammatical errors (simplistic)
-        grammar_patterns = [
-            r"\bi\s+(?:has|have|is|am|are|was|were)\b",  # Subject-verb agreement issues
-            r"\b(?:a|an)\s+(?:[aeiou]|hour|honor)",       # A/An issues
-            r"\b(?:he|she|it|they)\s+(?:has|have|is|am|are|was|were)\b"  # More subject-verb agreement
-        ]
-        grammar_errors = 0
-        for pattern in grammar_patterns:
-            grammar_errors += len(re.findall(pattern, resume_text, re.IGNORECASE))
-            
-        # Give up to 15 points for good grammar
-        language_score += max(0, 15 - grammar_errors * 5)  # Subtract 5 points per error
-        
-        # Conciseness score (15%)
-        conciseness_score = 0
-        
-        # Count words
-        word_count = len(resume_text.split())
-        
-        # Ideal range: 300-600 words
-        if 300 <= word_count <= 600:
-            conciseness_score = 15
-        elif word_count < 300:
-            conciseness_score = word_count / 300 * 15  # Proportional to minimum
-        else:
-            conciseness_score = max(0, 15 - (word_count - 600) / 100)  # Subtract 1 point per 100 words over
-            
-        # Calculate overall score (weighted average)
-        overall_score = (content_score * 0.4) + (format_score * 0.3) + (language_score * 0.15) + (conciseness_score * 0.15)
-        
-        # Prepare result
-        scores = {
-            "overall": round(overall_score),
-            "categories": {
-                "content": round(content_score * 100 / 40),  # Convert to 100-point scale
-                "format": round(format_score * 100 / 30),
-                "language": round(language_score * 100 / 15),
-                "conciseness": round(conciseness_score * 100 / 15)
-            },
-            "summary": get_score_summary(round(overall_score), language)
-        }
-        
-        return scores
+    scores = score_batch([resume_text])[0]
+    scores["summary"] = get_score_summary(scores["overall"], language)
+    return scores
 
 
 def score_resume_with_api(resume_text, language='en'):
@@ -649,7 +1131,7 @@ def score_resume_with_api(resume_text, language='en'):
         dict: Score details including overall score and category scores
     """
     try:
-        if not groq_client:
+        if not get_groq_client():
             logging.error("Groq client not initialized")
             raise Exception("Groq client not available")
             
@@ -660,7 +1142,7 @@ def score_resume_with_api(resume_text, language='en'):
         
         user_prompt = f"""Bewerte folgenden Lebenslauf nach deutschen Standards (0-100 Punkte):
 
-{resume_text[:3000]}
+{condense_resume_text(resume_text, SCORE_MAX_CHARS)}
 
 Bewerte die folgenden Kategorien:
 1. Inhalt (Qualifikationen, Erfahrungen, Leistungen) - 40%
@@ -682,8 +1164,7 @@ Antwort NUR in diesem JSON-Format (ohne weitere Erklärungen):
 """
         
         # Call Groq API
-        response = groq_client.chat.completions.create(
-            model=GROQ_MODEL,
+        response = groq_chat_completion(
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
@@ -696,13 +1177,9 @@ Antwort NUR in diesem JSON-Format (ohne weitere Erklärungen):
         if response and response.choices and len(response.choices) > 0:
             result_text = response.choices[0].message.content
             
-            # Extract JSON from response (in case there's additional text)
-            json_match = re.search(r'({[\s\S]*})', result_text)
-            if json_match:
-                result_json = json.loads(json_match.group(1))
-                return result_json
-            else:
-                raise ValueError("Could not extract JSON from API response")
+            # Extract JSON from response (in case there's additional text); a score cut
+            # off mid-object is a failure, not a smaller score
+            return validate_score_data(extract_json_object(result_text, allow_truncated=False), language)
         else:
             # Handle empty response
             logging.error("Empty response from Groq API")
@@ -713,6 +1190,153 @@ Antwort NUR in diesem JSON-Format (ohne weitere Erklärungen):
         raise e
 
 
+def analyze_and_score_resume(resume_text, language='en'):
+    """
+    Analyze and score a CV with a single combined LLM request.
+    
+    Args:
+        resume_text (str): The CV text to analyze
+        language (str): Language for the analysis and summary ('en' or 'de')
+        
+    Returns:
+        tuple: (corrections list, score dict), falling back to the rule-based
+        analysis and scoring for whichever part the API could not provide
+    """
+    normalized_text = normalize_text(resume_text)
+    analysis_key = make_cache_key("analysis", normalized_text, language, GROQ_MODEL, PROMPT_VERSION)
+    score_key = make_cache_key("score", normalized_text, language, GROQ_MODEL, PROMPT_VERSION)
+    
+    # Both halves share their cache entries with the split mode
+    corrections = analysis_cache.get(analysis_key)
+    score_data = score_cache.get(score_key)
+    if corrections is not None and score_data is not None:
+        logging.info("Using cached combined analysis and score")
+        record_result_version("analysis", ANALYSIS_MODEL_VERSION)
+        record_result_version("score", ANALYSIS_MODEL_VERSION)
+        return relocate_corrections(resume_text, corrections), score_data
+    
+    if groq_call_allowed():
+        try:
+            if len(resume_text) > ANALYSIS_CHUNK_CHARS:
+                # A single prompt cannot cover a long CV; analyze chunks and score in parallel
+                logging.info("CV too long for a combined request, analyzing chunks and scoring concurrently")
+                score_future = chunk_executor.submit(with_current_context(score_resume_with_api), resume_text, language)
+                corrections, complete = analyze_in_chunks(resume_text, language)
+                try:
+                    score_data = score_future.result()
+                except Exception as e:
+                    logging.error(f"API-based scoring failed: {str(e)}")
+                    score_data = None
+            else:
+                logging.info("Attempting combined Groq analysis and scoring")
+                corrections, score_data, complete = analyze_and_score_with_groq(resume_text, language)
+            if corrections and complete:
+                analysis_cache.set(analysis_key, corrections)
+            if score_data:
+                score_cache.set(score_key, score_data)
+        except Exception as e:
+            logging.error(f"Combined Groq analysis failed: {str(e)}")
+            logging.error(traceback.format_exc())
+            corrections, score_data, complete = None, None, True
+    else:
+        corrections, score_data, complete = None, None, True
+    
+    if not corrections:
+        record_result_version("analysis", RULES_MODEL_VERSION)
+    else:
+        record_result_version("analysis", ANALYSIS_MODEL_VERSION if complete else PARTIAL_MODEL_VERSION)
+    record_result_version("score", ANALYSIS_MODEL_VERSION if score_data else RULES_MODEL_VERSION)
+    if not corrections:
+        logging.info("Using enhanced fallback analysis for CV corrections")
+        corrections = perform_enhanced_analysis(resume_text, language)
+    if not score_data:
+        score_data = score_resume_with_rules(resume_text, language)
+    
+    return corrections, score_data
+
+
+def analyze_and_score_with_groq(resume_text, language='en'):
+    """
+    Request corrections and category scores from Groq in one call.
+    
+    Args:
+        resume_text (str): The CV text to analyze
+        language (str): Language for the analysis and summary ('en' or 'de')
+        
+    Returns:
+        tuple: (corrections list, score dict, False if the response was cut off
+        among the corrections, so some may be missing)
+    """
+    output_language = "German" if language == 'de' else "English"
+    
+    user_prompt = f"""Analyze and score this CV for the German job market:
+
+{resume_text[:ANALYSIS_CHUNK_CHARS]}
+
+Score these categories from 0-100:
+1. content (qualifications, experience, achievements) - 40%
+2. format (structure, clarity, organization) - 30%
+3. language (grammar, terminology, professionalism) - 15%
+4. conciseness (brevity, relevance, focus) - 15%
+
+Also list precise improvement suggestions, quoting the original text exactly.
+Write explanations and the summary (1-2 sentences) in {output_language}.
+
+Answer ONLY with JSON in this format:
+{{
+  "score": {{
+    "overall": [overall score 0-100],
+    "categories": {{
+      "content": [0-100],
+      "format": [0-100],
+      "language": [0-100],
+      "conciseness": [0-100]
+    }},
+    "summary": "[short summary]"
+  }},
+  "corrections": [
+    {{
+      "original": "The text that needs improvement",
+      "suggestion": "The improved text",
+      "explanation": "Why this change improves the CV",
+      "category": "One of: grammar, formatting, clarity, professional language, content, achievement, skills"
+    }}
+  ]
+}}
+
+For a CV with low scores (below 50/100), provide at least 7-10 substantial improvement suggestions.
+"""
+    
+    response = groq_chat_completion(
+        messages=[
+            {"role": "system", "content": ANALYSIS_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ],
+        temperature=0.3,
+        max_tokens=2500
+    )
+    
+    if not response or not response.choices:
+        raise Exception("Empty API response")
+    
+    result_text = response.choices[0].message.content
+    extractor = JsonStreamExtractor()
+    # Only corrections whose objects closed are kept; the repaired root object may end inside one
+    suggestions = extractor.feed(result_text or "")
+    result_json = extractor.root_objects(repair=True)
+    if not result_json:
+        raise ValueError("Could not extract JSON from API response")
+    
+    # The score comes first in the response, so a response cut off among the corrections still has all of it
+    score_data = validate_score_data(result_json[0].get("score"), language)
+    
+    if extractor.truncated:
+        logging.warning(f"Combined Groq response was truncated, keeping {len(suggestions)} complete suggestions")
+    corrections = locate_suggestions(resume_text, suggestions)
+    logging.info(f"Combined Groq analysis returned {len(corrections)} suggestions, overall score {score_data.get('overall')}")
+    return corrections, score_data, not extractor.truncated
+
+
 def get_score_summary(score, language='en'):
     """
     Get a summary message based on the overall score.
@@ -838,34 +1462,28 @@ Mit freundlichen Grüßen,
     return anschreiben
 
 
-def analyze_with_groq(resume_text, language='en'):
+ANALYSIS_SYSTEM_PROMPT = """You are an expert CV reviewer specializing in German job market standards. 
+Your task is to analyze a CV and provide specific, detailed improvement suggestions.
+Identify issues with content, format, language, achievements, skills presentation, and overall structure.
+For each issue, you must provide the specific text that needs improvement, the suggested fix,
+and a detailed explanation of why the change improves the CV for German employers."""
+
+
+def build_analysis_prompt(resume_text, language='en'):
     """
-    Analyze a CV using Groq's Llama-3-70b model for comprehensive improvement suggestions.
+    Build the user prompt asking for a JSON list of improvement suggestions.
     
     Args:
-        resume_text (str): The CV text to analyze
+        resume_text (str): The CV text (already truncated to the prompt budget)
         language (str): Language for the analysis ('en' or 'de')
         
     Returns:
-        list: A list of correction suggestions with specific improvements
+        str: The user prompt
     """
-    logging.info("Analyzing CV with Groq's Llama-3-70b model")
-    corrections = []
-    
-    if groq_client:
-        try:
-            # Use the native Groq client first (cleaner API)
-            # Prepare prompt based on required language
-            system_prompt = """You are an expert CV reviewer specializing in German job market standards. 
-            Your task is to analyze a CV and provide specific, detailed improvement suggestions.
-            Identify issues with content, format, language, achievements, skills presentation, and overall structure.
-            For each issue, you must provide the specific text that needs improvement, the suggested fix,
-            and a detailed explanation of why the change improves the CV for German employers."""
-            
-            if language == 'de':
-                user_prompt = f"""Analysiere diesen Lebenslauf für den deutschen Arbeitsmarkt:
+    if language == 'de':
+        return f"""Analysiere diesen Lebenslauf für den deutschen Arbeitsmarkt:
 
-{resume_text[:2500]}
+{resume_text}
 
 Gib nur präzise Verbesserungsvorschläge im folgenden JSON-Format zurück:
 [
@@ -880,10 +1498,9 @@ Gib nur präzise Verbesserungsvorschläge im folgenden JSON-Format zurück:
 
 Für einen Lebenslauf mit niedrigen Punktzahlen (unter 50/100) solltest du mindestens 7-10 wesentliche Verbesserungsvorschläge machen.
 """
-            else:
-                user_prompt = f"""Analyze this CV for the German job market:
+    return f"""Analyze this CV for the German job market:
 
-{resume_text[:2500]}
+{resume_text}
 
 Return only precise improvement suggestions in the following JSON format:
 [
@@ -899,9 +1516,68 @@ Return only precise improvement suggestions in the following JSON format:
 For a CV with low scores (below 50/100), you should provide at least 7-10 substantial improvement suggestions.
 """
 
-            # Make API call to Groq
-            response = groq_client.chat.completions.create(
-                model=GROQ_MODEL,
+
+def locate_suggestions(resume_text, suggestions, locator=None):
+    """
+    Turn LLM suggestions into corrections anchored at their position in the CV.
+    
+    Args:
+        resume_text (str): The full CV text
+        suggestions (list): Suggestion dictionaries with original/suggestion/explanation/category
+        locator (TextLocator): Index of resume_text, if one has already been built
+        
+    Returns:
+        list: Corrections for the complete suggestions that could be located in the text
+    """
+    # A suggestion without replacement text would delete the quoted CV text when applied
+    suggestions = [suggestion for suggestion in suggestions
+                   if isinstance(suggestion.get("original"), str) and suggestion.get("original")
+                   and isinstance(suggestion.get("suggestion"), str) and suggestion.get("suggestion").strip()]
+    spans = (locator or TextLocator(resume_text)).locate_all([suggestion["original"] for suggestion in suggestions])
+    
+    corrections = []
+    for suggestion, span in zip(suggestions, spans):
+        if span is None:
+            # Skip this suggestion if text can't be located
+            logging.warning(f"Original text not found: {suggestion['original'][:30]}...")
+            continue
+        
+        # Create correction with detailed information, quoting the CV as it is written
+        start_pos, end_pos = span
+        correction = {
+            "original": resume_text[start_pos:end_pos],
+            "position": {"start": start_pos, "end": end_pos},
+            "suggestion": suggestion["suggestion"],
+            "explanation": suggestion.get("explanation", "Improves CV presentation"),
+            "category": suggestion.get("category", "content")
+        }
+        
+        corrections.append(correction)
+    
+    return corrections
+
+
+def analyze_with_groq(resume_text, language='en'):
+    """
+    Analyze a CV using Groq's Llama-3-70b model for comprehensive improvement suggestions.
+    
+    Args:
+        resume_text (str): The CV text to analyze
+        language (str): Language for the analysis ('en' or 'de')
+        
+    Returns:
+        tuple: (list of correction suggestions with specific improvements,
+        False if the provider failed or its response broke off, so suggestions may be missing)
+    """
+    logging.info("Analyzing CV with Groq's Llama-3-70b model")
+    
+    system_prompt = ANALYSIS_SYSTEM_PROMPT
+    user_prompt = build_analysis_prompt(resume_text[:2500], language)
+    
+    if get_groq_client():
+        try:
+            # Use the native Groq client first (cleaner API), streaming the response
+            stream = groq_chat_stream(
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
@@ -910,114 +1586,47 @@ For a CV with low scores (below 50/100), you should provide at least 7-10 substa
                 max_tokens=2000
             )
             
-            if response and response.choices and len(response.choices) > 0:
-                result_text = response.choices[0].message.content
-                
-                # Try to extract JSON from the response
-                try:
-                    # Find JSON array in the response
-                    json_match = re.search(r'\[\s*\{.*\}\s*\]', result_text, re.DOTALL)
-                    if not json_match:
-                        # Try to find in code blocks
-                        json_match = re.search(r'```(?:json)?\s*(\[\s*\{.*\}\s*\])```', result_text, re.DOTALL)
-                        if json_match:
-                            result_text = json_match.group(1)
-                        else:
-                            raise ValueError("Could not extract JSON from API response")
-                    else:
-                        result_text = json_match.group(0)
-                        
-                    # Parse JSON and process each suggestion
-                    suggestions = json.loads(result_text)
-                    
-                    # Process each suggestion
-                    corrections = []
-                    for suggestion in suggestions:
-                        original_text = suggestion.get("original", "")
-                        if not original_text:
-                            continue
-                            
-                        # Find position of the original text in the CV
-                        start_pos = resume_text.find(original_text)
-                        if start_pos == -1:
-                            # Try case-insensitive search if exact match fails
-                            pattern = re.escape(original_text.lower())
-                            matches = list(re.finditer(pattern, resume_text.lower()))
-                            if matches:
-                                start_pos = matches[0].start()
-                            else:
-                                # Skip this suggestion if text can't be located
-                                logging.warning(f"Original text not found: {original_text[:30]}...")
-                                continue
-                                
-                        # Create correction with detailed information
-                        correction = {
-                            "original": original_text,
-                            "position": {"start": start_pos, "end": start_pos + len(original_text)},
-                            "suggestion": suggestion.get("suggestion", ""),
-                            "explanation": suggestion.get("explanation", "Improves CV presentation"),
-                            "category": suggestion.get("category", "content")
-                        }
-                        
-                        corrections.append(correction)
-                    
-                    return corrections
-                except Exception as e:
-                    logging.error(f"Error processing Groq response: {str(e)}")
+            # Index the CV while the first tokens are on their way
+            locator = TextLocator(resume_text)
+            extractor = JsonStreamExtractor()
+            suggestions = []
+            complete = True
+            try:
+                for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    content = chunk.choices[0].delta.content
+                    if content:
+                        # Each suggestion is parsed as soon as its object closes
+                        suggestions.extend(extractor.feed(content))
+            except Exception as stream_error:
+                if not suggestions:
+                    raise
+                complete = False
+                logging.error(f"Groq stream broke off, keeping {len(suggestions)} complete suggestions: {str(stream_error)}")
+            
+            if extractor.truncated:
+                # The model ran out of tokens; asking again would give the same answer
+                logging.warning(f"Groq response was truncated, keeping {len(suggestions)} complete suggestions")
+            if suggestions or extractor.arrays_seen:
+                return locate_suggestions(resume_text, suggestions, locator), complete
+            logging.error("Could not extract JSON from Groq response")
         
         except Exception as groq_error:
             logging.error(f"Error with Groq native client: {str(groq_error)}")
             logging.error("Falling back to API request method")
     
-    # Fall back to REST API request method if native client fails
-    # Prepare the prompt for API based on required language
-    system_prompt = """You are an expert CV reviewer specializing in German job market standards. 
-    Your task is to analyze a CV and provide specific, detailed improvement suggestions.
-    Identify issues with content, format, language, achievements, skills presentation, and overall structure.
-    For each issue, you must provide the specific text that needs improvement, the suggested fix,
-    and a detailed explanation of why the change improves the CV for German employers."""
-    
-    if language == 'de':
-        user_prompt = f"""Analysiere diesen Lebenslauf für den deutschen Arbeitsmarkt:
-
-{resume_text[:2500]}
-
-Gib nur präzise Verbesserungsvorschläge im folgenden JSON-Format zurück:
-[
-  {{
-    "original": "Der zu verbessernde Text",
-    "suggestion": "Der verbesserte Text",
-    "explanation": "Detaillierte Erklärung, warum diese Änderung den Lebenslauf verbessert",
-    "category": "Eine der folgenden Kategorien: grammar, formatting, clarity, professional language, content, achievement, skills"
-  }},
-  ...weitere Vorschläge
-]
-
-Für einen Lebenslauf mit niedrigen Punktzahlen (unter 50/100) solltest du mindestens 7-10 wesentliche Verbesserungsvorschläge machen.
-"""
-    else:
-        user_prompt = f"""Analyze this CV for the German job market:
-
-{resume_text[:2500]}
-
-Return only precise improvement suggestions in the following JSON format:
-[
-  {{
-    "original": "The text that needs improvement",
-    "suggestion": "The improved text",
-    "explanation": "Detailed explanation why this change improves the CV",
-    "category": "One of: grammar, formatting, clarity, professional language, content, achievement, skills"
-  }},
-  ...more suggestions
-]
-
-For a CV with low scores (below 50/100), you should provide at least 7-10 substantial improvement suggestions.
-"""
+    # Skip the REST fallback when the native call has just tripped the breaker
+    if groq_breaker.is_open():
+        logging.warning("Groq circuit breaker is open, skipping REST fallback")
+        return [], False
     
+    # Fall back to REST API request method if native client fails
+    start_time = time.monotonic()
     try:
         # Call Groq REST API
         groq_api_url = "https://api.groq.com/openai/v1/chat/completions"
-        response = requests.post(
+        response = get_http_session().post(
             groq_api_url,
             headers=groq_headers,
             json={
@@ -1029,78 +1638,49 @@ For a CV with low scores (below 50/100), you should provide at least 7-10 substa
                 "temperature": 0.3,
                 "max_tokens": 2000
             },
-            timeout=45  # Longer timeout for complex analysis
+            timeout=(HTTP_CONNECT_TIMEOUT, remaining_timeout(HTTP_READ_TIMEOUT))  # Longer timeout for complex analysis
         )
         
         if response.status_code == 200:
+            groq_breaker.record_success(time.monotonic() - start_time)
             api_response = response.json()
             result_text = api_response["choices"][0]["message"]["content"]
             
             # Try to extract JSON from the response
             try:
-                # Find JSON array in the response
-                json_match = re.search(r'\[\s*\{.*\}\s*\]', result_text, re.DOTALL)
-                if not json_match:
-                    # Try to find in code blocks
-                    json_match = re.search(r'```(?:json)?\s*(\[\s*\{.*\}\s*\])```', result_text, re.DOTALL)
-                    if json_match:
-                        result_text = json_match.group(1)
-                    else:
-                        raise ValueError("Could not extract JSON from API response")
-                else:
-                    result_text = json_match.group(0)
-                    
-                # Parse the extracted JSON
-                suggestions = json.loads(result_text)
-                
-                # Process each suggestion
-                for suggestion in suggestions:
-                    original_text = suggestion.get("original", "")
-                    if not original_text:
-                        continue
-                        
-                    # Find position of the original text in the CV
-                    start_pos = resume_text.find(original_text)
-                    if start_pos == -1:
-                        # Try case-insensitive search if exact match fails
-                        pattern = re.escape(original_text.lower())
-                        matches = list(re.finditer(pattern, resume_text.lower()))
-                        if matches:
-                            start_pos = matches[0].start()
-                        else:
-                            # Skip this suggestion if text can't be located
-                            logging.warning(f"Original text not found: {original_text[:30]}...")
-                            continue
-                            
-                    # Create correction with detailed information
-                    correction = {
-                        "original": original_text,
-                        "position": {"start": start_pos, "end": start_pos + len(original_text)},
-                        "suggestion": suggestion.get("suggestion", ""),
-                        "explanation": suggestion.get("explanation", "Improves CV presentation"),
-                        "category": suggestion.get("category", "content")
-                    }
-                    
-                    corrections.append(correction)
+                suggestions = extract_array_objects(result_text)
+                corrections = locate_suggestions(resume_text, suggestions)
                     
                 if corrections:
-                    return corrections
+                    return corrections, True
                 else:
                     logging.warning("No valid corrections extracted from Groq API response")
-                    return []
+                    return [], True
                     
             except (json.JSONDecodeError, ValueError) as e:
                 logging.error(f"Failed to parse Groq API response as JSON: {str(e)}")
                 logging.debug(f"Raw response: {result_text[:500]}...")
-                return []
+                return [], False
         else:
+            groq_breaker.record_failure(time.monotonic() - start_time)
             logging.error(f"Groq API error ({response.status_code}): {response.text}")
-            return []
+            return [], False
             
+    except requests.exceptions.RequestException as e:
+        record_provider_failure(groq_breaker, start_time)
+        logging.error(f"Error in Groq API analysis: {str(e)}")
+        logging.error(traceback.format_exc())
+        return [], False
     except Exception as e:
         logging.error(f"Error in Groq API analysis: {str(e)}")
         logging.error(traceback.format_exc())
-        return []
+        return [], False
+
+
+# Section headings whose absence triggers a suggestion
+EXPERIENCE_SECTION_PATTERN = re.compile(r'\b(?:experience|work|employment|berufserfahrung|arbeitserfahrung|tätigkeiten)\b', re.IGNORECASE)
+EDUCATION_SECTION_PATTERN = re.compile(r'\b(?:education|ausbildung|bildung|studium|akademisch)\b', re.IGNORECASE)
+SKILLS_SECTION_PATTERN = re.compile(r'\b(?:skills|fähigkeiten|kenntnisse|kompetenzen)\b', re.IGNORECASE)
 
 
 def perform_enhanced_analysis(resume_text, language='en'):
@@ -1116,95 +1696,9 @@ def perform_enhanced_analysis(resume_text, language='en'):
     """
     corrections = []
     
-    # Build a comprehensive set of checks based on German CV standards
-    checks = []
-    
-    # Common weak phrases that should be replaced with strong action verbs
-    weak_phrases = [
-        # English weak phrases
-        {"pattern": r"\bresponsible for\b", "replacement": "managed", 
-         "explanation": "Use action verbs instead of passive phrases to show proactive leadership", "category": "clarity"},
-        {"pattern": r"\bhelped (with|to)?\b", "replacement": "assisted with", 
-         "explanation": "Use more professional terminology to describe your contributions", "category": "professional language"},
-        {"pattern": r"\bworked (on|with)\b", "replacement": "developed", 
-         "explanation": "Use stronger action verbs to demonstrate your contribution", "category": "clarity"},
-        {"pattern": r"\bpart of (a|the) team\b", "replacement": "collaborated with team members to", 
-         "explanation": "Specify your role in the team rather than just mentioning team membership", "category": "content"},
-        
-        # German weak phrases
-        {"pattern": r"\bzuständig für\b", "replacement": "verantwortete", 
-         "explanation": "Verwenden Sie Aktiv-Formulierungen statt passiver Ausdrücke", "category": "clarity"},
-        {"pattern": r"\bhabe (mitge)?arbeitet\b", "replacement": "entwickelte", 
-         "explanation": "Nutzen Sie stärkere Verben, um Ihre Beiträge hervorzuheben", "category": "clarity"},
-        {"pattern": r"\bwar beteiligt an\b", "replacement": "koordinierte", 
-         "explanation": "Verdeutlichen Sie Ihre aktive Rolle statt nur Beteiligung zu erwähnen", "category": "content"},
-    ]
-    
-    # Personal pronouns to avoid in CVs
-    pronouns = [
-        {"pattern": r"\bi\b", "replacement": "", 
-         "explanation": "Avoid first-person pronouns in CVs; start sentences with action verbs instead", "category": "professional language"},
-        {"pattern": r"\bmy\b", "replacement": "the", 
-         "explanation": "Avoid possessive pronouns in CVs for a more professional tone", "category": "professional language"},
-        {"pattern": r"\bich\b", "replacement": "", 
-         "explanation": "Vermeiden Sie 'ich' im Lebenslauf; beginnen Sie Sätze direkt mit Verben", "category": "professional language"},
-        {"pattern": r"\bmein(e)?\b", "replacement": "die", 
-         "explanation": "Vermeiden Sie Possessivpronomen im Lebenslauf", "category": "professional language"},
-    ]
-    
-    # Cliché terms that should be avoided or replaced
-    cliches = [
-        {"pattern": r"\bteam player\b", "replacement": "collaborative professional", 
-         "explanation": "Replace overused clichés with specific examples of collaboration", "category": "content"},
-        {"pattern": r"\bthinking outside the box\b", "replacement": "implementing innovative solutions", 
-         "explanation": "Avoid clichés and use concrete examples of innovation", "category": "content"},
-        {"pattern": r"\bteamfähig\b", "replacement": "arbeitete effektiv im Team bei [Projektname]", 
-         "explanation": "Ersetzen Sie Floskeln durch konkrete Beispiele Ihrer Teamarbeit", "category": "content"},
-        {"pattern": r"\bhardworking\b", "replacement": "delivered projects consistently ahead of deadline", 
-         "explanation": "Show your work ethic through specific achievements rather than generic terms", "category": "content"},
-    ]
-    
-    # Format and capitalization issues
-    formatting = [
-        {"pattern": r"\bms office\b", "replacement": "Microsoft Office", 
-         "explanation": "Use proper capitalization for product names", "category": "formatting"},
-        {"pattern": r"\b(java ?script|type ?script)\b", "replacement": "JavaScript", 
-         "explanation": "Use correct capitalization for programming languages", "category": "formatting"},
-        {"pattern": r"\bc\+\+\b", "replacement": "C++", 
-         "explanation": "Use correct capitalization for programming languages", "category": "formatting"},
-    ]
-    
-    # Vague descriptions that need quantification
-    vague_terms = [
-        {"pattern": r"\b(significantly|substantially|greatly) (improved|increased|decreased|reduced)\b", 
-         "replacement": "improved by X%", 
-         "explanation": "Quantify your achievements with specific numbers or percentages", "category": "achievement"},
-        {"pattern": r"\b(managed|led) a team\b", "replacement": "managed a team of X members", 
-         "explanation": "Specify the size of the team you managed for greater impact", "category": "achievement"},
-        {"pattern": r"\bverbesserte Prozesse\b", "replacement": "verbesserte Prozesse, was zu einer X% Effizienzsteigerung führte", 
-         "explanation": "Quantifizieren Sie Ihre Erfolge mit konkreten Zahlen", "category": "achievement"},
-    ]
-    
-    # German-specific language issues
-    german_specific = [
-        {"pattern": r"\b(?:gute|sehr gute|ausgezeichnete)\s+kenntnisse\b", 
-         "replacement": "Fortgeschrittene Kenntnisse", 
-         "explanation": "Verwenden Sie präzisere Begriffe zur Beschreibung Ihrer Fähigkeiten", "category": "professional language"},
-        {"pattern": r"\bargts", "replacement": "arbeitet", 
-         "explanation": "Verwenden Sie vollständige Wörter statt Abkürzungen", "category": "professional language"},
-        {"pattern": r"\binteragirt\b", "replacement": "interagiert", 
-         "explanation": "Korrigieren Sie Rechtschreibfehler", "category": "spelling"},
-    ]
-    
-    # Combine all check categories based on language
-    if language == 'de':
-        checks = weak_phrases + pronouns + cliches + formatting + vague_terms + german_specific
-    else:
-        checks = weak_phrases + pronouns + cliches + formatting + vague_terms
-    
     # Add additional comprehensive checks for low-quality CVs
     # Check for missing sections
-    if not re.search(r'\b(?:experience|work|employment|berufserfahrung|arbeitserfahrung|tätigkeiten)\b', resume_text, re.IGNORECASE):
+    if not EXPERIENCE_SECTION_PATTERN.search(resume_text):
         section_start = resume_text.find("\n\n")
         if section_start == -1:
             section_start = 0
@@ -1220,7 +1714,7 @@ def perform_enhanced_analysis(resume_text, language='en'):
         }
         corrections.append(missing_section)
     
-    if not re.search(r'\b(?:education|ausbildung|bildung|studium|akademisch)\b', resume_text, re.IGNORECASE):
+    if not EDUCATION_SECTION_PATTERN.search(resume_text):
         section_start = resume_text.find("\n\n")
         if section_start == -1:
             section_start = 0
@@ -1236,7 +1730,7 @@ def perform_enhanced_analysis(resume_text, language='en'):
         }
         corrections.append(missing_section)
     
-    if not re.search(r'\b(?:skills|fähigkeiten|kenntnisse|kompetenzen)\b', resume_text, re.IGNORECASE):
+    if not SKILLS_SECTION_PATTERN.search(resume_text):
         section_start = resume_text.find("\n\n")
         if section_start == -1:
             section_start = 0
@@ -1253,33 +1747,7 @@ def perform_enhanced_analysis(resume_text, language='en'):
         corrections.append(missing_section)
     
     # Apply all checks to the resume text
-    for check in checks:
-        for match in re.finditer(check["pattern"], resume_text, re.IGNORECASE):
-            start_pos = match.start()
-            end_pos = match.end()
-            original_text = resume_text[start_pos:end_pos]
-            
-            # Create replacement based on case of original
-            if original_text.isupper():
-                replacement = check["replacement"].upper()
-            elif original_text[0].isupper():
-                replacement = check["replacement"].capitalize()
-            else:
-                replacement = check["replacement"]
-                
-            # Skip if replacement would be empty
-            if not replacement:
-                continue
-                
-            correction = {
-                "original": original_text,
-                "position": {"start": start_pos, "end": end_pos},
-                "suggestion": replacement,
-                "explanation": check["explanation"],
-                "category": check["category"]
-            }
-            
-            corrections.append(correction)
+    corrections.extend(rule_bundles.get_engine(language).apply(resume_text))
     
     # Return the corrections, limiting to a reasonable number if there are too many
     max_corrections = 25  # Limit to 25 to avoid overwhelming the user
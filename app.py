@@ -4,14 +4,34 @@ import logging
 import io
 import tempfile
 import json
+import time
+import uuid
+import hashlib
+import hmac
+import threading
 import traceback
-from flask import Flask, render_template, request, redirect, url_for, flash, session, send_file
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from flask import Flask, render_template, request, redirect, url_for, flash, session, send_file, Response, stream_with_context
 from werkzeug.utils import secure_filename
 from werkzeug.middleware.proxy_fix import ProxyFix
-from resume_parser import parse_resume_file, parse_resume_text
-from ai_analyzer import analyze_resume, generate_anschreiben, score_resume
+from resume_parser import parse_resume_file, parse_resume_text, warm_pdf_pool
+from job_description import parse_job_description, job_identity, job_description_index, job_description_cache
+from job_matching import TfidfMatcher
+from ats_coverage import document_terms, required_terms, score_coverage, CORPUS_SIZE_TERM
+from ai_analyzer import analyze_resume, generate_anschreiben, generate_anschreiben_stream, score_resume, analyze_and_score_resume, ANALYSIS_MODE
+from ai_analyzer import perform_enhanced_analysis, score_resume_with_rules, get_score_summary
+from ai_analyzer import track_result_versions, ANALYSIS_MODEL_VERSION, RULES_MODEL_VERSION
+from ai_analyzer import get_cache_stats, get_provider_stats
+from result_cache import normalize_text
+from scoring import score_batch
+from deadline import deadline_scope, current_deadline, with_current_context
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, Boolean, ForeignKey, Index, inspect, text
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import relationship
 from flask_sqlalchemy import SQLAlchemy
 
@@ -75,19 +95,38 @@ except Exception as e:
 
 # Configure upload settings
 ALLOWED_EXTENSIONS = {'pdf', 'docx', 'txt'}
-UPLOAD_FOLDER = os.path.join(os.getcwd(), 'uploads')
-TEMP_FOLDER = UPLOAD_FOLDER
 
-# Ensure upload folder exists
-try:
-    os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-    logging.info(f"Upload folder created at {UPLOAD_FOLDER}")
-except Exception as e:
-    logging.warning(f"Failed to create upload folder: {str(e)}")
-    # Use temp directory as fallback
-    UPLOAD_FOLDER = tempfile.gettempdir()
-    TEMP_FOLDER = UPLOAD_FOLDER
-    logging.info(f"Using temporary directory instead: {TEMP_FOLDER}")
+# Bounded pool for running the correction analysis and scoring calls concurrently
+ANALYSIS_MAX_WORKERS = int(os.environ.get("ANALYSIS_MAX_WORKERS", "8"))
+analysis_executor = ThreadPoolExecutor(max_workers=ANALYSIS_MAX_WORKERS, thread_name_prefix="analysis")
+
+# Queue analyses as jobs for worker.py instead of running them in the request;
+# only enable this where worker.py runs next to the web server, or jobs stay pending
+ANALYSIS_QUEUE = os.environ.get("ANALYSIS_QUEUE", "0") == "1"
+# Time budgets (seconds) for provider calls made on behalf of one request
+ANALYSIS_DEADLINE_SECONDS = float(os.environ.get("ANALYSIS_DEADLINE_SECONDS", "20"))
+ANSCHREIBEN_DEADLINE_SECONDS = float(os.environ.get("ANSCHREIBEN_DEADLINE_SECONDS", "30"))
+# Number of corrections kept in the session
+MAX_SESSION_CORRECTIONS = 20
+
+# Bulk scoring API
+BULK_API_KEY = os.environ.get("BULK_API_KEY")  # Required by /api/score, which is disabled while it is unset
+BULK_MAX_ITEMS = int(os.environ.get("BULK_MAX_ITEMS", "1000"))  # CVs accepted per request
+BULK_MAX_TEXT_CHARS = int(os.environ.get("BULK_MAX_TEXT_CHARS", "100000"))  # Longer CV texts are rejected
+BULK_CHUNK_SIZE = int(os.environ.get("BULK_CHUNK_SIZE", "50"))  # CVs per process pool task
+BULK_PROCESS_WORKERS = int(os.environ.get("BULK_PROCESS_WORKERS", str(os.cpu_count() or 1)))
+BULK_LLM_CONCURRENCY = int(os.environ.get("BULK_LLM_CONCURRENCY", "8"))  # Provider calls in flight per web worker
+
+# Bounded pool for provider calls made by the bulk API
+bulk_llm_executor = ThreadPoolExecutor(max_workers=BULK_LLM_CONCURRENCY, thread_name_prefix="bulk")
+_bulk_process_pool = None
+_bulk_process_pool_pid = None
+
+# Near-duplicate index of the job ads of stored cover letters
+JOB_INDEX_REFRESH_SECONDS = int(os.environ.get("JOB_INDEX_REFRESH_SECONDS", "60"))  # How often ads stored by other workers are loaded
+JOB_INDEX_BATCH_SIZE = 1000
+_job_index_lock = threading.Lock()
+_job_index_refreshed_at = 0.0
 
 # Database models
 class Resume(db.Model):
@@ -99,6 +138,7 @@ class Resume(db.Model):
     language = Column(String(10), default='en')
     file_name = Column(String(255), nullable=True)
     file_type = Column(String(10), nullable=True)  # pdf, docx, txt
+    content_hash = Column(String(64), unique=True, index=True, nullable=True)  # See resume_content_hash
     created_at = Column(DateTime, default=datetime.utcnow)
     last_updated = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -124,12 +164,16 @@ class ResumeScore(db.Model):
     language_score = Column(Float, nullable=True)
     conciseness_score = Column(Float, nullable=True)
     summary = Column(Text, nullable=True)
+    language = Column(String(10), nullable=True)
+    model_version = Column(String(100), nullable=True)  # ANALYSIS_MODEL_VERSION or RULES_MODEL_VERSION
     
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
     resume = relationship("Resume", back_populates="scores")
     
+    __table_args__ = (Index('ix_resume_scores_lookup', 'resume_id', 'language', 'model_version'),)
+    
     def __repr__(self):
         return f"<ResumeScore {self.id}: {self.overall_score}>"
 
@@ -147,6 +191,8 @@ class ResumeCorrection(db.Model):
     category = Column(String(50), nullable=True)  # grammar, content, formatting, etc.
     position_start = Column(Integer, nullable=True)
     position_end = Column(Integer, nullable=True)
+    language = Column(String(10), nullable=True)
+    model_version = Column(String(100), nullable=True)  # ANALYSIS_, PARTIAL_ or RULES_MODEL_VERSION
     
     created_at = Column(DateTime, default=datetime.utcnow)
     applied = Column(Boolean, default=False)
@@ -154,6 +200,8 @@ class ResumeCorrection(db.Model):
     # Relationships
     resume = relationship("Resume", back_populates="corrections")
     
+    __table_args__ = (Index('ix_resume_corrections_lookup', 'resume_id', 'language', 'model_version'),)
+    
     def __repr__(self):
         return f"<ResumeCorrection {self.id}: {self.category}>"
 
@@ -180,6 +228,35 @@ class CoverLetter(db.Model):
         return f"<CoverLetter {self.id}: {self.job_title or 'Untitled'}>"
 
 
+class JobTermFrequency(db.Model):
+    """Number of distinct stored job descriptions containing each term (weights of the ATS coverage report)"""
+    __tablename__ = 'job_term_frequencies'
+    
+    term = Column(String(100), primary_key=True)  # CORPUS_SIZE_TERM counts the job descriptions
+    document_count = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<JobTermFrequency {self.term}: {self.document_count}>"
+
+
+class AnalysisJob(db.Model):
+    """Model for queued CV analysis jobs processed by worker.py"""
+    __tablename__ = 'analysis_jobs'
+    
+    id = Column(String(36), primary_key=True, default=lambda: uuid.uuid4().hex)
+    resume_id = Column(Integer, ForeignKey('resumes.id'), nullable=False)
+    language = Column(String(10), default='en')
+    status = Column(String(20), default='pending', index=True)  # pending, running, done, failed
+    error = Column(Text, nullable=True)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f"<AnalysisJob {self.id}: {self.status}>"
+
+
 class Testimonial(db.Model):
     """Model for storing user testimonials/feedback"""
     __tablename__ = 'testimonials'
@@ -197,18 +274,445 @@ class Testimonial(db.Model):
     def __repr__(self):
         return f"<Testimonial {self.id}: {self.name}>"
 
+def count_job_description_terms(job_description):
+    """
+    Add a job description to the term document frequencies, in the current transaction.
+    
+    Near-duplicates of an indexed ad are skipped so that an ad pasted by many users
+    does not make its own terms look common.
+    
+    Args:
+        job_description (str): Job description of a cover letter about to be stored
+    """
+    if job_description_index.find(job_description) is not None:
+        return
+    rows = [{"term": term, "document_count": 1} for term in document_terms(job_description) + [CORPUS_SIZE_TERM]]
+    
+    dialect = db.engine.dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        # One upsert statement per ad; each row is incremented in place, never recounted
+        insert = postgresql_insert if dialect == 'postgresql' else sqlite_insert
+        statement = insert(JobTermFrequency).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[JobTermFrequency.term],
+            set_={"document_count": JobTermFrequency.document_count + 1}
+        )
+        db.session.execute(statement)
+        return
+    
+    for row in rows:
+        updated = (JobTermFrequency.query.filter_by(term=row["term"])
+                   .update({"document_count": JobTermFrequency.document_count + 1}, synchronize_session=False))
+        if not updated:
+            db.session.add(JobTermFrequency(**row))
+
+def load_term_frequencies(terms):
+    """
+    Look up the document frequencies of some terms with a single primary key query.
+    
+    Args:
+        terms (iterable): Terms to look up
+        
+    Returns:
+        dict: Term -> document count, including CORPUS_SIZE_TERM; unknown terms are left out
+    """
+    keys = list(terms) + [CORPUS_SIZE_TERM]
+    rows = db.session.query(JobTermFrequency.term, JobTermFrequency.document_count).filter(JobTermFrequency.term.in_(keys)).all()
+    return {row.term: row.document_count for row in rows}
+
+# CV/job matching weighs terms with the document frequencies of the ATS coverage report
+job_matcher = TfidfMatcher(load_term_frequencies)
+
+def refresh_job_description_index(force=False, term_counts=None):
+    """
+    Add the job ads of cover letters stored since the last refresh to the near-duplicate index.
+
+    Args:
+        force (bool): Refresh even if the last refresh was less than JOB_INDEX_REFRESH_SECONDS ago
+        term_counts (Counter): If given, the terms of each ad that is not a near-duplicate of
+            an earlier one are counted into it, like count_job_description_terms does
+    """
+    global _job_index_refreshed_at
+    if not force and time.monotonic() - _job_index_refreshed_at < JOB_INDEX_REFRESH_SECONDS:
+        return
+    with _job_index_lock:
+        start = time.perf_counter()
+        before = len(job_description_index)
+        last_id = job_description_index.last_id
+        while True:
+            # Keyset pagination: only rows newer than the newest indexed one are read
+            rows = (db.session.query(CoverLetter.id, CoverLetter.job_description)
+                    .filter(CoverLetter.id > last_id)
+                    .order_by(CoverLetter.id)
+                    .limit(JOB_INDEX_BATCH_SIZE)
+                    .all())
+            if not rows:
+                break
+            for cover_letter_id, job_description in rows:
+                if term_counts is not None and job_description_index.find(job_description) is None:
+                    term_counts.update(document_terms(job_description) + [CORPUS_SIZE_TERM])
+                job_description_index.add(cover_letter_id, job_description, job_identity(job_description))
+            last_id = rows[-1].id
+        _job_index_refreshed_at = time.monotonic()
+        added = len(job_description_index) - before
+        if added:
+            logging.info(f"Indexed {added} new job descriptions in {time.perf_counter() - start:.2f} s "
+                         f"({len(job_description_index)} distinct ads up to cover letter {last_id})")
+
+def backfill_job_term_frequencies(term_counts):
+    """
+    Store the document frequencies of the job ads that were stored before they were counted.
+
+    The rows are inserted in one transaction; if another process filled the table in
+    the meantime, the insert fails on the existing terms and is rolled back.
+
+    Args:
+        term_counts (Counter): Term -> number of distinct ads, from refresh_job_description_index
+    """
+    if not term_counts:
+        return
+    rows = [{"term": term, "document_count": count} for term, count in term_counts.items()]
+    try:
+        for start in range(0, len(rows), JOB_INDEX_BATCH_SIZE):
+            db.session.bulk_insert_mappings(JobTermFrequency, rows[start:start + JOB_INDEX_BATCH_SIZE])
+        db.session.commit()
+        logging.info(f"Backfilled {len(rows)} job term frequencies from {term_counts[CORPUS_SIZE_TERM]} stored job descriptions")
+    except IntegrityError:
+        db.session.rollback()
+        logging.warning("Job term frequencies were filled by another process, skipping the backfill")
+
+# Columns and indexes added after the first release; create_all only creates missing tables.
+# Entries are (table, column or index name, statement that adds it).
+SCHEMA_MIGRATIONS = [
+    ("resumes", "content_hash", "ALTER TABLE resumes ADD COLUMN content_hash VARCHAR(64)"),
+    ("resumes", "ix_resumes_content_hash", "CREATE UNIQUE INDEX ix_resumes_content_hash ON resumes (content_hash)"),
+    ("resume_scores", "language", "ALTER TABLE resume_scores ADD COLUMN language VARCHAR(10)"),
+    ("resume_scores", "model_version", "ALTER TABLE resume_scores ADD COLUMN model_version VARCHAR(100)"),
+    ("resume_scores", "ix_resume_scores_lookup",
+     "CREATE INDEX ix_resume_scores_lookup ON resume_scores (resume_id, language, model_version)"),
+    ("resume_corrections", "language", "ALTER TABLE resume_corrections ADD COLUMN language VARCHAR(10)"),
+    ("resume_corrections", "model_version", "ALTER TABLE resume_corrections ADD COLUMN model_version VARCHAR(100)"),
+    ("resume_corrections", "ix_resume_corrections_lookup",
+     "CREATE INDEX ix_resume_corrections_lookup ON resume_corrections (resume_id, language, model_version)"),
+]
+
+def migrate_schema():
+    """Apply the SCHEMA_MIGRATIONS an existing database does not have yet."""
+    inspector = inspect(db.engine)
+    existing = {}
+    for table in {table for table, _, _ in SCHEMA_MIGRATIONS}:
+        existing[table] = ({column["name"] for column in inspector.get_columns(table)} |
+                           {index["name"] for index in inspector.get_indexes(table)})
+    for table, name, statement in SCHEMA_MIGRATIONS:
+        if name in existing[table]:
+            continue
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(text(statement))
+            logging.info(f"Applied schema migration: {statement}")
+        except SQLAlchemyError as e:
+            # Another process may have applied it first
+            logging.warning(f"Schema migration failed: {statement}: {str(e)}")
+
 # Create database tables
 with app.app_context():
     db.create_all()
+    migrate_schema()
     logging.info("Database tables created")
+    # Built before the workers fork so they share it and only load newer cover letters.
+    # Ads stored before the term frequency table existed are counted while they are indexed.
+    term_counts = Counter() if db.session.get(JobTermFrequency, CORPUS_SIZE_TERM) is None else None
+    refresh_job_description_index(force=True, term_counts=term_counts)
+    backfill_job_term_frequencies(term_counts)
+    # With gunicorn --preload this runs in the master; workers must open their own connections
+    db.engine.dispose()
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def error_score(language):
+    """Score data shown when a CV could not be scored."""
+    return {
+        "overall": 0,
+        "categories": {
+            "content": 0,
+            "format": 0,
+            "language": 0,
+            "conciseness": 0
+        },
+        "summary": "Error in evaluation" if language == 'en' else "Fehler bei der Bewertung"
+    }
+
+def score_record_from_data(resume_id, score_data, **columns):
+    """Build a ResumeScore row from a score dictionary (extra keyword arguments set further columns)."""
+    return ResumeScore(
+        resume_id=resume_id,
+        overall_score=score_data.get('overall', 0),
+        content_score=score_data.get('categories', {}).get('content', 0),
+        format_score=score_data.get('categories', {}).get('format', 0),
+        language_score=score_data.get('categories', {}).get('language', 0),
+        conciseness_score=score_data.get('categories', {}).get('conciseness', 0),
+        summary=score_data.get('summary', ''),
+        **columns
+    )
+
+def score_data_from_record(score_record):
+    """Convert a stored ResumeScore row back into a score dictionary."""
+    return {
+        "overall": round(score_record.overall_score or 0),
+        "categories": {
+            "content": round(score_record.content_score or 0),
+            "format": round(score_record.format_score or 0),
+            "language": round(score_record.language_score or 0),
+            "conciseness": round(score_record.conciseness_score or 0)
+        },
+        "summary": score_record.summary or ''
+    }
+
+def correction_data_from_record(correction_record):
+    """Convert a stored ResumeCorrection row back into a correction dictionary."""
+    return {
+        "original": correction_record.original_text,
+        "position": {"start": correction_record.position_start, "end": correction_record.position_end},
+        "suggestion": correction_record.suggested_text,
+        "explanation": correction_record.explanation or '',
+        "category": correction_record.category or ''
+    }
+
+def resume_content_hash(resume_text):
+    """
+    Hash a CV text so that resubmissions differing only in whitespace share one Resume row.
+    
+    Args:
+        resume_text (str): The parsed CV text
+        
+    Returns:
+        str: Hex SHA-256 digest of the whitespace-normalized text
+    """
+    return hashlib.sha256(normalize_text(resume_text).encode('utf-8')).hexdigest()
+
+def get_or_create_resume(resume_text, language, file_name=None, file_type=None):
+    """
+    Find the stored CV with the same content or store a new one.
+    
+    Args:
+        resume_text (str): The parsed CV text
+        language (str): Language of the analysis
+        file_name (str): Name of the uploaded file, if any
+        file_type (str): Extension of the uploaded file, if any
+        
+    Returns:
+        Resume: The existing or new row
+    """
+    content_hash = resume_content_hash(resume_text)
+    resume = Resume.query.filter_by(content_hash=content_hash).first()
+    if resume:
+        logging.info(f"CV matches stored resume {resume.id}")
+        return resume
+    
+    resume = Resume(
+        text=resume_text,
+        language=language,
+        file_name=file_name,
+        file_type=file_type,
+        content_hash=content_hash
+    )
+    db.session.add(resume)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # The same CV was stored by a concurrent request in the meantime
+        db.session.rollback()
+        resume = Resume.query.filter_by(content_hash=content_hash).one()
+    return resume
+
+def find_stored_analysis(resume_id, language, model_version=None):
+    """
+    Load the most recent stored analysis of a CV.
+    
+    Args:
+        resume_id (int): ID of the resume
+        language (str): Language of the analysis
+        model_version (str): Only consider corrections and a score made by this model version
+        
+    Returns:
+        tuple: (corrections list, score dict or None), or None if no corrections are stored
+    """
+    corrections_query = ResumeCorrection.query.filter_by(resume_id=resume_id, language=language)
+    if model_version:
+        corrections_query = corrections_query.filter_by(model_version=model_version)
+    latest = corrections_query.order_by(ResumeCorrection.created_at.desc()).first()
+    if not latest:
+        return None
+    
+    # The corrections and the score of one analysis share their creation time
+    correction_records = (corrections_query.filter(ResumeCorrection.created_at == latest.created_at)
+                          .order_by(ResumeCorrection.id)
+                          .limit(MAX_SESSION_CORRECTIONS)
+                          .all())
+    score_query = ResumeScore.query.filter_by(resume_id=resume_id, language=language, created_at=latest.created_at)
+    if model_version:
+        score_query = score_query.filter_by(model_version=model_version)
+    score_record = score_query.first()
+    
+    return ([correction_data_from_record(record) for record in correction_records],
+            score_data_from_record(score_record) if score_record else None)
+
+def run_resume_analysis(resume, language=None):
+    """
+    Analyze and score a stored resume and save the results.
+    
+    Corrections and a score the current model already produced for this CV and
+    language are returned without calling it again.
+    
+    Args:
+        resume (Resume): The resume row to analyze
+        language (str): Language of the analysis (defaults to the resume's language)
+        
+    Returns:
+        tuple: (corrections list, score dict)
+    """
+    resume_text = resume.text
+    language = language or resume.language or 'en'
+    
+    stored = find_stored_analysis(resume.id, language, ANALYSIS_MODEL_VERSION)
+    if stored and stored[1]:
+        logging.info(f"Reusing stored analysis of resume {resume.id} ({language}, {ANALYSIS_MODEL_VERSION})")
+        return stored
+    
+    corrections, analysis_version, score_data, score_version = analyze_and_score(resume_text, language)
+    
+    # Rule-based fallback results are stored as well, but never reused
+    analyzed_at = datetime.utcnow()
+    for correction in corrections:
+        db_correction = ResumeCorrection(
+            resume_id=resume.id,
+            original_text=correction.get('original', ''),
+            suggested_text=correction.get('suggestion', ''),
+            explanation=correction.get('explanation', ''),
+            category=correction.get('category', ''),
+            position_start=correction.get('position', {}).get('start'),
+            position_end=correction.get('position', {}).get('end'),
+            language=language,
+            model_version=analysis_version,
+            created_at=analyzed_at
+        )
+        db.session.add(db_correction)
+    
+    # Save score to database together with the corrections
+    if score_version:
+        db.session.add(score_record_from_data(resume.id, score_data, language=language,
+                                              model_version=score_version, created_at=analyzed_at))
+    
+    db.session.commit()
+    logging.info(f"Saved {len(corrections)} corrections and score {score_data.get('overall', 0)} to database")
+    
+    return corrections, score_data
+
+def analyze_and_score(resume_text, language):
+    """
+    Get the corrections and the score of a CV within the current deadline.
+    
+    Args:
+        resume_text (str): The CV text
+        language (str): Language of the analysis
+        
+    Returns:
+        tuple: (corrections, model version of the corrections, score dict,
+        model version of the score or None if the score is not worth saving)
+    """
+    with track_result_versions() as versions:
+        if ANALYSIS_MODE == 'combined':
+            # One LLM request returns both the corrections and the score
+            logging.info(f"Analyzing and scoring resume in combined mode with language: {language}")
+            corrections, score_data = analyze_and_score_resume(resume_text, language)
+            return corrections, versions.get("analysis", RULES_MODEL_VERSION), score_data, versions.get("score", RULES_MODEL_VERSION)
+        
+        # Analyze and score the CV concurrently so the user waits for the slower call only
+        logging.info(f"Analyzing and scoring resume with language: {language}")
+        corrections_future = analysis_executor.submit(with_current_context(analyze_resume), resume_text, language)
+        score_future = analysis_executor.submit(with_current_context(score_resume), resume_text, language)
+        
+        # Stop waiting once the request budget is spent and use the rule engine instead.
+        # Versions are read as soon as a call returns; a call that timed out may still record one later.
+        deadline = current_deadline()
+        try:
+            corrections = corrections_future.result(timeout=deadline.remaining() if deadline else None)
+            analysis_version = versions.get("analysis", RULES_MODEL_VERSION)
+        except FutureTimeoutError:
+            corrections_future.cancel()
+            logging.warning("Analysis deadline exceeded, using rule-based corrections")
+            corrections = perform_enhanced_analysis(resume_text, language)
+            analysis_version = RULES_MODEL_VERSION
+        if deadline:
+            deadline.mark("corrections")
+        
+        try:
+            score_data = score_future.result(timeout=deadline.remaining() if deadline else None)
+            score_version = versions.get("score", RULES_MODEL_VERSION)
+        except FutureTimeoutError:
+            score_future.cancel()
+            logging.warning("Scoring deadline exceeded, using rule-based score")
+            score_data = score_resume_with_rules(resume_text, language)
+            score_version = RULES_MODEL_VERSION
+        except Exception as e:
+            logging.error(f"Error scoring CV: {str(e)}")
+            logging.error(traceback.format_exc())
+            score_data = error_score(language)
+            score_version = None
+        if deadline:
+            deadline.mark("score")
+    
+    return corrections, analysis_version, score_data, score_version
+
+def process_analysis_job(job_id):
+    """
+    Run a claimed analysis job and record its outcome.
+    
+    Args:
+        job_id (str): ID of an AnalysisJob in the 'running' state
+    """
+    job = db.session.get(AnalysisJob, job_id)
+    if not job:
+        logging.warning(f"Analysis job {job_id} not found")
+        return
+    
+    try:
+        resume = db.session.get(Resume, job.resume_id)
+        with deadline_scope(f"analysis job {job_id}", ANALYSIS_DEADLINE_SECONDS):
+            run_resume_analysis(resume, job.language)
+        job.status = 'done'
+        logging.info(f"Analysis job {job_id} finished")
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"Analysis job {job_id} failed: {str(e)}")
+        logging.error(traceback.format_exc())
+        job = db.session.get(AnalysisJob, job_id)
+        job.status = 'failed'
+        job.error = str(e)
+    
+    job.finished_at = datetime.utcnow()
+    db.session.commit()
+
+def job_status_data(job):
+    """Public status information for an analysis job."""
+    return {
+        "id": job.id,
+        "status": job.status,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None
+    }
+
+@app.before_request
+def start_worker_pools():
+    """Start the PDF extraction processes of a web worker before its first upload arrives."""
+    warm_pdf_pool()
+
 @app.route('/')
 def index():
     # Clear any previous CV data from session
-    for key in ['resume_text', 'corrections', 'anschreiben', 'job_description', 'resume_score']:
+    for key in ['resume_text', 'corrections', 'anschreiben', 'job_description', 'resume_score', 'job_id']:
         if key in session:
             session.pop(key)
     
@@ -243,26 +747,17 @@ def analyze():
         
         try:
             filename = secure_filename(file.filename)
-            file_path = os.path.join(TEMP_FOLDER, filename)
-            logging.debug(f"Saving file to: {file_path}")
-            file.save(file_path)
             
             # Save file info for database
             file_name = filename
             file_type = filename.rsplit('.', 1)[1].lower()
             
-            # Parse the CV file
-            logging.debug(f"Parsing file: {file_path}")
-            resume_text = parse_resume_file(file_path)
+            # Parse the CV straight from the upload stream; Werkzeug keeps small
+            # uploads in memory and spools larger ones to an unnamed temporary file
+            logging.debug(f"Parsing uploaded file: {filename}")
+            resume_text = parse_resume_file(file.stream, file_name=filename)
             logging.debug(f"File parsed successfully, text length: {len(resume_text)}")
             
-            # Remove the temporary file
-            try:
-                os.remove(file_path)
-                logging.debug(f"Removed temporary file: {file_path}")
-            except Exception as e:
-                logging.warning(f"Could not remove temporary file: {str(e)}")
-            
         except Exception as e:
             flash(f'Error parsing file: {str(e)}', 'danger')
             logging.error(f"File parsing error: {str(e)}")
@@ -283,48 +778,53 @@ def analyze():
         return redirect(url_for('index'))
     
     try:
-        # Save resume to database
-        resume = Resume(
-            text=resume_text,
-            language=language,
-            file_name=file_name,
-            file_type=file_type
-        )
-        db.session.add(resume)
-        db.session.commit()
+        # Save resume to database, or reuse the stored row of an identical CV
+        resume = get_or_create_resume(resume_text, language, file_name, file_type)
         
-        # Store resume ID in session
+        # Store resume ID in session. Corrections are located in the stored text, which
+        # for a reused row may differ from this upload in whitespace or line breaks
         session['resume_id'] = resume.id
+        session['resume_text'] = resume.text
+        session['language'] = language
+        for key in ['corrections', 'resume_score', 'job_id']:
+            session.pop(key, None)
         
-        # Analyze the CV with AI using specified language
-        logging.info(f"Analyzing resume with language: {language}")
-        corrections = analyze_resume(resume_text, language)
-        
-        # Save corrections to database
-        for correction in corrections:
-            db_correction = ResumeCorrection(
-                resume_id=resume.id,
-                original_text=correction.get('original', ''),
-                suggested_text=correction.get('suggestion', ''),
-                explanation=correction.get('explanation', ''),
-                category=correction.get('category', ''),
-                position_start=correction.get('position', {}).get('start'),
-                position_end=correction.get('position', {}).get('end')
-            )
-            db.session.add(db_correction)
+        # Link the stored results if the current model already analyzed this CV
+        stored = find_stored_analysis(resume.id, language, ANALYSIS_MODEL_VERSION)
+        if stored and stored[1]:
+            logging.info(f"Reusing stored analysis of resume {resume.id}")
+            session['corrections'], session['resume_score'] = stored
+            if request.accept_mimetypes.best == 'application/json':
+                return json.dumps({'status': 'done', 'results_url': url_for('results')}), 200, {'ContentType': 'application/json'}
+            return redirect(url_for('results'))
         
-        db.session.commit()
-        logging.info(f"Saved {len(corrections)} corrections to database")
+        if ANALYSIS_QUEUE:
+            # Hand the analysis to a background worker and return right away,
+            # joining a queued job of the same CV instead of adding another one
+            job = (AnalysisJob.query.filter_by(resume_id=resume.id, language=language)
+                   .filter(AnalysisJob.status.in_(('pending', 'running')))
+                   .first())
+            if not job:
+                job = AnalysisJob(resume_id=resume.id, language=language)
+                db.session.add(job)
+                db.session.commit()
+                logging.info(f"Queued analysis job {job.id} for resume {resume.id}")
+            session['job_id'] = job.id
+            
+            if request.accept_mimetypes.best == 'application/json':
+                return json.dumps({'job_id': job.id, 'status_url': url_for('job_status', job_id=job.id)}), 202, {'ContentType': 'application/json'}
+            return redirect(url_for('results'))
+        
+        with deadline_scope("analysis", ANALYSIS_DEADLINE_SECONDS):
+            corrections, score_data = run_resume_analysis(resume, language)
         
         # Limit the number of corrections to prevent session size issues
-        max_corrections = 20
-        if len(corrections) > max_corrections:
-            logging.warning(f"Limiting corrections from {len(corrections)} to {max_corrections} to prevent session overflow")
-            corrections = corrections[:max_corrections]
+        if len(corrections) > MAX_SESSION_CORRECTIONS:
+            logging.warning(f"Limiting corrections from {len(corrections)} to {MAX_SESSION_CORRECTIONS} to prevent session overflow")
+            corrections = corrections[:MAX_SESSION_CORRECTIONS]
             
-        session['resume_text'] = resume_text
         session['corrections'] = corrections
-        session['language'] = language
+        session['resume_score'] = score_data
         
         return redirect(url_for('results'))
         
@@ -336,6 +836,27 @@ def analyze():
 
 @app.route('/results')
 def results():
+    # Load the results of a queued analysis once its job has finished
+    if 'resume_text' in session and 'corrections' not in session and session.get('job_id'):
+        job = db.session.get(AnalysisJob, session['job_id'])
+        if job and job.status in ('pending', 'running'):
+            return render_template('result.html',
+                                   job_pending=True,
+                                   job_id=job.id,
+                                   resume_text=session['resume_text'],
+                                   corrections=[],
+                                   score=error_score(session.get('language', 'en')),
+                                   language=session.get('language', 'en'))
+        
+        if job and job.status == 'done':
+            stored = find_stored_analysis(job.resume_id, job.language)
+            session['corrections'] = stored[0] if stored else []
+            if stored and stored[1]:
+                session['resume_score'] = stored[1]
+        else:
+            flash('Error analyzing CV. Please try again.', 'danger')
+            return redirect(url_for('index'))
+    
     # Check if CV and corrections are in session
     if 'resume_text' not in session or 'corrections' not in session:
         flash('Please submit a CV for analysis first.', 'warning')
@@ -345,50 +866,203 @@ def results():
     corrections = session['corrections']
     resume_id = session.get('resume_id')
     
-    # Get CV score if not already in session
+    # Scores are computed during /analyze; fall back to the stored record if the session lost it
     score_data = session.get('resume_score', None)
     if not score_data:
-        try:
-            # Get the language preference from the session
-            language = session.get('language', 'en')
-            score_data = score_resume(resume_text, language)
+        language = session.get('language', 'en')
+        score_record = None
+        if resume_id:
+            score_record = ResumeScore.query.filter_by(resume_id=resume_id, language=language).order_by(ResumeScore.created_at.desc()).first()
+        
+        if score_record:
+            score_data = score_data_from_record(score_record)
             session['resume_score'] = score_data
-            
-            # Save score to database if we have resume_id
-            if resume_id:
-                # Create the score record
-                score_record = ResumeScore(
-                    resume_id=resume_id,
-                    overall_score=score_data.get('overall', 0),
-                    content_score=score_data.get('categories', {}).get('content', 0),
-                    format_score=score_data.get('categories', {}).get('format', 0),
-                    language_score=score_data.get('categories', {}).get('language', 0),
-                    conciseness_score=score_data.get('categories', {}).get('conciseness', 0),
-                    summary=score_data.get('summary', '')
-                )
-                db.session.add(score_record)
-                db.session.commit()
-                logging.info(f"Saved resume score to database, overall: {score_data.get('overall', 0)}")
-                
-        except Exception as e:
-            logging.error(f"Error scoring CV: {str(e)}")
-            logging.error(traceback.format_exc())
-            score_data = {
-                "overall": 0,
-                "categories": {
-                    "content": 0,
-                    "format": 0,
-                    "language": 0,
-                    "conciseness": 0
-                },
-                "summary": "Error in evaluation" if 'language' in locals() and language == 'en' else "Fehler bei der Bewertung"
-            }
+        else:
+            logging.warning(f"No stored score found for resume {resume_id}")
+            score_data = error_score(language)
     
     # Get the language from session
     language = session.get('language', 'en')
     
     return render_template('result.html', resume_text=resume_text, corrections=corrections, score=score_data, language=language)
 
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Return the status of an analysis job for polling clients."""
+    job = db.session.get(AnalysisJob, job_id)
+    if not job:
+        return json.dumps({'error': 'Job not found'}), 404, {'ContentType': 'application/json'}
+    return json.dumps(job_status_data(job)), 200, {'ContentType': 'application/json'}
+
+def get_bulk_process_pool():
+    """Get the process pool for CPU-bound bulk scoring, created once per web worker process."""
+    global _bulk_process_pool, _bulk_process_pool_pid
+    if _bulk_process_pool is None or _bulk_process_pool_pid != os.getpid():
+        _bulk_process_pool = ProcessPoolExecutor(max_workers=BULK_PROCESS_WORKERS)
+        _bulk_process_pool_pid = os.getpid()
+    return _bulk_process_pool
+
+def discard_bulk_process_pool():
+    """Forget a broken bulk scoring pool so the next request starts a new one."""
+    global _bulk_process_pool
+    _bulk_process_pool = None
+
+def bulk_api_authorized():
+    """Check the API key of a bulk API request (never allowed when BULK_API_KEY is unset)."""
+    if not BULK_API_KEY:
+        return False
+    auth_header = request.headers.get('Authorization', '')
+    key = request.headers.get('X-API-Key') or (auth_header[7:] if auth_header.startswith('Bearer ') else None)
+    return key is not None and hmac.compare_digest(key.encode('utf-8'), BULK_API_KEY.encode('utf-8'))
+
+def score_with_llm(text, language):
+    """Score one CV with the LLM (falling back to the rules) under the analysis time budget."""
+    with deadline_scope("bulk score", ANALYSIS_DEADLINE_SECONDS):
+        return score_resume(text, language)
+
+def ndjson_line(data):
+    """Format one newline-delimited JSON record."""
+    return json.dumps(data) + "\n"
+
+@app.route('/api/score', methods=['POST'])
+def api_score():
+    """
+    Score a batch of CVs and stream the results back as newline-delimited JSON.
+    
+    The request body is {"items": [...], "mode": "rules" | "llm", "language": "en"}.
+    Each item has either "text" or "resume_id", and optionally "id" and "language".
+    Rule-based scoring runs on a process pool in chunks; LLM scoring runs on a
+    bounded thread pool. One line is written per item as soon as its score is ready,
+    followed by a summary line.
+    """
+    if not BULK_API_KEY:
+        # Fail closed: an open endpoint would let anyone spend the provider quota in bulk
+        return json.dumps({'error': 'Bulk API is disabled (BULK_API_KEY is not set)'}), 403, {'ContentType': 'application/json'}
+    if not bulk_api_authorized():
+        return json.dumps({'error': 'Invalid API key'}), 401, {'ContentType': 'application/json'}
+    
+    payload = request.get_json(silent=True) or {}
+    items = payload.get('items')
+    mode = payload.get('mode', 'rules')
+    default_language = payload.get('language', 'en')
+    
+    if not isinstance(items, list) or not items:
+        return json.dumps({'error': 'Expected a non-empty "items" list'}), 400, {'ContentType': 'application/json'}
+    if len(items) > BULK_MAX_ITEMS:
+        return json.dumps({'error': f'At most {BULK_MAX_ITEMS} items per request'}), 400, {'ContentType': 'application/json'}
+    if mode not in ('rules', 'llm'):
+        return json.dumps({'error': 'mode must be "rules" or "llm"'}), 400, {'ContentType': 'application/json'}
+    
+    # Load stored CVs with a single query
+    resume_ids = [item.get('resume_id') for item in items if isinstance(item, dict) and item.get('resume_id') is not None]
+    stored_texts = {}
+    if resume_ids:
+        rows = db.session.query(Resume.id, Resume.text, Resume.language).filter(Resume.id.in_(resume_ids)).all()
+        stored_texts = {row.id: (row.text, row.language) for row in rows}
+    
+    # Resolve every item to (index, id, text, language) or an immediate error
+    work = []
+    errors = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors.append({'index': index, 'id': None, 'error': 'Item must be an object'})
+            continue
+        item_id = item.get('id', item.get('resume_id'))
+        language = item.get('language')
+        if item.get('resume_id') is not None:
+            stored = stored_texts.get(item['resume_id'])
+            if not stored:
+                errors.append({'index': index, 'id': item_id, 'error': 'Resume not found'})
+                continue
+            text, stored_language = stored
+            language = language or stored_language
+        else:
+            text = item.get('text')
+            if not isinstance(text, str) or not text.strip():
+                errors.append({'index': index, 'id': item_id, 'error': 'Item needs "text" or "resume_id"'})
+                continue
+        if len(text) > BULK_MAX_TEXT_CHARS:
+            errors.append({'index': index, 'id': item_id, 'error': f'Text longer than {BULK_MAX_TEXT_CHARS} characters'})
+            continue
+        work.append((index, item_id, text, language or default_language))
+    
+    logging.info(f"Bulk scoring {len(work)} CVs in {mode} mode ({len(errors)} rejected)")
+    
+    def generate():
+        start_time = time.monotonic()
+        failed = len(errors)
+        futures = {}
+        try:
+            for error in errors:
+                yield ndjson_line(error)
+            
+            if mode == 'rules':
+                pool = get_bulk_process_pool()
+                for chunk_start in range(0, len(work), BULK_CHUNK_SIZE):
+                    chunk = work[chunk_start:chunk_start + BULK_CHUNK_SIZE]
+                    futures[pool.submit(score_batch, [text for _, _, text, _ in chunk])] = chunk
+            else:
+                for entry in work:
+                    futures[bulk_llm_executor.submit(score_with_llm, entry[2], entry[3])] = [entry]
+            
+            for future in as_completed(futures):
+                chunk = futures[future]
+                try:
+                    scores = future.result()
+                    if mode == 'llm':
+                        scores = [scores]
+                except BrokenProcessPool:
+                    # Score in this process rather than failing the chunk; the pool is rebuilt on the next request
+                    discard_bulk_process_pool()
+                    logging.error("Bulk scoring process pool broke, scoring chunk in the web worker")
+                    scores = score_batch([text for _, _, text, _ in chunk])
+                except Exception as e:
+                    logging.error(f"Bulk scoring error: {str(e)}")
+                    for index, item_id, _, _ in chunk:
+                        failed += 1
+                        yield ndjson_line({'index': index, 'id': item_id, 'error': 'Scoring failed'})
+                    continue
+                
+                for (index, item_id, _, language), score_data in zip(chunk, scores):
+                    if 'summary' not in score_data:
+                        score_data['summary'] = get_score_summary(score_data['overall'], language)
+                    yield ndjson_line({'index': index, 'id': item_id, 'score': score_data})
+            
+            yield ndjson_line({'summary': {
+                'items': len(items),
+                'scored': len(items) - failed,
+                'failed': failed,
+                'mode': mode,
+                'elapsed_ms': round((time.monotonic() - start_time) * 1000)
+            }})
+        finally:
+            # Drop queued work if the client went away
+            for future in futures:
+                future.cancel()
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/stats')
+def api_stats():
+    """
+    Report the hit rates of the result caches and the circuit breaker state of each
+    provider in this worker process, for monitoring. Requires the bulk API key.
+    """
+    if not bulk_api_authorized():
+        return json.dumps({'error': 'Invalid API key'}), 401, {'ContentType': 'application/json'}
+    
+    caches = get_cache_stats()
+    caches['job_description'] = job_description_cache.get_stats()
+    return json.dumps({
+        'pid': os.getpid(),
+        'caches': caches,
+        'providers': get_provider_stats()
+    }), 200, {'ContentType': 'application/json'}
+
 @app.route('/download', methods=['POST'])
 def download():
     if 'resume_text' not in session:
@@ -521,6 +1195,14 @@ def anschreiben_page():
         anschreiben_text = session.get('anschreiben', '')
         job_description = session.get('job_description', '')
         
+        # Streamed cover letters are only stored in the database
+        resume_id = session.get('resume_id')
+        if not anschreiben_text and resume_id:
+            cover_letter = CoverLetter.query.filter_by(resume_id=resume_id).order_by(CoverLetter.created_at.desc()).first()
+            if cover_letter:
+                anschreiben_text = cover_letter.text
+                job_description = cover_letter.job_description
+        
         # Get the language from session
         language = session.get('language', 'en')
         
@@ -534,6 +1216,7 @@ def anschreiben_page():
         # Get CV and job description
         resume_text = session.get('resume_text', '')
         job_description = request.form.get('job_description', '')
+        regenerate = request.form.get('regenerate') == '1'  # Bypass the cover letter cache
         resume_id = session.get('resume_id')
         
         if not resume_text:
@@ -548,9 +1231,14 @@ def anschreiben_page():
                                   anschreiben='')
         
         try:
+            # Let near-identical ads stored by other workers share cached results
+            refresh_job_description_index()
+            
             # Generate anschreiben using API
             logging.info("Generating cover letter (Anschreiben)")
-            anschreiben_text = generate_anschreiben(resume_text, job_description)
+            with deadline_scope("anschreiben", ANSCHREIBEN_DEADLINE_SECONDS) as deadline:
+                anschreiben_text = generate_anschreiben(resume_text, job_description, regenerate=regenerate)
+                deadline.mark("generation")
             
             # Store in session
             session['anschreiben'] = anschreiben_text
@@ -558,23 +1246,23 @@ def anschreiben_page():
             
             # Save to database if we have resume_id
             if resume_id:
-                # Get job title and company name
-                from ai_analyzer import extract_job_title, extract_company_name
-                job_title = extract_job_title(job_description)
-                company_name = extract_company_name(job_description)
+                # Job title and company come from the parse cached by generate_anschreiben
+                job = parse_job_description(job_description)
                 
                 # Save cover letter
                 cover_letter = CoverLetter(
                     resume_id=resume_id,
                     text=anschreiben_text,
                     job_description=job_description,
-                    job_title=job_title,
-                    company_name=company_name,
+                    job_title=job.title,
+                    company_name=job.company,
                     language='de'  # Anschreiben is typically German
                 )
                 db.session.add(cover_letter)
+                count_job_description_terms(job_description)
                 db.session.commit()
                 logging.info(f"Saved cover letter to database for resume {resume_id}")
+                refresh_job_description_index(force=True)
             
             # Get the language from session
             language = session.get('language', 'en')
@@ -599,9 +1287,101 @@ def anschreiben_page():
                                  anschreiben='',
                                  language=language)
 
+@app.route('/anschreiben/match', methods=['POST'])
+def anschreiben_match():
+    """Score how well the session's CV matches a job description, with its keyword gap and ATS keyword coverage."""
+    resume_text = session.get('resume_text', '')
+    job_description = request.form.get('job_description', '')
+    
+    if not resume_text:
+        return json.dumps({'error': 'No CV found. Please upload your CV first.'}), 400, {'ContentType': 'application/json'}
+    
+    if not job_description or len(job_description) < 50:
+        return json.dumps({'error': 'Please provide a detailed job description to check the match.'}), 400, {'ContentType': 'application/json'}
+    
+    result = job_matcher.match(resume_text, job_description)
+    logging.info(f"CV matches job description with score {result.score}, {len(result.missing)} keywords missing")
+    
+    # ATS screening simulation: required terms weighted by how rare they are among stored ads
+    required = required_terms(job_description)
+    report = score_coverage(resume_text, required, load_term_frequencies(required))
+    
+    return json.dumps({**result.to_dict(), 'ats': report.to_dict()}), 200, {'ContentType': 'application/json'}
+
+def sse_event(data, event=None):
+    """Format a Server-Sent Events message."""
+    message = f"event: {event}\n" if event else ""
+    return message + f"data: {json.dumps(data)}\n\n"
+
+@app.route('/anschreiben/stream', methods=['POST'])
+def anschreiben_stream():
+    """Stream a generated cover letter to the browser as Server-Sent Events."""
+    resume_text = session.get('resume_text', '')
+    job_description = request.form.get('job_description', '')
+    regenerate = request.form.get('regenerate') == '1'  # Bypass the cover letter cache
+    resume_id = session.get('resume_id')
+    
+    if not resume_text:
+        return json.dumps({'error': 'No CV found. Please upload your CV first.'}), 400, {'ContentType': 'application/json'}
+    
+    if not job_description or len(job_description) < 50:
+        return json.dumps({'error': 'Please provide a detailed job description to generate a personalized cover letter.'}), 400, {'ContentType': 'application/json'}
+    
+    # The session is saved before the body is streamed, so only the inputs can go there
+    session['job_description'] = job_description
+    session.pop('anschreiben', None)
+    
+    def generate():
+        parts = []
+        try:
+            # Let near-identical ads stored by other workers share cached results
+            refresh_job_description_index()
+            
+            logging.info("Streaming cover letter (Anschreiben)")
+            with deadline_scope("anschreiben stream", ANSCHREIBEN_DEADLINE_SECONDS) as deadline:
+                for text in generate_anschreiben_stream(resume_text, job_description, regenerate=regenerate):
+                    parts.append(text)
+                    yield sse_event({'text': text})
+                deadline.mark("generation")
+            
+            anschreiben_text = "".join(parts)
+            cover_letter_id = None
+            
+            # Save the final text once the stream is complete
+            if resume_id:
+                job = parse_job_description(job_description)
+                cover_letter = CoverLetter(
+                    resume_id=resume_id,
+                    text=anschreiben_text,
+                    job_description=job_description,
+                    job_title=job.title,
+                    company_name=job.company,
+                    language='de'  # Anschreiben is typically German
+                )
+                db.session.add(cover_letter)
+                count_job_description_terms(job_description)
+                db.session.commit()
+                cover_letter_id = cover_letter.id
+                logging.info(f"Saved streamed cover letter to database for resume {resume_id}")
+                refresh_job_description_index(force=True)
+            
+            yield sse_event({'cover_letter_id': cover_letter_id}, event='done')
+        except Exception as e:
+            logging.error(f"Anschreiben streaming error: {str(e)}")
+            logging.error(traceback.format_exc())
+            db.session.rollback()
+            yield sse_event({'error': 'Error generating cover letter. Please try again.'}, event='error')
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/download_anschreiben', methods=['POST'])
 def download_anschreiben():
-    if 'anschreiben' not in session:
+    # Streamed cover letters are not in the session, so accept the posted text as well
+    if 'anschreiben' not in session and not request.form.get('anschreiben_text'):
         flash('No cover letter available for download.', 'warning')
         return redirect(url_for('anschreiben_page'))
     
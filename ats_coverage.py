@@ -0,0 +1,91 @@
+import os
+from job_description import parse_job_description
+from job_matching import extract_terms, term_weight, MAX_TERM_LENGTH, CORPUS_SIZE_TERM
+
+# Number of present and absent terms listed in a report
+ATS_REPORT_TERMS = int(os.environ.get("ATS_REPORT_TERMS", "15"))
+
+
+def document_terms(job_description):
+    """
+    List the distinct terms of a job description as stored in the document frequency table.
+
+    Args:
+        job_description (str): The job description text
+
+    Returns:
+        list: Sorted distinct terms (sorted so concurrent upserts lock rows in the same order)
+    """
+    counts, _ = extract_terms(job_description)
+    return sorted({term[:MAX_TERM_LENGTH] for term in counts})
+
+
+def required_terms(job_description):
+    """
+    Find the terms an applicant tracking system would screen for.
+
+    Args:
+        job_description (str): The job description text
+
+    Returns:
+        dict: Term -> display name, from the ad's requirements section if it has one, else from the whole ad
+    """
+    job = parse_job_description(job_description)
+    counts, display = extract_terms("\n".join(job.requirements) or job_description)
+    return {term[:MAX_TERM_LENGTH]: display.get(term, term) for term in counts}
+
+
+class CoverageReport:
+    """
+    Keyword coverage of a CV against the required terms of a job description.
+
+    Attributes:
+        coverage (int): IDF-weighted share of the required terms found in the CV, in percent
+        present (list): (term, weight) of required terms in the CV, heaviest first
+        absent (list): (term, weight) of required terms missing from the CV, heaviest first
+        corpus_size (int): Number of stored job descriptions the weights come from
+    """
+
+    def __init__(self, coverage, present, absent, corpus_size):
+        self.coverage = coverage
+        self.present = present
+        self.absent = absent
+        self.corpus_size = corpus_size
+
+    def to_dict(self):
+        return {
+            "coverage": self.coverage,
+            "present": [{"term": term, "weight": round(weight, 2)} for term, weight in self.present],
+            "absent": [{"term": term, "weight": round(weight, 2)} for term, weight in self.absent],
+            "corpus_size": self.corpus_size
+        }
+
+
+def score_coverage(resume_text, required, frequencies, limit=ATS_REPORT_TERMS):
+    """
+    Simulate ATS keyword screening of a CV.
+
+    Args:
+        resume_text (str): The CV text
+        required (dict): Output of required_terms
+        frequencies (dict): Term -> number of stored job descriptions containing it,
+            including CORPUS_SIZE_TERM; only the required terms need to be present
+        limit (int): Maximum number of present and absent terms listed
+
+    Returns:
+        CoverageReport: The weighted coverage and the terms behind it
+    """
+    resume_counts, _ = extract_terms(resume_text)
+    resume_terms = {term[:MAX_TERM_LENGTH] for term in resume_counts}
+    document_count = frequencies.get(CORPUS_SIZE_TERM, 0)
+
+    present, absent = [], []
+    for term, name in required.items():
+        weight = term_weight(frequencies.get(term, 0), document_count)
+        (present if term in resume_terms else absent).append((name, weight))
+
+    total = sum(weight for _, weight in present) + sum(weight for _, weight in absent)
+    coverage = round(sum(weight for _, weight in present) / total * 100) if total else 0
+    present.sort(key=lambda item: item[1], reverse=True)
+    absent.sort(key=lambda item: item[1], reverse=True)
+    return CoverageReport(coverage, present[:limit], absent[:limit], document_count)
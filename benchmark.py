@@ -0,0 +1,392 @@
+#!/bin/env python3
+"""
+Micro-benchmarks for the CV analysis pipeline.
+
+Usage:
+    python benchmark.py http [--calls N]
+    python benchmark.py locate [--chars N] [--suggestions N] [--rounds N]
+    python benchmark.py rules [--cvs N] [--chars N] [--language en|de]
+    python benchmark.py score [--cvs N] [--words N] [--workers N]
+    python benchmark.py skills [--cvs N] [--chars N]
+    python benchmark.py match [--cvs N] [--ads N] [--top N]
+    python benchmark.py pdf PDF_DIR [--workers N] [--max-pages N]
+"""
+import sys
+import json
+import random
+import time
+import re
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def report(name, count, seconds, unit="calls"):
+    """Print a single benchmark result line."""
+    per_item_ms = seconds / count * 1000 if count else 0.0
+    rate = count / seconds if seconds else float('inf')
+    print(f"{name:<40} {count:>8} {unit:<6} {seconds:>9.3f} s {per_item_ms:>9.3f} ms/{unit[:-1]} {rate:>12.1f} {unit}/s")
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Minimal JSON endpoint that supports HTTP/1.1 keep-alive."""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        body = json.dumps({"choices": [{"message": {"content": "[]"}}]}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def bench_http(args):
+    """Compare one-off requests.post calls with the pooled provider session."""
+    import requests
+    from ai_analyzer import get_http_session
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+    payload = {"model": "stub", "messages": [{"role": "user", "content": "x" * 2500}]}
+
+    try:
+        start = time.perf_counter()
+        for _ in range(args.calls):
+            requests.post(url, json=payload, timeout=10).json()
+        report("requests.post (new connection)", args.calls, time.perf_counter() - start)
+
+        session = get_http_session()
+        session.post(url, json=payload, timeout=10).json()  # Warm the pool
+        start = time.perf_counter()
+        for _ in range(args.calls):
+            session.post(url, json=payload, timeout=10).json()
+        report("pooled keep-alive session", args.calls, time.perf_counter() - start)
+    finally:
+        server.shutdown()
+
+
+def _legacy_locate(resume_text, phrases):
+    """Per-phrase str.find with a lower-cased regex fallback, as used before TextLocator."""
+    spans = []
+    for phrase in phrases:
+        start_pos = resume_text.find(phrase)
+        if start_pos == -1:
+            matches = list(re.finditer(re.escape(phrase.lower()), resume_text.lower()))
+            if not matches:
+                spans.append(None)
+                continue
+            start_pos = matches[0].start()
+        spans.append((start_pos, start_pos + len(phrase)))
+    return spans
+
+
+def bench_locate(args):
+    """Compare per-suggestion scanning with the single-pass TextLocator."""
+    from text_locator import TextLocator
+
+    rng = random.Random(42)
+    words = ["managed", "developed", "team", "project", "Python", "customer", "improved", "process",
+             "delivered", "analysis", "reporting", "stakeholders", "budget", "quality", "Software"]
+    lines = []
+    length = 0
+    while length < args.chars:
+        line = " ".join(rng.choice(words) for _ in range(rng.randint(6, 14))) + "."
+        lines.append(line)
+        length += len(line) + 1
+    resume_text = "\n".join(lines)
+
+    # Mix of exact quotes, case changes and phrases that are not in the text
+    phrases = []
+    for index in range(args.suggestions):
+        line = rng.choice(lines)
+        tokens = line.split()
+        start = rng.randint(0, max(0, len(tokens) - 4))
+        phrase = " ".join(tokens[start:start + 4])
+        if index % 3 == 1:
+            phrase = phrase.upper()
+        elif index % 3 == 2:
+            phrase = phrase + " zzz"
+        phrases.append(phrase)
+
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        _legacy_locate(resume_text, phrases)
+    report("find + lower() regex per suggestion", args.rounds * len(phrases), time.perf_counter() - start, "phrases")
+
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        TextLocator(resume_text).locate_all(phrases)
+    report("TextLocator single pass", args.rounds * len(phrases), time.perf_counter() - start, "phrases")
+
+
+def _legacy_rules(resume_text, rules):
+    """One re.finditer pass per rule, as perform_enhanced_analysis did before RuleEngine."""
+    from rule_engine import match_case
+
+    corrections = []
+    for rule in rules:
+        for match in re.finditer(rule["pattern"], resume_text, re.IGNORECASE):
+            original_text = resume_text[match.start():match.end()]
+            replacement = match_case(original_text, rule["replacement"])
+            if not replacement:
+                continue
+            corrections.append({
+                "original": original_text,
+                "position": {"start": match.start(), "end": match.end()},
+                "suggestion": replacement,
+                "explanation": rule["explanation"],
+                "category": rule["category"]
+            })
+    return corrections
+
+
+def bench_rules(args):
+    """Compare per-rule regex scans with the compiled single-pass rule engine."""
+    from rule_packs import rule_bundles
+
+    engine = rule_bundles.get_engine(args.language)
+    rng = random.Random(42)
+    words = ["managed", "developed", "software", "customers", "projects", "analysis", "and", "the", "with",
+             "Python", "reporting", "improved", "budget", "quality", "team", "for", "a", "in", "of"]
+    phrases = ["responsible for", "helped with", "worked on", "team player", "ms office", "javascript",
+               "significantly improved", "led a team", "my", "I", "sehr gute Kenntnisse", "zuständig für"]
+    cvs = []
+    for _ in range(args.cvs):
+        tokens = []
+        length = 0
+        while length < args.chars:
+            token = rng.choice(phrases) if rng.random() < 0.03 else rng.choice(words)
+            tokens.append(token)
+            length += len(token) + 1
+        cvs.append(" ".join(tokens))
+
+    for resume_text in cvs[:20]:
+        assert engine.apply(resume_text) == _legacy_rules(resume_text, engine.rules), "Rule engine output differs"
+
+    start = time.perf_counter()
+    for resume_text in cvs:
+        _legacy_rules(resume_text, engine.rules)
+    report("re.finditer per rule", len(cvs), time.perf_counter() - start, "cvs")
+
+    start = time.perf_counter()
+    for resume_text in cvs:
+        engine.apply(resume_text)
+    report("compiled single-pass RuleEngine", len(cvs), time.perf_counter() - start, "cvs")
+
+
+def bench_score(args):
+    """Compare scoring CVs one at a time with batch feature extraction and vectorized scoring."""
+    from ai_analyzer import score_resume_with_rules
+    from scoring import score_batch
+
+    rng = random.Random(42)
+    words = ["Increased", "sales", "by", "15%", "led", "team", "of", "8", "Python", "university", "skills",
+             "I", "have", "an", "apple", "project", "customer", "the", "and", "reporting"]
+    cvs = []
+    for _ in range(args.cvs):
+        lines = ["EXPERIENCE"]
+        for _ in range(rng.randint(args.words // 16, args.words // 6)):
+            lines.append(rng.choice(["• ", "- ", ""]) + " ".join(rng.choice(words) for _ in range(rng.randint(4, 14))))
+        cvs.append("\n".join(lines))
+
+    start = time.perf_counter()
+    single = [score_resume_with_rules(resume_text) for resume_text in cvs]
+    report("score_resume_with_rules per CV", len(cvs), time.perf_counter() - start, "cvs")
+
+    start = time.perf_counter()
+    batch = score_batch(cvs)
+    report("score_batch (NumPy)", len(cvs), time.perf_counter() - start, "cvs")
+
+    if args.workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            score_batch(cvs[:args.workers], executor=executor)  # Start the worker processes
+            start = time.perf_counter()
+            pooled = score_batch(cvs, executor=executor)
+            report(f"score_batch ({args.workers} processes)", len(cvs), time.perf_counter() - start, "cvs")
+        assert pooled == batch, "Pooled batch scores differ"
+
+    for single_score, batch_score in zip(single, batch):
+        assert single_score["overall"] == batch_score["overall"], "Batch scores differ"
+        assert single_score["categories"] == batch_score["categories"], "Batch scores differ"
+
+
+def _legacy_skills(resume_text):
+    """Hard-coded IGNORECASE findall passes, as extract_skills_from_resume did before the taxonomy."""
+    skills = {"technical_skills": [], "languages": []}
+    for pattern in [
+        r"\b(?:Deutsch|Englisch|Französisch|Spanisch|Italienisch|Russisch|Chinesisch|Japanisch)\b(?:\s+\((?:Muttersprache|[BCG][12]|fließend|verhandlungssicher|Grundkenntnisse)\))?",
+        r"\b(?:German|English|French|Spanish|Italian|Russian|Chinese|Japanese)\b(?:\s+\((?:native|[BCG][12]|fluent|business|basic)\))?"
+    ]:
+        skills["languages"].extend(re.findall(pattern, resume_text, re.IGNORECASE))
+    skills["technical_skills"].extend(re.findall(
+        r"\b(?:Java|Python|C\+\+|JavaScript|SQL|PHP|HTML|CSS|React|Angular|Vue|Node\.js|Excel|Word|PowerPoint|SAP)\b",
+        resume_text, re.IGNORECASE))
+    return {category: list(set(values)) for category, values in skills.items()}
+
+
+def bench_skills(args):
+    """Compare the hard-coded skill regexes with the taxonomy trie on multi-page CVs."""
+    from skill_taxonomy import skill_matcher
+
+    rng = random.Random(42)
+    words = ["managed", "developed", "software", "customers", "projects", "analysis", "and", "the", "with",
+             "reporting", "improved", "budget", "quality", "team", "for", "a", "in", "of", "2019", "GmbH"]
+    skills = ["Python", "JS", "k8s", "Spring Boot", "CI/CD", "PostgreSQL", "Excel", "SAP S/4HANA", "Scrum",
+              "Machine Learning", "English (C1)", "Deutsch", "React.js", "Go", "AWS", "Docker,", "C++", "(.NET)"]
+    separators = [" ", " ", " ", " ", ", ", ".\n", "\n• "]
+    cvs = []
+    for _ in range(args.cvs):
+        tokens = []
+        length = 0
+        while length < args.chars:
+            token = (rng.choice(skills) if rng.random() < 0.04 else rng.choice(words)) + rng.choice(separators)
+            tokens.append(token)
+            length += len(token)
+        cvs.append("".join(tokens))
+
+    start = time.perf_counter()
+    for resume_text in cvs:
+        _legacy_skills(resume_text)
+    report("hard-coded IGNORECASE findall", len(cvs), time.perf_counter() - start, "cvs")
+
+    start = time.perf_counter()
+    for resume_text in cvs:
+        skill_matcher.extract(resume_text)
+    report(f"taxonomy trie ({skill_matcher.alias_count} aliases)", len(cvs), time.perf_counter() - start, "cvs")
+
+
+def bench_match(args):
+    """Time single CV/job matches and top-k matching of CVs against a set of job ads."""
+    from collections import Counter
+    from ats_coverage import document_terms
+    from job_matching import TfidfMatcher, CORPUS_SIZE_TERM
+
+    rng = random.Random(7)
+    vocabulary = ["Python", "Java", "SQL", "Kubernetes", "Docker", "Scrum", "Excel", "SAP", "React", "AWS",
+                  "Teamfähigkeit", "Erfahrung", "Kenntnisse", "Projekte", "Kunden", "Vertrieb", "Analyse",
+                  "Entwicklung", "Betrieb", "Beratung", "Marketing", "Controlling", "Buchhaltung", "Logistik"]
+    filler = ["und", "mit", "für", "die", "der", "in", "team", "arbeiten", "verantwortung", "lösungen"]
+
+    def document(words):
+        return " ".join(rng.choice(vocabulary) if rng.random() < 0.3 else rng.choice(filler) for _ in range(words))
+
+    ads = [document(300) for _ in range(args.ads)]
+    cvs = [document(600) for _ in range(args.cvs)]
+
+    # The same counts the app keeps in the job term frequency table
+    start = time.perf_counter()
+    frequencies = Counter(term for ad in ads for term in document_terms(ad))
+    frequencies[CORPUS_SIZE_TERM] = len(ads)
+    report("count document frequencies of job ads", len(ads), time.perf_counter() - start, "ads")
+    matcher = TfidfMatcher(lambda terms: frequencies)
+
+    start = time.perf_counter()
+    for resume_text, job_description in zip(cvs, ads * (len(cvs) // len(ads) + 1)):
+        matcher.match(resume_text, job_description)
+    report("match with keyword gap (incl. tokenizing)", len(cvs), time.perf_counter() - start, "pairs")
+
+    ad_vectors = matcher.vectorize(ads)
+    cv_vectors = matcher.vectorize(cvs)
+    start = time.perf_counter()
+    similarities = (cv_vectors @ ad_vectors.T).toarray()
+    elapsed = time.perf_counter() - start
+    report("sparse cosine, prebuilt vectors", similarities.size, elapsed, "pairs")
+
+    start = time.perf_counter()
+    matcher.top_k(cvs, ad_vectors, k=args.top)
+    report(f"top-{args.top} ads per CV (incl. tokenizing)", len(cvs), time.perf_counter() - start, "cvs")
+
+
+def bench_pdf(args):
+    """Compare whole-file and page-parallel PDF extraction over a directory of CV PDFs."""
+    import os
+    import resume_parser
+    from pdfminer.high_level import extract_text
+
+    paths = sorted(os.path.join(root, name) for root, _, names in os.walk(args.pdf_dir)
+                   for name in names if name.lower().endswith(".pdf"))
+    if not paths:
+        print(f"No PDF files found in {args.pdf_dir}", file=sys.stderr)
+        return
+    page_counts = [resume_parser.count_pdf_pages(path, args.max_pages) for path in paths]
+    pages = sum(page_counts)
+    print(f"{len(paths)} PDFs, {pages} pages (at most {args.max_pages} per file)")
+
+    start = time.perf_counter()
+    sequential = [extract_text(path, maxpages=count) for path, count in zip(paths, page_counts)]
+    report("extract_text, whole file", pages, time.perf_counter() - start, "pages")
+
+    resume_parser.PDF_WORKERS = args.workers
+    resume_parser.PDF_MAX_PAGES = args.max_pages
+    resume_parser.get_pdf_pool()
+    time.sleep(1.0)  # Let the pre-warmed workers finish importing pdfminer
+
+    start = time.perf_counter()
+    parallel = [resume_parser.parse_pdf(path) for path in paths]
+    report(f"page-parallel pool, {args.workers} workers", pages, time.perf_counter() - start, "pages")
+
+    for path, expected, text in zip(paths, sequential, parallel):
+        if expected != text:
+            print(f"Warning: extracted text differs for {path}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run performance benchmarks.")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    http_parser = subparsers.add_parser("http", help="Connection pooling against a local stub server")
+    http_parser.add_argument("--calls", type=int, default=500)
+    http_parser.set_defaults(func=bench_http)
+
+    locate_parser = subparsers.add_parser("locate", help="Locating LLM suggestions in a large CV")
+    locate_parser.add_argument("--chars", type=int, default=50000)
+    locate_parser.add_argument("--suggestions", type=int, default=300)
+    locate_parser.add_argument("--rounds", type=int, default=5)
+    locate_parser.set_defaults(func=bench_locate)
+
+    rules_parser = subparsers.add_parser("rules", help="Rule-based analysis throughput")
+    rules_parser.add_argument("--cvs", type=int, default=500)
+    rules_parser.add_argument("--chars", type=int, default=4000)
+    rules_parser.add_argument("--language", choices=["en", "de"], default="de")
+    rules_parser.set_defaults(func=bench_rules)
+
+    score_parser = subparsers.add_parser("score", help="Rule-based scoring throughput")
+    score_parser.add_argument("--cvs", type=int, default=2000)
+    score_parser.add_argument("--words", type=int, default=500)
+    score_parser.add_argument("--workers", type=int, default=4)
+    score_parser.set_defaults(func=bench_score)
+
+    skills_parser = subparsers.add_parser("skills", help="Skill extraction from multi-page CVs")
+    skills_parser.add_argument("--cvs", type=int, default=500)
+    skills_parser.add_argument("--chars", type=int, default=15000)
+    skills_parser.set_defaults(func=bench_skills)
+
+    match_parser = subparsers.add_parser("match", help="TF-IDF matching of CVs against job ads")
+    match_parser.add_argument("--cvs", type=int, default=200)
+    match_parser.add_argument("--ads", type=int, default=1000)
+    match_parser.add_argument("--top", type=int, default=5)
+    match_parser.set_defaults(func=bench_match)
+
+    pdf_parser = subparsers.add_parser("pdf", help="PDF text extraction throughput over a directory of CVs")
+    pdf_parser.add_argument("pdf_dir", help="Directory with PDF files (searched recursively)")
+    pdf_parser.add_argument("--workers", type=int, default=4)
+    pdf_parser.add_argument("--max-pages", type=int, default=20)
+    pdf_parser.set_defaults(func=bench_pdf)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+#!/bin/env python3
+"""
+Analyze and score a directory of CV files without going through the web UI.
+
+Usage:
+    python bulk_analyze.py CV_DIR [--output results.jsonl] [--language en] [--mode both]
+                           [--parse-workers N] [--concurrency N] [--no-cache] [--restart]
+
+Results are appended to the output file as one JSON object per line. Files already
+listed there with status "ok" are skipped, so an interrupted run continues where
+it stopped when started again with the same output file.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from resume_parser import parse_resume_file
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+
+class StageStats:
+    """Thread-safe counters for the per-stage throughput summary."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages = {}
+
+    def record(self, stage, seconds, ok=True):
+        with self._lock:
+            count, failures, total = self.stages.get(stage, (0, 0, 0.0))
+            self.stages[stage] = (count + 1, failures + (0 if ok else 1), total + seconds)
+
+    def print_summary(self, wall_seconds, concurrency):
+        print(f"{'stage':<10} {'files':>7} {'failed':>7} {'avg ms':>9} {'files/s':>9}")
+        for stage, (count, failures, total) in self.stages.items():
+            average_ms = total / count * 1000 if count else 0.0
+            # Stages run in parallel, so throughput is bounded by the worker count
+            rate = count / wall_seconds if wall_seconds else 0.0
+            print(f"{stage:<10} {count:>7} {failures:>7} {average_ms:>9.1f} {rate:>9.2f}")
+        print(f"Wall time {wall_seconds:.1f} s with {concurrency} analysis threads")
+
+
+def find_cv_files(input_dir):
+    """
+    List the supported CV files below a directory.
+
+    Args:
+        input_dir (str): Directory to walk
+
+    Returns:
+        list: Paths relative to input_dir, sorted
+    """
+    paths = []
+    for root, _, files in os.walk(input_dir):
+        for file_name in files:
+            if file_name.lower().endswith(SUPPORTED_EXTENSIONS):
+                paths.append(os.path.relpath(os.path.join(root, file_name), input_dir))
+    return sorted(paths)
+
+
+def load_completed(output_path):
+    """
+    Read the files already processed successfully from an existing output file.
+
+    Args:
+        output_path (str): JSONL results file
+
+    Returns:
+        set: Relative paths with status "ok"
+    """
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path, 'r', encoding='utf-8') as output_file:
+        for line in output_file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # A line cut off by an interrupted run
+            if record.get("status") == "ok":
+                completed.add(record.get("file"))
+    return completed
+
+
+def timed_parse(path):
+    """Parse one CV file in a worker process and report how long it took."""
+    start = time.perf_counter()
+    # Files are already spread over the parse processes; no nested pool per PDF
+    text = parse_resume_file(path, parallel=False)
+    return text, time.perf_counter() - start
+
+
+def analyze_text(resume_text, language, mode, stats):
+    """
+    Run the analysis and/or scoring stages for one CV.
+
+    Returns:
+        dict: "corrections" and/or "score" plus per-stage timings in ms
+    """
+    from ai_analyzer import analyze_resume, score_resume, analyze_and_score_resume, ANALYSIS_MODE
+
+    result = {"timings": {}}
+    if mode == "both" and ANALYSIS_MODE == "combined":
+        start = time.perf_counter()
+        result["corrections"], result["score"] = analyze_and_score_resume(resume_text, language)
+        elapsed = time.perf_counter() - start
+        stats.record("combined", elapsed)
+        result["timings"]["combined_ms"] = round(elapsed * 1000)
+        return result
+
+    if mode in ("both", "analyze"):
+        start = time.perf_counter()
+        result["corrections"] = analyze_resume(resume_text, language)
+        elapsed = time.perf_counter() - start
+        stats.record("analyze", elapsed)
+        result["timings"]["analyze_ms"] = round(elapsed * 1000)
+
+    if mode in ("both", "score"):
+        start = time.perf_counter()
+        result["score"] = score_resume(resume_text, language)
+        elapsed = time.perf_counter() - start
+        stats.record("score", elapsed)
+        result["timings"]["score_ms"] = round(elapsed * 1000)
+
+    return result
+
+
+def write_analysis(future, entry, language, write_record):
+    """
+    Write the result of one finished analysis.
+
+    Returns:
+        int: 1 if the analysis succeeded, 0 otherwise
+    """
+    path, text, parse_seconds = entry
+    try:
+        result = future.result()
+    except Exception as e:
+        logging.error(f"Error analyzing {path}: {str(e)}")
+        write_record({"file": path, "status": "error", "stage": "analyze", "error": str(e)})
+        return 0
+
+    result["timings"]["parse_ms"] = round(parse_seconds * 1000)
+    write_record({"file": path, "status": "ok", "language": language, "chars": len(text), **result})
+    return 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze and score a directory of CV files.")
+    parser.add_argument("input_dir", help="Directory with PDF, DOCX and TXT files (searched recursively)")
+    parser.add_argument("--output", default="results.jsonl", help="JSONL file the results are appended to")
+    parser.add_argument("--language", default="en", choices=["en", "de"], help="Language of the analysis")
+    parser.add_argument("--mode", default="both", choices=["both", "analyze", "score"], help="Stages to run")
+    parser.add_argument("--parse-workers", type=int, default=os.cpu_count() or 1, help="Processes used to parse files")
+    parser.add_argument("--concurrency", type=int, default=4, help="CVs analyzed at the same time")
+    parser.add_argument("--cache-dir", help="Directory for the persistent result cache")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write cached LLM results")
+    parser.add_argument("--restart", action="store_true", help="Ignore previous progress and overwrite the output")
+    args = parser.parse_args()
+
+    # The caches are configured when ai_analyzer is imported
+    if args.no_cache:
+        os.environ["RESULT_CACHE_DIR"] = ""
+        os.environ["RESULT_CACHE_SIZE"] = "0"
+    elif args.cache_dir:
+        os.environ["RESULT_CACHE_DIR"] = args.cache_dir
+    # Load the rule packs and clients before the worker threads start
+    import ai_analyzer
+
+    if not os.path.isdir(args.input_dir):
+        print(f"Not a directory: {args.input_dir}", file=sys.stderr)
+        return 1
+
+    if args.restart and os.path.exists(args.output):
+        os.remove(args.output)
+    completed = load_completed(args.output)
+    files = [path for path in find_cv_files(args.input_dir) if path not in completed]
+    print(f"{len(files)} files to process ({len(completed)} already done)")
+    if not files:
+        return 0
+
+    stats = StageStats()
+    start = time.perf_counter()
+    succeeded = 0
+
+    with open(args.output, 'a', encoding='utf-8') as output_file, \
+            ProcessPoolExecutor(max_workers=args.parse_workers) as parse_pool, \
+            ThreadPoolExecutor(max_workers=args.concurrency, thread_name_prefix="bulk") as analysis_pool:
+
+        parse_futures = {parse_pool.submit(timed_parse, os.path.join(args.input_dir, path)): path for path in files}
+        analysis_futures = {}
+
+        def write_record(record):
+            output_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output_file.flush()
+
+        # Hand each parsed file to the analysis pool as soon as it is ready
+        for future in as_completed(parse_futures):
+            path = parse_futures[future]
+            try:
+                text, parse_seconds = future.result()
+            except Exception as e:
+                stats.record("parse", 0.0, ok=False)
+                write_record({"file": path, "status": "error", "stage": "parse", "error": str(e)})
+                continue
+            stats.record("parse", parse_seconds)
+            if not text or not text.strip():
+                write_record({"file": path, "status": "error", "stage": "parse", "error": "No text extracted"})
+                continue
+
+            analysis_future = analysis_pool.submit(analyze_text, text, args.language, args.mode, stats)
+            analysis_futures[analysis_future] = (path, text, parse_seconds)
+
+            # Write finished analyses while parsing continues
+            for done in [f for f in analysis_futures if f.done()]:
+                succeeded += write_analysis(done, analysis_futures.pop(done), args.language, write_record)
+
+        for done in as_completed(list(analysis_futures)):
+            succeeded += write_analysis(done, analysis_futures.pop(done), args.language, write_record)
+
+    wall_seconds = time.perf_counter() - start
+    print(f"Processed {len(files)} files, {succeeded} succeeded, results in {args.output}")
+    stats.print_summary(wall_seconds, args.concurrency)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
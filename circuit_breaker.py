@@ -0,0 +1,158 @@
+import os
+import time
+import logging
+import threading
+from collections import deque
+
+# Circuit breaker configuration
+BREAKER_WINDOW_SECONDS = float(os.environ.get("BREAKER_WINDOW_SECONDS", "60"))  # Rolling window for error and latency rates
+BREAKER_MIN_CALLS = int(os.environ.get("BREAKER_MIN_CALLS", "5"))  # Calls in the window before the breaker may open
+BREAKER_ERROR_RATE = float(os.environ.get("BREAKER_ERROR_RATE", "0.5"))  # Failure share that opens the breaker
+BREAKER_SLOW_CALL_SECONDS = float(os.environ.get("BREAKER_SLOW_CALL_SECONDS", "15"))  # Calls slower than this count as slow
+BREAKER_SLOW_CALL_RATE = float(os.environ.get("BREAKER_SLOW_CALL_RATE", "0.5"))  # Slow-call share that opens the breaker
+BREAKER_OPEN_SECONDS = float(os.environ.get("BREAKER_OPEN_SECONDS", "30"))  # Time before a half-open probe is allowed
+
+
+class CircuitBreaker:
+    """
+    Per-provider circuit breaker with rolling error-rate and latency windows.
+
+    While closed, every call is allowed and its outcome recorded. When the share of
+    failed or slow calls in the window crosses its threshold, the breaker opens and
+    callers go straight to their fallback. After BREAKER_OPEN_SECONDS one probe call
+    is let through (half-open); its outcome either closes the breaker again or
+    re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name, window_seconds=BREAKER_WINDOW_SECONDS, min_calls=BREAKER_MIN_CALLS,
+                 error_rate=BREAKER_ERROR_RATE, slow_call_seconds=BREAKER_SLOW_CALL_SECONDS,
+                 slow_call_rate=BREAKER_SLOW_CALL_RATE, open_seconds=BREAKER_OPEN_SECONDS):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probe_started_at = 0.0
+        self._calls = deque()  # (timestamp, succeeded, latency)
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now):
+        if self._state == self.OPEN and now - self._opened_at >= self.open_seconds:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+            logging.info(f"Circuit breaker '{self.name}' is half-open, allowing a probe call")
+        return self._state
+
+    def is_open(self):
+        """Check whether calls are currently being rejected, without taking a probe slot."""
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            return state == self.OPEN or (state == self.HALF_OPEN and self._probe_in_flight)
+
+    def allow_request(self):
+        """
+        Decide whether a call to the provider may be made.
+
+        Returns:
+            bool: True if the call should go ahead. In the half-open state only a
+            single probe is allowed until its outcome is recorded.
+        """
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN:
+                # Replace a probe whose outcome was never recorded
+                now = time.monotonic()
+                if not self._probe_in_flight or now - self._probe_started_at >= self.open_seconds:
+                    self._probe_in_flight = True
+                    self._probe_started_at = now
+                    return True
+            return False
+
+    def record_success(self, latency):
+        """
+        Record a successful call.
+
+        Args:
+            latency (float): Call duration in seconds
+        """
+        self._record(True, latency)
+
+    def record_failure(self, latency=None):
+        """
+        Record a failed call.
+
+        Args:
+            latency (float): Call duration in seconds, if known
+        """
+        self._record(False, latency)
+
+    def _record(self, succeeded, latency):
+        now = time.monotonic()
+        slow = latency is not None and latency >= self.slow_call_seconds
+
+        with self._lock:
+            state = self._current_state(now)
+
+            if state == self.HALF_OPEN:
+                self._probe_in_flight = False
+                if succeeded and not slow:
+                    self._state = self.CLOSED
+                    self._calls.clear()
+                    logging.info(f"Circuit breaker '{self.name}' closed after a successful probe")
+                else:
+                    self._trip(now, "probe call failed")
+                return
+
+            self._calls.append((now, succeeded, latency))
+            while self._calls and now - self._calls[0][0] > self.window_seconds:
+                self._calls.popleft()
+
+            if state == self.CLOSED and len(self._calls) >= self.min_calls:
+                total = len(self._calls)
+                failures = sum(1 for _, ok, _ in self._calls if not ok)
+                slow_calls = sum(1 for _, _, call_latency in self._calls
+                                 if call_latency is not None and call_latency >= self.slow_call_seconds)
+                if failures / total >= self.error_rate:
+                    self._trip(now, f"{failures}/{total} calls failed")
+                elif slow_calls / total >= self.slow_call_rate:
+                    self._trip(now, f"{slow_calls}/{total} calls slower than {self.slow_call_seconds}s")
+
+    def _trip(self, now, reason):
+        self._state = self.OPEN
+        self._opened_at = now
+        self._calls.clear()
+        logging.warning(f"Circuit breaker '{self.name}' opened: {reason}")
+
+    def get_stats(self):
+        """
+        Get the current state and window counters.
+
+        Returns:
+            dict: State, call count, failure count and slow-call count in the window
+        """
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            return {
+                "state": state,
+                "calls": len(self._calls),
+                "failures": sum(1 for _, ok, _ in self._calls if not ok),
+                "slow_calls": sum(1 for _, _, latency in self._calls
+                                  if latency is not None and latency >= self.slow_call_seconds)
+            }
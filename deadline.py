@@ -0,0 +1,120 @@
+import time
+import logging
+import contextvars
+from contextlib import contextmanager
+
+# Deadline of the request currently being handled (propagated into worker threads via contextvars)
+_current_deadline = contextvars.ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when the time budget of a request has been used up."""
+    pass
+
+
+class Deadline:
+    """
+    Time budget for one request, shared by every provider call made on its behalf.
+
+    Provider calls ask for remaining_timeout() instead of using a fixed timeout, so
+    a stalled upstream can never hold the request longer than its budget. Stage
+    timings are recorded with mark() and logged against the budget.
+    """
+
+    def __init__(self, name, budget_seconds):
+        self.name = name
+        self.budget_seconds = budget_seconds
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + budget_seconds
+        self._last_mark = self.started_at
+        self.stages = []
+
+    def remaining(self):
+        """Seconds left in the budget (never negative)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self):
+        return time.monotonic() >= self.expires_at
+
+    def elapsed(self):
+        """Seconds spent since the deadline was created."""
+        return time.monotonic() - self.started_at
+
+    def mark(self, stage):
+        """
+        Record the end of a stage and log its duration against the budget.
+
+        Args:
+            stage (str): Name of the stage that just finished
+        """
+        now = time.monotonic()
+        duration = now - self._last_mark
+        self._last_mark = now
+        self.stages.append((stage, duration))
+        logging.info(f"[{self.name}] {stage} took {duration * 1000:.0f} ms "
+                     f"({(now - self.started_at) * 1000:.0f} of {self.budget_seconds * 1000:.0f} ms budget used)")
+
+
+def current_deadline():
+    """Get the deadline of the current request, or None."""
+    return _current_deadline.get()
+
+
+def remaining_timeout(default):
+    """
+    Timeout for the next provider call.
+
+    Args:
+        default (float): Timeout to use when no deadline is active
+
+    Returns:
+        float: The smaller of default and the remaining budget
+
+    Raises:
+        DeadlineExceeded: If the budget is already spent
+    """
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return default
+    remaining = deadline.remaining()
+    if remaining <= 0:
+        raise DeadlineExceeded(f"{deadline.name} deadline of {deadline.budget_seconds}s exceeded")
+    return min(default, remaining) if default is not None else remaining
+
+
+@contextmanager
+def deadline_scope(name, budget_seconds):
+    """
+    Run a block of code under a time budget.
+
+    Args:
+        name (str): Name used in log messages
+        budget_seconds (float): Total time allowed for the block
+
+    Yields:
+        Deadline: The active deadline
+    """
+    deadline = Deadline(name, budget_seconds)
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+        status = "exceeded" if deadline.expired else "met"
+        logging.info(f"[{name}] finished in {deadline.elapsed() * 1000:.0f} ms, budget {budget_seconds * 1000:.0f} ms {status}")
+
+
+def with_current_context(func):
+    """
+    Wrap a callable so it runs with the caller's context variables.
+
+    Executor threads do not inherit context variables; wrapping the submitted
+    callable makes the active deadline visible to provider calls made there.
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.run(func, *args, **kwargs)
+
+    return run
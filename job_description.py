@@ -0,0 +1,217 @@
+import os
+import re
+import logging
+from result_cache import ResultCache, make_cache_key
+from skill_taxonomy import skill_matcher
+from near_duplicates import NearDuplicateIndex, ad_words, ad_numbers, text_fingerprint
+
+# Bump when the parsing rules or the skill taxonomy change so cached parses are not reused
+JOB_PARSER_VERSION = "1"
+
+# Parsed job descriptions, shared by all workers through the persistent cache tier
+job_description_cache = ResultCache("job_description")
+
+# Estimated share of word shingles two ads must have in common to count as the same ad
+JOB_DUPLICATE_THRESHOLD = float(os.environ.get("JOB_DUPLICATE_THRESHOLD", "0.8"))
+
+# Job ads of stored cover letters; filled and kept up to date by app.py
+job_description_index = NearDuplicateIndex(threshold=JOB_DUPLICATE_THRESHOLD)
+
+DEFAULT_JOB_TITLE = "die ausgeschriebene Stelle"
+DEFAULT_COMPANY_NAME = "Ihrem Unternehmen"
+
+TITLE_PATTERNS = [
+    re.compile(r"(?:Stellenanzeige|Stelle|Position|Job)[:\s]+([^\n.]{5,50})", re.IGNORECASE),
+    re.compile(r"(?:Wir suchen|Gesucht)[:\s]+([^\n.]{5,50})", re.IGNORECASE),
+    re.compile(r"^([^\n.]{5,50})(?:\n|$)", re.IGNORECASE)
+]
+COMPANY_PATTERNS = [
+    re.compile(r"(?:Firma|Unternehmen|Company)[:\s]+([^\n.]{2,30})", re.IGNORECASE),
+    re.compile(r"(?:bei der|bei|at|für die|für)\s+([A-Z][^\n.]{2,30})\s+(?:GmbH|AG|SE|KG|OHG|LLC|Inc|Ltd)", re.IGNORECASE)
+]
+
+# Headings that start the requirements part of an ad, and headings of other parts that end it
+REQUIREMENTS_HEADING_PATTERN = re.compile(
+    r"^\W*(?:ihr profil|dein profil|profil|anforderungen|voraussetzungen|qualifikationen?|das bringen sie mit|"
+    r"das bringst du mit|was sie mitbringen|was du mitbringst|requirements|qualifications|your profile|"
+    r"what you bring|what we expect|who you are|must[- ]haves?)\b[^\n]*$",
+    re.IGNORECASE | re.MULTILINE)
+OTHER_HEADING_PATTERN = re.compile(
+    r"^\W*(?:ihre aufgaben|deine aufgaben|aufgaben|wir bieten|was wir bieten|unser angebot|benefits|"
+    r"what we offer|responsibilities|your tasks|über uns|about us|kontakt|contact)\b", re.IGNORECASE)
+BULLET_PREFIX_PATTERN = re.compile(r"^\s*(?:[•\-*–·▪●►■]|\d+[.)])\s*")
+MAX_REQUIREMENTS = 15
+MAX_REQUIREMENT_CHARS = 200
+
+
+class JobDescription:
+    """
+    The parts of a job ad used for cover letters, parsed once per ad.
+
+    Attributes:
+        title (str): Job title, or a generic German placeholder
+        company (str): Company name, or a generic German placeholder
+        requirements (list): Items listed under the ad's requirements heading
+        skills (dict): Taxonomy skills mentioned in the ad, per category, most mentioned first
+    """
+
+    def __init__(self, title, company, requirements, skills):
+        self.title = title
+        self.company = company
+        self.requirements = requirements
+        self.skills = skills
+
+    def to_dict(self):
+        return {"title": self.title, "company": self.company,
+                "requirements": self.requirements, "skills": self.skills}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["title"], data["company"], data["requirements"], data["skills"])
+
+
+def extract_job_title(job_description):
+    """
+    Extract job title from job description.
+
+    Args:
+        job_description (str): The job description text
+
+    Returns:
+        str: Extracted job title
+    """
+    for pattern in TITLE_PATTERNS:
+        match = pattern.search(job_description)
+        if match:
+            return match.group(1).strip()
+
+    # Default title if no match found
+    return DEFAULT_JOB_TITLE
+
+
+def extract_company_name(job_description):
+    """
+    Extract company name from job description.
+
+    Args:
+        job_description (str): The job description text
+
+    Returns:
+        str: Extracted company name
+    """
+    for pattern in COMPANY_PATTERNS:
+        match = pattern.search(job_description)
+        if match:
+            return match.group(1).strip()
+
+    # Default if no match found
+    return DEFAULT_COMPANY_NAME
+
+
+def extract_requirements(job_description):
+    """
+    Extract the items listed under the requirements heading of a job ad.
+
+    Args:
+        job_description (str): The job description text
+
+    Returns:
+        list: Requirement lines without bullet characters, in order
+    """
+    heading = REQUIREMENTS_HEADING_PATTERN.search(job_description)
+    if not heading:
+        return []
+
+    requirements = []
+    # Text after a colon on the heading line ("Anforderungen: Python, SQL") is the first item
+    inline = heading.group().partition(":")[2].strip()
+    if inline:
+        requirements.append(inline[:MAX_REQUIREMENT_CHARS])
+
+    for line in job_description[heading.end():].split("\n"):
+        if not line.strip():
+            if requirements:
+                break  # A blank line after the list ends the section
+            continue
+        if OTHER_HEADING_PATTERN.match(line) or (line.rstrip().endswith(":") and not BULLET_PREFIX_PATTERN.match(line)):
+            break
+        requirements.append(BULLET_PREFIX_PATTERN.sub("", line).strip()[:MAX_REQUIREMENT_CHARS])
+        if len(requirements) >= MAX_REQUIREMENTS:
+            break
+
+    return requirements
+
+
+def job_identity(job_description):
+    """
+    Get the job title, company and numbers of an ad, which near-duplicates must share.
+
+    Args:
+        job_description (str): The job description text
+
+    Returns:
+        tuple: Case-folded (title, company) as found by the extraction patterns, and the
+        numbers of the ad (e.g. salary, hours, years of experience) from ad_numbers
+    """
+    text = (job_description or "").replace("\r\n", "\n").strip()
+    return (" ".join(extract_job_title(text).casefold().split()),
+            " ".join(extract_company_name(text).casefold().split()),
+            ad_numbers(ad_words(text)))
+
+
+def job_description_fingerprint(job_description):
+    """
+    Identify a job ad for caching, treating near-identical ads as the same ad.
+
+    Ads that only differ in whitespace, case, tracking links, dates or reference
+    numbers share a fingerprint directly. Ads that also differ in a few sentences
+    (another footer, a reworded benefit) get the fingerprint of the stored ad they
+    match in job_description_index, so they reuse its cached parse and cover
+    letters, but only if both name the same job title, company and numbers:
+    postings made from one template for another job, company, salary or number of
+    hours keep their own fingerprint.
+
+    Args:
+        job_description (str): The job description text
+
+    Returns:
+        str: Hex digest identifying the ad
+    """
+    match = job_description_index.find(job_description, job_identity(job_description))
+    if match is not None:
+        doc_id, fingerprint, similarity = match
+        logging.info(f"Job description matches stored ad {doc_id} (similarity {similarity:.2f})")
+        return fingerprint
+    return text_fingerprint(ad_words(job_description))
+
+
+def parse_job_description(job_description):
+    """
+    Parse a job description, reusing the result for ads that were parsed before.
+
+    The result is cached under the ad's fingerprint, so the cover letter generator
+    and the routes that store the letter share one parse, and users who paste the
+    same or a near-identical ad reuse it across requests and workers.
+
+    Args:
+        job_description (str): The job description text
+
+    Returns:
+        JobDescription: The parsed ad
+    """
+    text = (job_description or "").replace("\r\n", "\n").strip()
+    cache_key = make_cache_key("job_description", JOB_PARSER_VERSION, job_description_fingerprint(text))
+    cached = job_description_cache.get(cache_key)
+    if cached is not None:
+        return JobDescription.from_dict(cached)
+
+    parsed = JobDescription(
+        title=extract_job_title(text),
+        company=extract_company_name(text),
+        requirements=extract_requirements(text),
+        skills=skill_matcher.extract(text)
+    )
+    job_description_cache.set(cache_key, parsed.to_dict())
+    logging.info(f"Parsed job description: {parsed.title} at {parsed.company}, "
+                 f"{len(parsed.requirements)} requirements")
+    return parsed
@@ -0,0 +1,221 @@
+import os
+import re
+import zlib
+import math
+from collections import Counter
+import numpy as np
+from scipy import sparse
+from skill_taxonomy import skill_matcher
+
+# Terms are hashed into this many vector columns, so no vocabulary has to be kept in sync
+MATCH_HASH_BITS = int(os.environ.get("MATCH_HASH_BITS", "20"))
+# Number of matched and missing keywords reported per match
+MATCH_KEYWORDS = int(os.environ.get("MATCH_KEYWORDS", "10"))
+# Longer terms are cut to fit the term column of the document frequency table
+MAX_TERM_LENGTH = 100
+# Row of the document frequency table that counts the job descriptions themselves;
+# terms start with a letter, so it cannot clash with one
+CORPUS_SIZE_TERM = "__documents__"
+
+TERM_PATTERN = re.compile(r"[^\W\d_][\w+#]*")
+STOPWORDS = frozenset("""
+    a about above after again all also am an and any are as at be because been before being below between both
+    but by can could did do does doing down during each few for from further had has have having he her here
+    hers him his how i if in into is it its itself just me more most my no nor not now of off on once only or
+    other our ours out over own same she should so some such than that the their them then there these they
+    this those through to too under until up very was we well were what when where which while who whom why
+    will with would you your yours etc e.g
+    ab aber alle allem allen aller alles als also am an andere anderen auch auf aus bei beim bereits bin bis
+    bist bzw da dabei dadurch dafür daher damit dann dar darauf darin darüber das dass dazu dein deine deinem
+    deinen deiner dem den denen der deren des dessen die dies diese diesem diesen dieser dieses doch dort du
+    durch ein eine einem einen einer eines einige er es etwa euch euer für gegen gibt hat hatte hier hin hinter
+    ich ihm ihn ihnen ihr ihre ihrem ihren ihrer im in ins ist ja je jede jedem jeden jeder jedes jetzt kann
+    kein keine können könnte man mehr mein meine mich mir mit muss müssen nach nicht noch nun nur ob oder ohne
+    sehr sein seine sich sie sind so sollen sollte sondern sowie über um und uns unser unsere unter viel vom
+    von vor wann war waren warum was weil weiter welche wenn wer werden wie wieder wir wird wo wurde würde zu
+    zum zur zwischen mwd
+    stellenanzeige stelle position job aufgaben profil anforderungen bieten suchen gesucht erfahrung kenntnisse
+    gute sehr jahre responsibilities requirements qualifications tasks profile offer looking experience
+    knowledge skills years
+""".split())
+
+
+def extract_terms(text):
+    """
+    Split a text into matching terms.
+
+    Terms are the lower-cased words of three or more letters that are not stopwords,
+    plus the canonical name of every taxonomy skill mentioned ("JS" adds "javascript",
+    "Spring Boot" adds "spring boot"), so both sides of a match use the same names for
+    the same skills.
+
+    Args:
+        text (str): CV or job description text
+
+    Returns:
+        tuple: (Counter of term -> count, dict of term -> display name)
+    """
+    counts = Counter(word for word in TERM_PATTERN.findall((text or "").lower())
+                     if len(word) > 2 and word not in STOPWORDS)
+    display = {}
+    for _, canonical, surface in skill_matcher.find_all(text or ""):
+        term = canonical.lower()
+        display[term] = canonical
+        # Single words written as in the taxonomy are already counted above
+        if term != surface.lower() or term not in counts:
+            counts[term] += 1
+    return counts, display
+
+
+def term_weight(document_frequency, document_count):
+    """Smoothed IDF: terms in few stored job descriptions weigh the most."""
+    return math.log((1.0 + document_count) / (1.0 + document_frequency)) + 1.0
+
+
+class MatchResult:
+    """
+    How well a CV covers a job description.
+
+    Attributes:
+        score (int): Cosine similarity of the TF-IDF vectors as a percentage
+        matched (list): Job keywords found in the CV, most important first
+        missing (list): Job keywords absent from the CV, most important first
+    """
+
+    def __init__(self, score, matched, missing):
+        self.score = score
+        self.matched = matched
+        self.missing = missing
+
+    def to_dict(self):
+        return {"score": self.score, "matched": self.matched, "missing": self.missing}
+
+
+class TfidfMatcher:
+    """
+    Compares CVs and job descriptions as sparse TF-IDF vectors.
+
+    IDF weights come from the document frequencies returned by frequency_loader;
+    app.py reads them from the job term frequency table that the ATS coverage
+    report uses, so both share one statistic that grows with every stored ad.
+    Terms are mapped to columns with a CRC32 hash (the "hashing trick"), so vectors
+    of any text can be built without a fixed vocabulary. Term frequencies are
+    dampened with 1 + log(tf) and vectors are L2-normalized, so the similarity of
+    two texts is a sparse dot product. Matching many CVs against many ads is one
+    sparse matrix product.
+    """
+
+    def __init__(self, frequency_loader=None, hash_bits=MATCH_HASH_BITS):
+        """
+        Args:
+            frequency_loader: Callable taking an iterable of terms and returning a dict of
+                term -> number of documents containing it, plus CORPUS_SIZE_TERM -> number
+                of documents; without one every term weighs the same
+            hash_bits (int): Vector columns are 2 ** hash_bits
+        """
+        self.frequency_loader = frequency_loader
+        self.columns = 1 << hash_bits
+        self._mask = self.columns - 1
+
+    def _column(self, term):
+        return zlib.crc32(term.encode("utf-8")) & self._mask
+
+    def _load_frequencies(self, term_counts):
+        if self.frequency_loader is None:
+            return {}
+        return self.frequency_loader({term[:MAX_TERM_LENGTH] for counts in term_counts for term in counts})
+
+    def _term_weights(self, counts, frequencies):
+        document_count = frequencies.get(CORPUS_SIZE_TERM, 0)
+        return {term: (1.0 + math.log(count)) * term_weight(frequencies.get(term[:MAX_TERM_LENGTH], 0), document_count)
+                for term, count in counts.items()}
+
+    def vectorize(self, texts):
+        """
+        Build L2-normalized TF-IDF vectors.
+
+        Args:
+            texts (list): Texts to vectorize
+
+        Returns:
+            scipy.sparse.csr_matrix: One row per text
+        """
+        term_counts = [extract_terms(text)[0] for text in texts]
+        frequencies = self._load_frequencies(term_counts)
+        indptr = [0]
+        indices = []
+        data = []
+        for counts in term_counts:
+            weights = self._term_weights(counts, frequencies)
+            norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+            for term, weight in weights.items():
+                indices.append(self._column(term))
+                data.append(weight / norm)
+            indptr.append(len(indices))
+        # Hash collisions within a text are summed when the matrix is built
+        matrix = sparse.csr_matrix((np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int64),
+                                    np.asarray(indptr, dtype=np.int64)), shape=(len(texts), self.columns))
+        matrix.sum_duplicates()
+        return matrix
+
+    def match(self, resume_text, job_description, keyword_limit=MATCH_KEYWORDS):
+        """
+        Score how well a CV covers a job description and list the keyword gap.
+
+        Args:
+            resume_text (str): The CV text
+            job_description (str): The job description text
+            keyword_limit (int): Maximum number of matched and missing keywords
+
+        Returns:
+            MatchResult: Similarity score and keywords ordered by their TF-IDF weight in the ad
+        """
+        resume_counts, _ = extract_terms(resume_text)
+        job_counts, display = extract_terms(job_description)
+        frequencies = self._load_frequencies([resume_counts, job_counts])
+        resume_weights = self._term_weights(resume_counts, frequencies)
+        job_weights = self._term_weights(job_counts, frequencies)
+
+        # Cosine similarity over the shared terms; the same value as the dot product of the vectors
+        norms = (math.sqrt(sum(weight * weight for weight in resume_weights.values())) *
+                 math.sqrt(sum(weight * weight for weight in job_weights.values())))
+        shared = sum(resume_weights[term] * weight for term, weight in job_weights.items() if term in resume_weights)
+        score = shared / norms if norms else 0.0
+
+        matched, missing = [], []
+        for term in sorted(job_weights, key=job_weights.get, reverse=True):
+            target = matched if term in resume_weights else missing
+            if len(target) < keyword_limit:
+                target.append(display.get(term, term))
+            if len(matched) >= keyword_limit and len(missing) >= keyword_limit:
+                break
+
+        return MatchResult(round(min(score, 1.0) * 100), matched, missing)
+
+    def top_k(self, queries, candidates, k=5):
+        """
+        Find the best candidates for each query text.
+
+        Args:
+            queries (list): Query texts (e.g. CVs)
+            candidates: Candidate texts (e.g. job descriptions) or a matrix from vectorize
+            k (int): Matches returned per query
+
+        Returns:
+            list: Per query, up to k (candidate index, similarity) pairs, best first
+        """
+        if not sparse.issparse(candidates):
+            candidates = self.vectorize(list(candidates))
+        if not queries or candidates.shape[0] == 0:
+            return [[] for _ in queries]
+
+        similarities = (self.vectorize(list(queries)) @ candidates.T).toarray()
+        k = min(k, similarities.shape[1])
+        # argpartition selects the k best in linear time; only those are sorted
+        best = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        results = []
+        for row, columns in zip(similarities, best):
+            ranked = columns[np.argsort(-row[columns])]
+            results.append([(int(column), float(row[column])) for column in ranked])
+        return results
+
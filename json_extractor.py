@@ -0,0 +1,248 @@
+import json
+import logging
+
+CLOSERS = {"{": "}", "[": "]"}
+
+
+def strip_trailing_commas(fragment):
+    """
+    Remove commas that directly precede a closing bracket, outside of strings.
+
+    Args:
+        fragment (str): JSON text as produced by an LLM
+
+    Returns:
+        str: The text with trailing commas removed
+    """
+    output = []
+    in_string = False
+    escape = False
+    length = len(fragment)
+    for index, char in enumerate(fragment):
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == ",":
+            next_index = index + 1
+            while next_index < length and fragment[next_index].isspace():
+                next_index += 1
+            if next_index < length and fragment[next_index] in "}]":
+                continue
+        output.append(char)
+    return "".join(output)
+
+
+def parse_fragment(fragment):
+    """
+    Parse a JSON fragment, tolerating raw control characters and trailing commas.
+
+    Args:
+        fragment (str): JSON text
+
+    Returns:
+        The parsed value, or None if the fragment is not valid JSON
+    """
+    try:
+        return json.loads(fragment, strict=False)
+    except ValueError:
+        pass
+    try:
+        return json.loads(strip_trailing_commas(fragment), strict=False)
+    except ValueError as e:
+        logging.debug(f"Skipping malformed JSON fragment ({str(e)}): {fragment[:80]}...")
+        return None
+
+
+class JsonStreamExtractor:
+    """
+    Incremental scanner for JSON embedded in LLM output.
+
+    Text is fed in as it arrives (a whole response or streamed deltas) and scanned
+    once, tracking strings and bracket nesting. Every object that is an element of
+    an array is parsed and returned by feed() as soon as its closing brace arrives,
+    so a truncated response still yields all the objects completed before the cut,
+    and one malformed element does not discard the others. Prose and code fences
+    around the JSON are ignored.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._position = 0
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._capture_start = None
+        self._capture_depth = None
+        self._root_start = None
+        self._last_comma = None  # (index, open brackets) of the last comma in the open top-level value
+        self.roots = []  # (start, end) of completed top-level values
+        self.arrays_seen = False
+
+    @property
+    def truncated(self):
+        """True if the text ended inside an unfinished JSON value."""
+        return bool(self._stack)
+
+    def feed(self, text):
+        """
+        Scan more text.
+
+        Args:
+            text (str): The next piece of the response
+
+        Returns:
+            list: Array-element objects completed by this piece
+        """
+        self.text += text
+        source = self.text
+        stack = self._stack
+        objects = []
+
+        for index in range(self._position, len(source)):
+            char = source[index]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if not stack:
+                # Outside of any JSON value only an opening bracket is meaningful
+                if char in CLOSERS:
+                    stack.append(char)
+                    self._root_start = index
+                    self._last_comma = None
+                    if char == "[":
+                        self.arrays_seen = True
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in CLOSERS:
+                if char == "{" and self._capture_start is None and stack[-1] == "[":
+                    self._capture_start = index
+                    self._capture_depth = len(stack)
+                if char == "[":
+                    self.arrays_seen = True
+                stack.append(char)
+            elif char == "}" or char == "]":
+                if CLOSERS[stack[-1]] != char:
+                    continue  # Stray closing bracket
+                stack.pop()
+                if self._capture_start is not None and len(stack) == self._capture_depth:
+                    value = parse_fragment(source[self._capture_start:index + 1])
+                    if isinstance(value, dict):
+                        objects.append(value)
+                    self._capture_start = None
+                if not stack:
+                    self.roots.append((self._root_start, index + 1))
+            elif char == ",":
+                self._last_comma = (index, "".join(stack))
+
+        self._position = len(source)
+        return objects
+
+    def root_objects(self, repair=True):
+        """
+        Parse the top-level JSON objects found so far.
+
+        If the text ends inside an object, the object is cut back to its last
+        complete member and closed, so a truncated response keeps what it finished.
+
+        Args:
+            repair (bool): Include the repaired unfinished object; it lacks every
+                member after the cut, so only use it when those are optional. The
+                cut can fall inside an array element, so take array elements from
+                feed(), which only returns finished ones
+
+        Returns:
+            list: Parsed top-level dictionaries, in order of appearance
+        """
+        values = []
+        for start, end in self.roots:
+            if self.text[start] == "{":
+                value = parse_fragment(self.text[start:end])
+                if isinstance(value, dict):
+                    values.append(value)
+
+        if repair and self._stack and self._stack[0] == "{" and self._last_comma:
+            comma_index, open_brackets = self._last_comma
+            repaired = self.text[self._root_start:comma_index] + "".join(CLOSERS[b] for b in reversed(open_brackets))
+            value = parse_fragment(repaired)
+            if isinstance(value, dict):
+                logging.warning("Recovered JSON object from truncated response")
+                values.append(value)
+
+        return values
+
+
+def iter_array_objects(chunks):
+    """
+    Yield array-element objects from a stream of text chunks as soon as each one closes.
+
+    Args:
+        chunks: Iterable of text pieces (e.g. streamed completion deltas)
+
+    Yields:
+        dict: Each complete array element object
+    """
+    extractor = JsonStreamExtractor()
+    for chunk in chunks:
+        if chunk:
+            for value in extractor.feed(chunk):
+                yield value
+
+
+def extract_array_objects(text):
+    """
+    Extract the objects of the JSON array(s) in an LLM response.
+
+    Args:
+        text (str): Raw model output
+
+    Returns:
+        list: Parsed element dictionaries (objects completed before a truncation are kept)
+
+    Raises:
+        ValueError: If the response contains no JSON array at all
+    """
+    extractor = JsonStreamExtractor()
+    objects = extractor.feed(text or "")
+    if not objects and not extractor.arrays_seen:
+        raise ValueError("Could not extract JSON from API response")
+    if extractor.truncated:
+        logging.warning(f"JSON in API response was truncated, kept {len(objects)} complete objects")
+    return objects
+
+
+def extract_json_object(text, allow_truncated=True):
+    """
+    Extract the first top-level JSON object from an LLM response.
+
+    Args:
+        text (str): Raw model output
+        allow_truncated (bool): Accept an object that was cut off and repaired back
+            to its last complete member; pass False when every member is required
+
+    Returns:
+        dict: The parsed object
+
+    Raises:
+        ValueError: If no object can be recovered
+    """
+    extractor = JsonStreamExtractor()
+    extractor.feed(text or "")
+    values = extractor.root_objects(repair=allow_truncated)
+    if not values:
+        raise ValueError("Could not extract JSON from API response")
+    return values[0]
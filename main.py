@@ -1,6 +1,13 @@
+import gc
 import os
 from app import app
 
+# With gunicorn --preload the app (including the skill taxonomy and rule engines) is
+# loaded once in the master and shared copy-on-write with the workers. Freezing the
+# objects created so far keeps garbage collections in the workers from touching them,
+# which would otherwise copy the shared pages into every worker.
+gc.freeze()
+
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
     app.run(host="0.0.0.0", port=port, debug=True)
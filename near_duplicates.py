@@ -0,0 +1,197 @@
+import re
+import zlib
+import hashlib
+import threading
+import numpy as np
+
+# Word shingles are hashed into 32-bit values and permuted with a*x+b mod a Mersenne prime
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+# Parts of an ad that change between postings of the same job: tracking links, mail addresses, dates,
+# reference codes mixing letters and digits, and years or IDs of four or more digits. Short numbers
+# ("40 Stunden", "3 Jahre", "50.000 €", "60k") are kept: ads that differ in them are different offers.
+NOISE_PATTERN = re.compile(
+    r"(?:https?://|www\.)\S+|\S+@\S+\.\w+|\b\d{1,2}\.\d{1,2}\.\d{2,4}\b|\b\d{4}-\d{2}-\d{2}\b"
+    r"|\b(?!\d{1,3}[kh]\b)(?=[\w-]*[^\W\d_])[\w-]*\d[\w-]*|\b\d{4,}\b")
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def ad_words(text):
+    """
+    Reduce a text to the words that identify it.
+
+    Args:
+        text (str): Text to normalize
+
+    Returns:
+        list: Case-folded words and short numbers, without links, mail addresses,
+        dates and reference numbers
+    """
+    return WORD_PATTERN.findall(NOISE_PATTERN.sub(" ", (text or "").casefold()))
+
+
+def ad_numbers(words):
+    """
+    Get the numbers of an ad (hours, years of experience, salary) that its near-duplicates must share.
+
+    Args:
+        words (list): Output of ad_words
+
+    Returns:
+        tuple: The distinct number tokens, sorted
+    """
+    return tuple(sorted({word for word in words if word[0].isdigit()}))
+
+
+def text_fingerprint(words):
+    """
+    Hash normalized words so that texts differing only in noise share one fingerprint.
+
+    Args:
+        words (list): Output of ad_words
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    return hashlib.sha256(" ".join(words).encode("utf-8")).hexdigest()
+
+
+class NearDuplicateIndex:
+    """
+    MinHash/LSH index that finds stored texts nearly identical to a query text.
+
+    Each text becomes a set of overlapping word shingles. Its MinHash signature keeps
+    the minimum of `num_perm` random permutations of the shingle hashes; two
+    signatures agree at a position with a probability equal to the Jaccard similarity
+    of the shingle sets. The signature is cut into `bands` bands that are used as hash
+    bucket keys, so a lookup only compares the query with texts sharing at least one
+    band instead of scanning every stored text.
+
+    Only one representative of each group of near-duplicates is stored: adding a
+    text that matches an indexed one returns that one instead, which keeps the
+    buckets small when the same ad is pasted many times.
+
+    Texts can carry an identity (e.g. job title and company) that near-duplicates
+    must share: two ads from the same template for different jobs are similar
+    enough to match, but are not the same ad.
+    """
+
+    def __init__(self, num_perm=128, bands=16, shingle_size=3, threshold=0.8, seed=1):
+        """
+        Args:
+            num_perm (int): Signature length, a multiple of bands
+            bands (int): Number of LSH bands; more bands find less similar texts
+            shingle_size (int): Words per shingle
+            threshold (float): Minimum estimated Jaccard similarity of near-duplicates
+            seed (int): Seed of the permutations; must be the same for every process sharing signatures
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        generator = np.random.RandomState(seed)
+        self.a = generator.randint(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self.b = generator.randint(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+
+        self._lock = threading.Lock()
+        self.buckets = [{} for _ in range(bands)]
+        self.signatures = {}  # doc id -> signature
+        self.fingerprints = {}  # doc id -> fingerprint of the representative text
+        self.identities = {}  # doc id -> identity the text was added with
+        self.last_id = 0  # Highest doc id seen, for incremental loading
+
+    def signature(self, words):
+        """
+        Compute the MinHash signature of a word list.
+
+        Args:
+            words (list): Normalized words
+
+        Returns:
+            numpy.ndarray: uint32 signature, or None for an empty text
+        """
+        if not words:
+            return None
+        size = self.shingle_size
+        shingles = {" ".join(words[i:i + size]) for i in range(max(1, len(words) - size + 1))}
+        hashes = np.fromiter((zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        # Wrap-around in the multiplication is fine; the result only needs to look random
+        with np.errstate(over="ignore"):
+            permuted = np.bitwise_and((np.outer(hashes, self.a) + self.b) % MERSENNE_PRIME, MAX_HASH)
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        rows = self.rows
+        return [signature[band * rows:(band + 1) * rows].tobytes() for band in range(self.bands)]
+
+    def _best_match(self, signature, band_keys, identity):
+        candidates = set()
+        for bucket, key in zip(self.buckets, band_keys):
+            candidates.update(bucket.get(key, ()))
+
+        best_id, best_similarity = None, self.threshold
+        for doc_id in candidates:
+            if identity is not None and self.identities[doc_id] != identity:
+                continue
+            similarity = float(np.mean(self.signatures[doc_id] == signature))
+            if similarity >= best_similarity:
+                best_id, best_similarity = doc_id, similarity
+        return best_id, best_similarity
+
+    def find(self, text, identity=None):
+        """
+        Find the indexed near-duplicate of a text.
+
+        Args:
+            text (str): Query text
+            identity: Only match texts added with this identity (None matches any)
+
+        Returns:
+            tuple: (doc id, representative fingerprint, estimated similarity), or None
+        """
+        signature = self.signature(ad_words(text))
+        if signature is None:
+            return None
+        band_keys = self._band_keys(signature)
+        with self._lock:
+            doc_id, similarity = self._best_match(signature, band_keys, identity)
+            if doc_id is None:
+                return None
+            return doc_id, self.fingerprints[doc_id], similarity
+
+    def add(self, doc_id, text, identity=None):
+        """
+        Index a text unless a near-duplicate of it with the same identity is indexed already.
+
+        Args:
+            doc_id (int): Increasing ID of the text, e.g. its database row ID
+            text (str): The text
+            identity: Value near-duplicates of the text must share, e.g. a (title, company) tuple
+
+        Returns:
+            int: ID of the representative the text belongs to, or None for an empty text
+        """
+        words = ad_words(text)
+        signature = self.signature(words)
+        with self._lock:
+            self.last_id = max(self.last_id, doc_id)
+            if signature is None:
+                return None
+            band_keys = self._band_keys(signature)
+            match_id, _ = self._best_match(signature, band_keys, identity)
+            if match_id is not None:
+                return match_id
+
+            self.signatures[doc_id] = signature
+            self.fingerprints[doc_id] = text_fingerprint(words)
+            self.identities[doc_id] = identity
+            for bucket, key in zip(self.buckets, band_keys):
+                bucket.setdefault(key, []).append(doc_id)
+            return doc_id
+
+    def __len__(self):
+        return len(self.signatures)
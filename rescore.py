@@ -0,0 +1,152 @@
+#!/bin/env python3
+import os
+import time
+import logging
+import argparse
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from app import app, db, Resume, ResumeScore
+from ai_analyzer import get_score_summary, RULES_MODEL_VERSION
+from scoring import score_batch, parse_score_weights
+
+# Rows loaded and scored per batch
+RESCORE_BATCH_SIZE = 1000
+
+
+def latest_score_versions(resumes):
+    """
+    Look up the model version of the score shown for each CV.
+
+    Args:
+        resumes (list): Resume rows
+
+    Returns:
+        dict: Resume ID -> model version of its latest score in the CV's language
+        (None for scores stored before versions were recorded); CVs without a score are left out
+    """
+    languages = {resume.id: resume.language or 'en' for resume in resumes}
+    rows = (db.session.query(ResumeScore.resume_id, ResumeScore.language, ResumeScore.model_version)
+            .filter(ResumeScore.resume_id.in_(list(languages)))
+            .order_by(ResumeScore.resume_id, ResumeScore.created_at.desc(), ResumeScore.id.desc())
+            .all())
+    versions = {}
+    for resume_id, language, model_version in rows:
+        if language == languages[resume_id] and resume_id not in versions:
+            versions[resume_id] = model_version
+    return versions
+
+
+def rescore_batch(resumes, dry_run=False, executor=None, weights=None):
+    """
+    Score a batch of stored CVs with the rule-based heuristics and save the results.
+
+    The latest score is the one shown, so only CVs without a score or whose latest
+    score is rule-based are rescored; a new rule score must not hide an LLM score.
+    The rule-based rows a new score replaces are deleted in the same transaction,
+    so rescoring does not grow the table.
+
+    Args:
+        resumes (list): Resume rows
+        dry_run (bool): Compute the scores without writing them
+        executor: Optional process pool for the feature extraction
+        weights (dict): Category weights for the overall score (defaults to SCORE_WEIGHTS)
+
+    Returns:
+        list: The computed score dictionaries of the rescored CVs
+    """
+    versions = latest_score_versions(resumes)
+    resumes = [resume for resume in resumes if versions.get(resume.id, RULES_MODEL_VERSION) == RULES_MODEL_VERSION]
+    if not resumes:
+        return []
+
+    scores = score_batch([resume.text or "" for resume in resumes], weights=weights, executor=executor)
+    now = datetime.utcnow()
+    rows = []
+    for resume, score_data in zip(resumes, scores):
+        score_data["summary"] = get_score_summary(score_data["overall"], resume.language or 'en')
+        rows.append({
+            "resume_id": resume.id,
+            "overall_score": score_data["overall"],
+            "content_score": score_data["categories"]["content"],
+            "format_score": score_data["categories"]["format"],
+            "language_score": score_data["categories"]["language"],
+            "conciseness_score": score_data["categories"]["conciseness"],
+            "summary": score_data["summary"],
+            "language": resume.language or 'en',
+            "model_version": RULES_MODEL_VERSION,
+            "created_at": now
+        })
+
+    if not dry_run and rows:
+        ids_by_language = {}
+        for row in rows:
+            ids_by_language.setdefault(row["language"], []).append(row["resume_id"])
+        for language, resume_ids in ids_by_language.items():
+            (ResumeScore.query
+             .filter(ResumeScore.resume_id.in_(resume_ids),
+                     ResumeScore.language == language,
+                     ResumeScore.model_version == RULES_MODEL_VERSION)
+             .delete(synchronize_session=False))
+        db.session.bulk_insert_mappings(ResumeScore, rows)
+        db.session.commit()
+    return scores
+
+
+def weights_argument(spec):
+    """Parse the --weights option, reporting invalid weights as a usage error."""
+    try:
+        return parse_score_weights(spec)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute rule-based scores for stored CVs.")
+    parser.add_argument("--batch-size", type=int, default=RESCORE_BATCH_SIZE, help="CVs scored per batch")
+    parser.add_argument("--start-id", type=int, default=0, help="Only rescore CVs with an ID at or above this one")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processes used for feature extraction")
+    parser.add_argument("--weights", type=weights_argument, default=None,
+                        help="Category weights of the overall score, e.g. content=0.5,format=0.2 "
+                             "(categories left out keep their default; defaults to SCORE_WEIGHTS)")
+    parser.add_argument("--dry-run", action="store_true", help="Compute scores without saving them")
+    args = parser.parse_args()
+
+    executor = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
+
+    start = time.perf_counter()
+    total = 0
+    rescored = 0
+    overall_sum = 0
+    last_id = args.start_id - 1
+
+    try:
+        with app.app_context():
+            while True:
+                # Keyset pagination keeps every batch query cheap on large tables
+                resumes = (Resume.query.filter(Resume.id > last_id)
+                           .order_by(Resume.id)
+                           .limit(args.batch_size)
+                           .all())
+                if not resumes:
+                    break
+
+                scores = rescore_batch(resumes, dry_run=args.dry_run, executor=executor, weights=args.weights)
+                total += len(resumes)
+                rescored += len(scores)
+                overall_sum += sum(score_data["overall"] for score_data in scores)
+                last_id = resumes[-1].id
+                db.session.expunge_all()
+                logging.info(f"Rescored {rescored} of {total} CVs (up to ID {last_id})")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    elapsed = time.perf_counter() - start
+    average = overall_sum / rescored if rescored else 0
+    print(f"Rescored {rescored} CVs in {elapsed:.1f} s, skipped {total - rescored} whose latest score is not rule-based "
+          f"(average overall score {average:.1f})"
+          + (" [dry run, nothing saved]" if args.dry_run else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import os
+import copy
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+
+# Cache configuration
+RESULT_CACHE_SIZE = int(os.environ.get("RESULT_CACHE_SIZE", "512"))  # Entries kept in memory per process
+RESULT_CACHE_TTL = int(os.environ.get("RESULT_CACHE_TTL", str(7 * 24 * 3600)))  # Seconds before an entry expires
+RESULT_CACHE_DIR = os.environ.get("RESULT_CACHE_DIR", os.path.join(tempfile.gettempdir(), 'resume_result_cache'))
+
+
+def normalize_text(text):
+    """
+    Normalize text for cache keys so that whitespace-only edits hit the same entry.
+
+    Args:
+        text (str): The text to normalize
+
+    Returns:
+        str: Text with all whitespace runs collapsed to single spaces
+    """
+    return " ".join((text or "").split())
+
+
+def make_cache_key(*parts):
+    """
+    Build a content-addressed cache key from the given parts.
+
+    Args:
+        *parts: Values that identify the cached result (text, language, model, ...)
+
+    Returns:
+        str: Hex SHA-256 digest of the parts
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier cache for expensive analysis results.
+
+    The first tier is an in-process LRU dictionary. The second tier is a directory of
+    JSON files shared by all worker processes on the host, so a result computed by one
+    gunicorn worker is reused by the others and survives restarts. Both tiers expire
+    entries after the configured TTL.
+
+    Values are copied on the way in and out, so callers may modify what they get
+    (e.g. relocate or annotate corrections) without changing the cached entry.
+    """
+
+    def __init__(self, name, max_entries=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL, cache_dir=RESULT_CACHE_DIR):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.cache_dir = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+
+        # Set up the persistent tier (disabled if the directory is not writable)
+        if cache_dir:
+            try:
+                path = os.path.join(cache_dir, name)
+                os.makedirs(path, exist_ok=True)
+                if os.access(path, os.W_OK):
+                    self.cache_dir = path
+                else:
+                    logging.warning(f"Cache directory {path} is not writable, using memory cache only")
+            except Exception as e:
+                logging.warning(f"Could not create cache directory for {name}: {str(e)}")
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """
+        Look up a cached value.
+
+        Args:
+            key (str): Cache key from make_cache_key
+
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if now - stored_at <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return copy.deepcopy(value)
+                del self._entries[key]
+
+        if self.cache_dir:
+            path = self._path(key)
+            try:
+                with open(path, 'r', encoding='utf-8') as cache_file:
+                    entry = json.load(cache_file)
+                if now - entry["stored_at"] <= self.ttl:
+                    self._remember(key, entry["stored_at"], entry["value"])
+                    with self._lock:
+                        self.stats["disk_hits"] += 1
+                    return copy.deepcopy(entry["value"])
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logging.warning(f"Error reading {self.name} cache entry: {str(e)}")
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def set(self, key, value):
+        """
+        Store a value in both cache tiers.
+
+        Args:
+            key (str): Cache key from make_cache_key
+            value: JSON-serializable value to store
+        """
+        stored_at = time.time()
+        self._remember(key, stored_at, copy.deepcopy(value))
+
+        with self._lock:
+            self.stats["stores"] += 1
+
+        if self.cache_dir:
+            path = self._path(key)
+            try:
+                # Write to a temporary file first so readers never see a partial entry
+                fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+                with os.fdopen(fd, 'w', encoding='utf-8') as cache_file:
+                    json.dump({"stored_at": stored_at, "value": value}, cache_file)
+                os.replace(tmp_path, path)
+            except Exception as e:
+                logging.warning(f"Error writing {self.name} cache entry: {str(e)}")
+
+    def _remember(self, key, stored_at, value):
+        with self._lock:
+            self._entries[key] = (stored_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_stats(self):
+        """
+        Get hit/miss counters for this cache.
+
+        Returns:
+            dict: Counters plus the overall hit rate and current memory size
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats["memory_entries"] = len(self._entries)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 3) if lookups else 0.0
+        return stats
@@ -1,41 +1,281 @@
+import io
 import logging
 import os
+import time
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 
-def parse_resume_file(file_path):
+# PDF extraction configuration
+# Every gunicorn worker (WEB_CONCURRENCY of them, gunicorn's default is 1) starts its own pool,
+# so by default the cores are divided between them instead of each starting one per core
+WEB_CONCURRENCY = max(1, int(os.environ.get("WEB_CONCURRENCY", "1")))
+PDF_WORKERS = int(os.environ.get("PDF_WORKERS", str(max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY))))  # Processes extracting pages in parallel, per web worker
+PDF_MAX_PAGES = int(os.environ.get("PDF_MAX_PAGES", "20"))  # Pages after this one are ignored
+PDF_TIME_BUDGET = float(os.environ.get("PDF_TIME_BUDGET", "15"))  # Seconds the pages of one PDF may take, on every path
+UPLOAD_SPOOL_BYTES = int(os.environ.get("UPLOAD_SPOOL_BYTES", str(4 * 1024 * 1024)))  # Larger in-memory PDFs reach the pool through a temporary file
+
+_pdf_pool = None
+_pdf_pool_pid = None
+_pdf_pool_lock = threading.Lock()
+
+def _warm_pdf_worker():
+    """Import pdfminer when a pool process starts, so no request pays for it."""
+    import pdfminer.high_level  # noqa: F401
+
+def _worker_ready():
+    return os.getpid()
+
+def get_pdf_pool():
+    """
+    Get the process pool for PDF pages, created once per process.
+    
+    The workers are started right away rather than on the first PDF, and each
+    imports pdfminer while it starts.
+    
+    Returns:
+        ProcessPoolExecutor: The pool
+    """
+    global _pdf_pool, _pdf_pool_pid
+    with _pdf_pool_lock:
+        # A pool inherited through fork (gunicorn --preload) cannot be used by the child
+        if _pdf_pool is None or _pdf_pool_pid != os.getpid():
+            _pdf_pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, initializer=_warm_pdf_worker)
+            _pdf_pool_pid = os.getpid()
+            for _ in range(PDF_WORKERS):
+                _pdf_pool.submit(_worker_ready)
+            logging.info(f"Started {PDF_WORKERS} PDF extraction processes")
+        return _pdf_pool
+
+def warm_pdf_pool():
+    """Start the PDF pool of this process if parallel extraction is enabled and it is not running yet."""
+    if PDF_WORKERS > 1 and _pdf_pool_pid != os.getpid():
+        get_pdf_pool()
+
+def discard_pdf_pool():
+    """Forget a broken PDF pool so the next PDF starts a new one."""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        _pdf_pool = None
+
+def parse_resume_file(source, parallel=True, file_name=None):
     """
     Parse a resume file (PDF, DOCX, or TXT) and extract the text.
     
     Args:
-        file_path (str): Path to the resume file
+        source: Path to the resume file, its bytes, or a seekable binary file object
+            such as the stream of an upload
+        parallel (bool): Extract PDF pages in the process pool (False inside pool workers)
+        file_name (str): Name of the file, for the format; defaults to the path
         
     Returns:
         str: Extracted text from the resume
     """
-    file_extension = os.path.splitext(file_path)[1].lower()
+    if file_name is None and isinstance(source, (str, os.PathLike)):
+        file_name = os.fspath(source)
+    file_extension = os.path.splitext(file_name or '')[1].lower()
     
     if file_extension == '.pdf':
-        return parse_pdf(file_path)
+        return parse_pdf(source, parallel)
     elif file_extension == '.docx':
-        return parse_docx(file_path)
+        return parse_docx(source)
     elif file_extension == '.txt':
-        return parse_txt(file_path)
+        return parse_txt(source)
     else:
         raise ValueError(f"Unsupported file format: {file_extension}")
 
-def parse_pdf(file_path):
+@contextmanager
+def open_binary(source):
+    """
+    Open a file source for reading bytes.
+    
+    Paths are opened and closed again; file objects are rewound and left open for the caller.
+    
+    Args:
+        source: Path, bytes, or a seekable binary file object
+        
+    Yields:
+        A binary file object positioned at the start
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file:
+            yield file
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        yield io.BytesIO(source)
+    else:
+        source.seek(0)
+        yield source
+
+@contextmanager
+def shareable_pdf(source, pdf_file):
+    """
+    Turn a PDF source into something the pool processes can open.
+    
+    Paths are passed on as they are. In-memory PDFs are sent to the workers as
+    bytes, unless they are larger than UPLOAD_SPOOL_BYTES: then every worker
+    would get its own copy, so they are written once to a uniquely named
+    temporary file that is removed afterwards.
+    
+    Args:
+        source: The source given to parse_pdf
+        pdf_file: The source opened with open_binary
+        
+    Yields:
+        Path or bytes of the PDF
+    """
+    if isinstance(source, (str, os.PathLike)):
+        yield source
+        return
+    
+    size = pdf_file.seek(0, os.SEEK_END)
+    pdf_file.seek(0)
+    if size <= UPLOAD_SPOOL_BYTES:
+        yield pdf_file.read()
+        return
+    
+    temporary = tempfile.NamedTemporaryFile(prefix='resume-', suffix='.pdf', delete=False)
+    try:
+        with temporary:
+            shutil.copyfileobj(pdf_file, temporary)
+        yield temporary.name
+    finally:
+        os.unlink(temporary.name)
+
+def count_pdf_pages(source, limit):
+    """
+    Count the pages of a PDF without laying them out.
+    
+    Args:
+        source: Path, bytes, or binary file object of the PDF
+        limit (int): Stop counting after this many pages
+        
+    Returns:
+        int: Number of pages, at most limit
+    """
+    from pdfminer.pdfpage import PDFPage
+    with open_binary(source) as pdf_file:
+        return sum(1 for _ in PDFPage.get_pages(pdf_file, maxpages=limit))
+
+def extract_pdf_text(pdf_file, page_numbers=None, maxpages=0, expires_at=None):
+    """
+    Extract the text of a PDF like pdfminer's extract_text, optionally within a time limit.
+    
+    The limit is checked before each page is laid out; a page that has started is
+    finished, so the limit can be overrun by the time of one page.
+    
+    Args:
+        pdf_file: Binary file object of the PDF
+        page_numbers (Container): Zero-based numbers of the pages to extract (all if None)
+        maxpages (int): Stop after this many pages (0 for no limit)
+        expires_at (float): time.monotonic() value at which to give up, or None
+        
+    Returns:
+        str: Text of the pages, each ending with a form feed
+        
+    Raises:
+        TimeoutError: If the limit is reached before all pages are done
+    """
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+    
+    output = io.StringIO()
+    resource_manager = PDFResourceManager(caching=True)
+    device = TextConverter(resource_manager, output, codec='utf-8', laparams=LAParams())
+    interpreter = PDFPageInterpreter(resource_manager, device)
+    for done, page in enumerate(PDFPage.get_pages(pdf_file, page_numbers, maxpages=maxpages, caching=True)):
+        if expires_at is not None and time.monotonic() >= expires_at:
+            raise TimeoutError(f"extracting the PDF took longer than {PDF_TIME_BUDGET:g} s ({done} pages done)")
+        interpreter.process_page(page)
+    return output.getvalue()
+
+def extract_pdf_pages(source, first_page, last_page):
+    """
+    Extract the text of a range of PDF pages (runs in a pool process).
+    
+    Args:
+        source: Path or bytes of the PDF
+        first_page (int): Zero-based number of the first page
+        last_page (int): Zero-based number of the page after the range
+        
+    Returns:
+        str: Text of the pages, each ending with a form feed like extract_text output
+    """
+    with open_binary(source) as pdf_file:
+        return extract_pdf_text(pdf_file, page_numbers=range(first_page, last_page), maxpages=last_page)
+
+def extract_pdf_pages_in_pool(source, page_count, expires_at):
+    """
+    Extract PDF pages in parallel in the process pool, keeping their order.
+    
+    The pages are split into one contiguous range per worker, since every task
+    has to parse the document structure again before it can lay out its pages.
+    
+    Args:
+        source: Path or bytes of the PDF
+        page_count (int): Number of pages to extract
+        expires_at (float): time.monotonic() value at which to give up
+        
+    Returns:
+        str: Text of the pages in order
+        
+    Raises:
+        TimeoutError: If the pages are not done by expires_at
+    """
+    pool = get_pdf_pool()
+    ranges = min(PDF_WORKERS, page_count)
+    bounds = [page_count * index // ranges for index in range(ranges + 1)]
+    futures = [pool.submit(extract_pdf_pages, source, first_page, last_page)
+               for first_page, last_page in zip(bounds, bounds[1:])]
+    pages = []
+    try:
+        for future in futures:
+            pages.append(future.result(timeout=max(0.0, expires_at - time.monotonic())))
+    except FutureTimeoutError:
+        # Pages already running finish in the background; queued ones are dropped
+        for future in futures:
+            future.cancel()
+        raise TimeoutError(f"extracting {page_count} pages took longer than {PDF_TIME_BUDGET:g} s")
+    return "".join(pages)
+
+def parse_pdf(source, parallel=True):
     """
     Parse a PDF file and extract the text.
     
+    Multi-page PDFs are split into pages that are laid out in parallel in the
+    process pool. Pages after PDF_MAX_PAGES are ignored. Extraction gives up after
+    PDF_TIME_BUDGET seconds, in the pool as well as in this process.
+    
     Args:
-        file_path (str): Path to the PDF file
+        source: Path, bytes, or binary file object of the PDF
+        parallel (bool): Use the process pool for multi-page PDFs
         
     Returns:
         str: Extracted text from the PDF
     """
+    expires_at = time.monotonic() + PDF_TIME_BUDGET
     try:
-        from pdfminer.high_level import extract_text
-        text = extract_text(file_path)
-        return text
+        with open_binary(source) as pdf_file:
+            page_count = count_pdf_pages(pdf_file, PDF_MAX_PAGES + 1)
+            if page_count > PDF_MAX_PAGES:
+                logging.warning(f"PDF has more than {PDF_MAX_PAGES} pages, ignoring the rest")
+                page_count = PDF_MAX_PAGES
+            
+            if parallel and PDF_WORKERS > 1 and page_count > 1:
+                try:
+                    with shareable_pdf(source, pdf_file) as shared:
+                        return extract_pdf_pages_in_pool(shared, page_count, expires_at)
+                except BrokenProcessPool:
+                    logging.warning("PDF extraction pool broke, extracting in this process")
+                    discard_pdf_pool()
+            
+            # Single pages, parallel=False and a broken pool; the pool attempt used part of the budget
+            pdf_file.seek(0)
+            return extract_pdf_text(pdf_file, maxpages=page_count, expires_at=expires_at)
     except ImportError:
         logging.error("pdfminer.six is not installed. Unable to parse PDF files.")
         raise ImportError("pdfminer.six is not installed. Unable to parse PDF files.")
@@ -43,19 +283,20 @@ def parse_pdf(file_path):
         logging.error(f"Error parsing PDF file: {str(e)}")
         raise Exception(f"Error parsing PDF file: {str(e)}")
 
-def parse_docx(file_path):
+def parse_docx(source):
     """
     Parse a DOCX file and extract the text.
     
     Args:
-        file_path (str): Path to the DOCX file
+        source: Path, bytes, or binary file object of the DOCX
         
     Returns:
         str: Extracted text from the DOCX
     """
     try:
         import docx
-        doc = docx.Document(file_path)
+        with open_binary(source) as docx_file:
+            doc = docx.Document(docx_file)
         text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
         return text
     except ImportError:
@@ -65,20 +306,21 @@ def parse_docx(file_path):
         logging.error(f"Error parsing DOCX file: {str(e)}")
         raise Exception(f"Error parsing DOCX file: {str(e)}")
 
-def parse_txt(file_path):
+def parse_txt(source):
     """
     Parse a TXT file and extract the text.
     
     Args:
-        file_path (str): Path to the TXT file
+        source: Path, bytes, or binary file object of the TXT
         
     Returns:
         str: Extracted text from the TXT
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            text = file.read()
-        return text
+        with open_binary(source) as txt_file:
+            data = txt_file.read()
+        # Universal newlines, as when the file is opened in text mode
+        return io.StringIO(data.decode('utf-8'), newline=None).read()
     except Exception as e:
         logging.error(f"Error parsing TXT file: {str(e)}")
         raise Exception(f"Error parsing TXT file: {str(e)}")
@@ -0,0 +1,173 @@
+import re
+import logging
+
+try:
+    import re._parser as sre_parse
+    from re._constants import AT, AT_BOUNDARY, BRANCH, IN, LITERAL, MAX_REPEAT, MIN_REPEAT, SUBPATTERN
+except ImportError:  # Python < 3.11
+    import sre_parse
+    from sre_constants import AT, AT_BOUNDARY, BRANCH, IN, LITERAL, MAX_REPEAT, MIN_REPEAT, SUBPATTERN
+
+
+def match_case(original_text, replacement):
+    """
+    Adapt a replacement to the capitalization of the text it replaces.
+
+    Args:
+        original_text (str): The matched text
+        replacement (str): The suggested replacement
+
+    Returns:
+        str: Upper-cased, capitalized or unchanged replacement
+    """
+    if original_text.isupper():
+        return replacement.upper()
+    elif original_text[0].isupper():
+        return replacement.capitalize()
+    return replacement
+
+
+def _leading_chars(items):
+    """
+    Work out which characters a parsed pattern can start with.
+
+    Returns:
+        tuple: (set of lower-cased first characters, or None if unknown;
+        whether every match starts at a word boundary)
+    """
+    boundary = False
+    for op, argument in items:
+        if op == AT:
+            boundary = boundary or argument == AT_BOUNDARY
+            continue
+        if op == LITERAL:
+            return {chr(argument).lower()}, boundary
+        if op == IN:
+            chars = set()
+            for item_op, item_argument in argument:
+                if item_op != LITERAL:
+                    return None, boundary
+                chars.add(chr(item_argument).lower())
+            return chars, boundary
+        if op == SUBPATTERN:
+            chars, inner_boundary = _leading_chars(argument[-1])
+            return chars, boundary or inner_boundary
+        if op == BRANCH:
+            chars = set()
+            branch_boundaries = []
+            for branch in argument[1]:
+                branch_chars, branch_boundary = _leading_chars(branch)
+                if branch_chars is None:
+                    return None, boundary
+                chars |= branch_chars
+                branch_boundaries.append(branch_boundary)
+            return chars, boundary or all(branch_boundaries)
+        if op in (MAX_REPEAT, MIN_REPEAT) and argument[0] >= 1:
+            chars, inner_boundary = _leading_chars(argument[2])
+            return chars, boundary or inner_boundary
+        return None, boundary
+    return None, boundary
+
+
+class RuleEngine:
+    """
+    Applies a list of regex rewrite rules to a text in a single scan.
+
+    The rules are analyzed once when the engine is built: for each rule the set of
+    characters a match can start with is derived from its parsed pattern, and all of
+    them are combined into one compiled prefilter. Scanning a CV is then a single
+    pass of the prefilter over the text; only at the positions it reports are the
+    rules starting with that character tried. Each rule keeps the non-overlapping
+    semantics of re.finditer and results are returned rule by rule, so the output
+    is identical to running re.finditer for every rule in turn.
+
+    Each rule is a dict with "pattern", "replacement", "explanation" and "category".
+    Rules whose first character cannot be determined are scanned on their own.
+    """
+
+    def __init__(self, rules, flags=re.IGNORECASE):
+        # A rule without replacement never produces a suggestion, so it is not scanned for
+        self.rules = [rule for rule in rules if rule["replacement"]]
+        self.patterns = [re.compile(rule["pattern"], flags) for rule in self.rules]
+
+        self._dispatch = {}  # First character -> indexes of the rules that can start with it
+        self._dispatched = []
+        self._standalone = []
+        all_boundary = True
+        for index, rule in enumerate(self.rules):
+            chars, boundary = _leading_chars(sre_parse.parse(rule["pattern"], flags))
+            if not chars:
+                self._standalone.append(index)
+                continue
+            self._dispatched.append(index)
+            all_boundary = all_boundary and boundary
+            for char in chars:
+                self._dispatch.setdefault(char, []).append(index)
+
+        self.prefilter = None
+        if self._dispatch:
+            char_class = "".join(re.escape(char) for char in sorted(self._dispatch))
+            prefix = r"\b" if all_boundary else ""
+            self.prefilter = re.compile(f"{prefix}[{char_class}]", flags)
+
+        logging.debug(f"Compiled rule engine with {len(self._dispatched)} indexed and "
+                      f"{len(self._standalone)} standalone rules")
+
+    def find_matches(self, text):
+        """
+        Find all rule matches in the text.
+
+        Args:
+            text (str): Text to scan
+
+        Returns:
+            list: (rule_index, start, end) tuples ordered by rule, then by position
+        """
+        patterns = self.patterns
+        dispatch = self._dispatch
+        matches = [[] for _ in patterns]
+        next_allowed = [0] * len(patterns)  # End of each rule's previous match (finditer does not overlap)
+
+        if self.prefilter is not None:
+            for candidate in self.prefilter.finditer(text):
+                position = candidate.start()
+                # Case-insensitive matching can pair characters that lower() does not
+                rule_indexes = dispatch.get(text[position].lower(), self._dispatched)
+                for rule_index in rule_indexes:
+                    if position < next_allowed[rule_index]:
+                        continue
+                    match = patterns[rule_index].match(text, position)
+                    if match:
+                        end = match.end()
+                        matches[rule_index].append((rule_index, position, end))
+                        next_allowed[rule_index] = end if end > position else position + 1
+
+        for rule_index in self._standalone:
+            matches[rule_index] = [(rule_index, match.start(), match.end())
+                                   for match in patterns[rule_index].finditer(text)]
+
+        return [match for rule_matches in matches for match in rule_matches]
+
+    def apply(self, text):
+        """
+        Turn rule matches into correction suggestions.
+
+        Args:
+            text (str): Text to analyze
+
+        Returns:
+            list: Correction dictionaries in the order of the rules
+        """
+        corrections = []
+        for rule_index, start_pos, end_pos in self.find_matches(text):
+            rule = self.rules[rule_index]
+            original_text = text[start_pos:end_pos]
+            corrections.append({
+                "original": original_text,
+                "position": {"start": start_pos, "end": end_pos},
+                "suggestion": match_case(original_text, rule["replacement"]),
+                "explanation": rule["explanation"],
+                "category": rule["category"]
+            })
+
+        return corrections
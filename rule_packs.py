@@ -0,0 +1,183 @@
+import os
+import re
+import json
+import time
+import logging
+import threading
+from rule_engine import RuleEngine
+
+# Rule pack configuration
+RULES_DIR = os.environ.get("RULES_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rules'))
+RULES_RELOAD_INTERVAL = float(os.environ.get("RULES_RELOAD_INTERVAL", "5"))  # Seconds between checks for changed rule files
+BUNDLES_MANIFEST = "bundles.json"  # Maps each bundle (language) to its ordered list of packs
+DEFAULT_BUNDLE = "en"
+
+REQUIRED_RULE_FIELDS = ("pattern", "replacement", "explanation", "category")
+
+
+class RulePackError(ValueError):
+    """Raised when a rule pack or the bundle manifest is invalid."""
+    pass
+
+
+def validate_rules(rules, source):
+    """
+    Check that a rule pack has the shape RuleEngine expects.
+
+    Args:
+        rules: Parsed content of the pack file
+        source (str): Pack name used in error messages
+
+    Raises:
+        RulePackError: If the pack is not a list of complete rules with valid patterns
+    """
+    if not isinstance(rules, list):
+        raise RulePackError(f"{source}: a rule pack must be a JSON list")
+
+    for index, rule in enumerate(rules):
+        if not isinstance(rule, dict):
+            raise RulePackError(f"{source}[{index}]: a rule must be an object")
+        for field in REQUIRED_RULE_FIELDS:
+            if not isinstance(rule.get(field), str):
+                raise RulePackError(f"{source}[{index}]: '{field}' must be a string")
+        if not rule["pattern"]:
+            raise RulePackError(f"{source}[{index}]: 'pattern' must not be empty")
+        try:
+            compiled = re.compile(rule["pattern"], re.IGNORECASE)
+        except re.error as e:
+            raise RulePackError(f"{source}[{index}]: invalid pattern {rule['pattern']!r}: {str(e)}")
+        if compiled.match(""):
+            raise RulePackError(f"{source}[{index}]: pattern {rule['pattern']!r} matches the empty string")
+
+
+def load_rule_pack(path, name):
+    """
+    Load and validate one rule pack file.
+
+    Args:
+        path (str): Path to the JSON file
+        name (str): Pack name used in error messages
+
+    Returns:
+        list: The validated rules
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as pack_file:
+            rules = json.load(pack_file)
+    except (OSError, ValueError) as e:
+        raise RulePackError(f"{name}: could not read rule pack: {str(e)}")
+    validate_rules(rules, name)
+    return rules
+
+
+class RuleBundles:
+    """
+    Compiled rule engines per language, loaded from the rule pack files.
+
+    The manifest lists the packs of every bundle in order. Each bundle is compiled
+    into one RuleEngine when loaded, so a request only looks up its language's
+    engine; rules of other languages are never scanned. Every RULES_RELOAD_INTERVAL
+    seconds the modification times of the manifest and the packs are compared with
+    those of the loaded version, and changed files are reloaded in place. If the new
+    files do not validate, the previous engines stay active.
+    """
+
+    def __init__(self, rules_dir=RULES_DIR, reload_interval=RULES_RELOAD_INTERVAL):
+        self.rules_dir = rules_dir
+        self.reload_interval = reload_interval
+        self._engines = {}
+        self._pack_names = []
+        self._mtimes = {}
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _pack_path(self, pack_name):
+        return os.path.join(self.rules_dir, f"{pack_name}.json")
+
+    def _current_mtimes(self, pack_names):
+        mtimes = {}
+        for path in [os.path.join(self.rules_dir, BUNDLES_MANIFEST)] + [self._pack_path(name) for name in pack_names]:
+            try:
+                mtimes[path] = os.path.getmtime(path)
+            except OSError:
+                mtimes[path] = None
+        return mtimes
+
+    def load(self):
+        """
+        Load, validate and compile every bundle in the manifest.
+
+        Raises:
+            RulePackError: If the manifest or any pack is invalid
+        """
+        manifest_path = os.path.join(self.rules_dir, BUNDLES_MANIFEST)
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as manifest_file:
+                manifest = json.load(manifest_file)
+        except (OSError, ValueError) as e:
+            raise RulePackError(f"{BUNDLES_MANIFEST}: could not read bundle manifest: {str(e)}")
+
+        if not isinstance(manifest, dict) or not all(
+                isinstance(packs, list) and all(isinstance(pack, str) for pack in packs)
+                for packs in manifest.values()):
+            raise RulePackError(f"{BUNDLES_MANIFEST}: expected an object mapping bundle names to lists of packs")
+
+        pack_names = sorted({pack for packs in manifest.values() for pack in packs})
+        mtimes = self._current_mtimes(pack_names)
+        packs = {name: load_rule_pack(self._pack_path(name), name) for name in pack_names}
+
+        engines = {}
+        for bundle, bundle_packs in manifest.items():
+            engines[bundle] = RuleEngine([rule for pack in bundle_packs for rule in packs[pack]])
+
+        with self._lock:
+            self._engines = engines
+            self._pack_names = pack_names
+            self._mtimes = mtimes
+            self._checked_at = time.monotonic()
+
+        rule_count = sum(len(rules) for rules in packs.values())
+        logging.info(f"Loaded {len(engines)} rule bundles from {len(packs)} packs ({rule_count} rules)")
+
+    def _reload_if_changed(self):
+        now = time.monotonic()
+        with self._lock:
+            if now - self._checked_at < self.reload_interval:
+                return
+            self._checked_at = now
+
+        current = self._current_mtimes(self._pack_names)
+        if current == self._mtimes:
+            return
+
+        logging.info("Rule pack files changed, reloading rule bundles")
+        try:
+            self.load()
+        except RulePackError as e:
+            logging.error(f"Keeping previous rule bundles, reload failed: {str(e)}")
+            with self._lock:
+                self._mtimes = current  # Do not retry until the files change again
+
+    def get_engine(self, bundle):
+        """
+        Get the compiled rule engine for a bundle.
+
+        Args:
+            bundle (str): Bundle name, usually the analysis language
+
+        Returns:
+            RuleEngine: The bundle's engine, or the default bundle's for unknown names
+        """
+        if not self._engines:
+            self.load()
+        else:
+            self._reload_if_changed()
+
+        engines = self._engines
+        engine = engines.get(bundle) or engines.get(DEFAULT_BUNDLE)
+        if engine is None:
+            raise RulePackError(f"No rule bundle named {bundle!r} or {DEFAULT_BUNDLE!r}")
+        return engine
+
+
+rule_bundles = RuleBundles()
@@ -0,0 +1,170 @@
+import os
+import re
+import numpy as np
+
+# Points available per category and their default weight in the overall score
+CATEGORY_MAX_POINTS = {"content": 40, "format": 30, "language": 15, "conciseness": 15}
+DEFAULT_SCORE_WEIGHTS = {"content": 0.4, "format": 0.3, "language": 0.15, "conciseness": 0.15}
+
+# Ideal CV length in words
+IDEAL_MIN_WORDS = 300
+IDEAL_MAX_WORDS = 600
+
+ACHIEVEMENT_PATTERN = re.compile(r"\b(?:increased|improved|reduced|saved|achieved|developed|launched|managed|led)\b.*?\b\d+(?:\.\d+)?%?\b", re.IGNORECASE)
+SKILLS_PATTERN = re.compile(r"\b(?:skills|fähigkeiten|kenntnisse|kompetenzen)\b", re.IGNORECASE)
+EDUCATION_PATTERN = re.compile(r"\b(?:bachelor|master|diplom|doktor|phd|ausbildung|studium|university|hochschule|universität)\b", re.IGNORECASE)
+BULLET_PATTERN = re.compile(r"(?:^|\n)\s*(?:•|-|\*|\d+\.)\s+")
+SECTION_HEADER_PATTERN = re.compile(r"(?:^|\n)(?:[A-Z][A-Za-z\s]+:|\b(?:EDUCATION|EXPERIENCE|SKILLS|PROJECTS|AUSBILDUNG|BERUFSERFAHRUNG|FÄHIGKEITEN|PROJEKTE)\b)")
+GRAMMAR_PATTERNS = [
+    # Subject-verb agreement issues; the pronoun matches cannot overlap, so one pattern counts them all
+    re.compile(r"\b(?:i|he|she|it|they)\s+(?:has|have|is|am|are|was|were)\b", re.IGNORECASE),
+    re.compile(r"\b(?:a|an)\s+(?:[aeiou]|hour|honor)", re.IGNORECASE)  # A/An issues
+]
+
+# Columns of the feature matrix
+FEATURE_NAMES = ["achievements", "has_skills", "has_education", "bullet_points", "section_headers",
+                 "grammar_errors", "word_count"]
+
+
+def parse_score_weights(spec):
+    """
+    Parse category weights written as "content=0.5,format=0.2".
+
+    Args:
+        spec (str): Comma-separated category=weight pairs; categories left out keep their default
+
+    Returns:
+        dict: Weight of every category
+
+    Raises:
+        ValueError: For an unknown category or a weight that is not a non-negative number
+    """
+    weights = dict(DEFAULT_SCORE_WEIGHTS)
+    for pair in filter(None, (part.strip() for part in (spec or "").split(","))):
+        category, _, value = pair.partition("=")
+        category = category.strip()
+        if category not in weights:
+            raise ValueError(f"Unknown score category: {category} (expected one of {', '.join(weights)})")
+        try:
+            weight = float(value)
+        except ValueError:
+            raise ValueError(f"Invalid weight for {category}: {value.strip()!r}")
+        if weight < 0:
+            raise ValueError(f"Weight for {category} must not be negative")
+        weights[category] = weight
+    return weights
+
+# Weights of the rule-based overall score, e.g. SCORE_WEIGHTS="content=0.5,format=0.2"
+SCORE_WEIGHTS = parse_score_weights(os.environ.get("SCORE_WEIGHTS"))
+
+
+def _count(pattern, text):
+    return sum(1 for _ in pattern.finditer(text))
+
+
+def extract_features(resume_text):
+    """
+    Extract the scoring features of one CV.
+
+    Args:
+        resume_text (str): The CV text
+
+    Returns:
+        list: Feature values in the order of FEATURE_NAMES
+    """
+    return [
+        _count(ACHIEVEMENT_PATTERN, resume_text),
+        1 if SKILLS_PATTERN.search(resume_text) else 0,
+        1 if EDUCATION_PATTERN.search(resume_text) else 0,
+        _count(BULLET_PATTERN, resume_text),
+        _count(SECTION_HEADER_PATTERN, resume_text),
+        sum(_count(pattern, resume_text) for pattern in GRAMMAR_PATTERNS),
+        len(resume_text.split())
+    ]
+
+
+def build_feature_matrix(resume_texts, executor=None):
+    """
+    Extract features for a batch of CVs.
+
+    Args:
+        resume_texts (list): CV texts
+        executor: Optional process pool to spread the extraction over several cores
+
+    Returns:
+        numpy.ndarray: One row per CV, one column per entry of FEATURE_NAMES
+    """
+    if executor is not None:
+        chunksize = max(1, len(resume_texts) // 64)
+        rows = list(executor.map(extract_features, resume_texts, chunksize=chunksize))
+    else:
+        rows = [extract_features(resume_text) for resume_text in resume_texts]
+    return np.array(rows, dtype=np.float64).reshape(len(resume_texts), len(FEATURE_NAMES))
+
+
+def score_feature_matrix(features, weights=None):
+    """
+    Compute category and overall scores for a whole feature matrix at once.
+
+    Args:
+        features (numpy.ndarray): Matrix from build_feature_matrix
+        weights (dict): Category weights for the overall score (defaults to SCORE_WEIGHTS)
+
+    Returns:
+        dict: Arrays of rounded scores (0-100) for "overall" and each category
+    """
+    weights = weights or SCORE_WEIGHTS
+    columns = {name: features[:, index] for index, name in enumerate(FEATURE_NAMES)}
+
+    # Content: 5 points per quantified achievement (max 20), 10 each for skills and education
+    content = np.minimum(columns["achievements"] * 5, 20) + columns["has_skills"] * 10 + columns["has_education"] * 10
+
+    # Format: 2 points per bullet (max 15), 3 points per section header (max 15)
+    format_ = np.minimum(columns["bullet_points"] * 2, 15) + np.minimum(columns["section_headers"] * 3, 15)
+
+    # Language: 15 points minus 5 per grammar issue
+    language = np.maximum(0, 15 - columns["grammar_errors"] * 5)
+
+    # Conciseness: full points within the ideal range, proportional below, -1 per 100 words above
+    word_count = columns["word_count"]
+    conciseness = np.where(
+        (word_count >= IDEAL_MIN_WORDS) & (word_count <= IDEAL_MAX_WORDS),
+        15.0,
+        np.where(word_count < IDEAL_MIN_WORDS,
+                 word_count / IDEAL_MIN_WORDS * 15,
+                 np.maximum(0, 15 - (word_count - IDEAL_MAX_WORDS) / 100))
+    )
+
+    category_points = {"content": content, "format": format_, "language": language, "conciseness": conciseness}
+    overall = ((category_points["content"] * weights["content"]) + (category_points["format"] * weights["format"])
+               + (category_points["language"] * weights["language"]) + (category_points["conciseness"] * weights["conciseness"]))
+
+    # np.rint rounds halves to even, like round()
+    scores = {"overall": np.rint(overall).astype(int)}
+    for category, points in category_points.items():
+        scores[category] = np.rint(points * 100 / CATEGORY_MAX_POINTS[category]).astype(int)
+    return scores
+
+
+def score_batch(resume_texts, weights=None, executor=None):
+    """
+    Score a batch of CVs with the rule-based heuristics.
+
+    Args:
+        resume_texts (list): CV texts
+        weights (dict): Category weights for the overall score (defaults to SCORE_WEIGHTS)
+        executor: Optional process pool for the feature extraction
+
+    Returns:
+        list: Score dictionaries with "overall" and "categories" (no summary)
+    """
+    if not resume_texts:
+        return []
+    scores = score_feature_matrix(build_feature_matrix(resume_texts, executor), weights)
+    return [
+        {
+            "overall": int(scores["overall"][row]),
+            "categories": {category: int(scores[category][row]) for category in CATEGORY_MAX_POINTS}
+        }
+        for row in range(len(resume_texts))
+    ]
@@ -0,0 +1,243 @@
+import os
+import re
+import json
+import logging
+from itertools import compress
+
+# Skill taxonomy configuration
+SKILL_TAXONOMY_PATH = os.environ.get("SKILL_TAXONOMY_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), 'taxonomy', 'skills.json'))
+
+# Text is split into tokens on whitespace after a couple of C-level passes, which is
+# much cheaper than a regex match per word. Separators inside multi-word skills
+# ("CI/CD", "scikit-learn", "M&A") become plain spaces; other punctuation becomes a
+# "|" break token that no skill can span. Dots are kept so "Node.js", "ASP.NET" and
+# ".NET" stay whole, except at the end of a sentence.
+TOKEN_GAPS = ("-", "/", "&", "\t", "\xa0")
+BREAK_TOKEN = "|"
+BREAK_PATTERN = re.compile(r"[\n\r,;:()\[\]{}!?*=<>\"“”„•·▪●►■–—…|]")
+
+# Aliases that are also common words ("Go", "Word", "Spring") only count with context:
+# alone in a list item, next to a version number, or within this many tokens of another skill
+CONTEXT_DISTANCE = 2
+VERSION_PATTERN = re.compile(r"v?\d+(?:\.\d+)*\+?$")
+
+
+class TaxonomyError(ValueError):
+    """Raised when the skill taxonomy file is invalid."""
+    pass
+
+
+def _prepare(text):
+    for gap in TOKEN_GAPS:
+        text = text.replace(gap, " ")
+    return (BREAK_PATTERN.sub(" | ", text) + " ").replace(". ", " | ")
+
+
+def split_tokens(text):
+    """
+    Split a text into skill tokens.
+
+    Args:
+        text (str): Text to split
+
+    Returns:
+        list: Tokens in their original case, with "|" marking punctuation breaks
+    """
+    return _prepare(text).split()
+
+
+def _in_context(tokens, spans, number):
+    """
+    Check whether a mention of an alias that is also an everyday word is used as a skill.
+
+    Args:
+        tokens (list): Tokens of the text
+        spans (list): (category, canonical, first token, last token, needs context) of every mention
+        number (int): Index of the mention in spans
+
+    Returns:
+        bool: True if the mention is alone in a list item, followed by a version number,
+        or within CONTEXT_DISTANCE tokens of another mention without a break in between
+    """
+    start, last = spans[number][2], spans[number][3]
+    before = tokens[start - 1] if start > 0 else BREAK_TOKEN
+    after = tokens[last + 1] if last + 1 < len(tokens) else BREAK_TOKEN
+    if before == BREAK_TOKEN and after == BREAK_TOKEN:
+        return True
+    if VERSION_PATTERN.match(after):
+        return True
+    if number > 0:
+        gap = tokens[spans[number - 1][3] + 1:start]
+        if len(gap) < CONTEXT_DISTANCE and BREAK_TOKEN not in gap:
+            return True
+    if number + 1 < len(spans):
+        gap = tokens[last + 1:spans[number + 1][2]]
+        if len(gap) < CONTEXT_DISTANCE and BREAK_TOKEN not in gap:
+            return True
+    return False
+
+
+class SkillMatcher:
+    """
+    Finds taxonomy skills in a text in a single pass over its tokens.
+
+    Every alias of every skill is split into tokens and inserted into a token trie
+    (nested dicts) whose terminal nodes hold the canonical skill name. Matching
+    walks the trie from each token of the text and keeps the longest alias that
+    ends there, so "Spring Boot" wins over "Spring" and the text is consumed left
+    to right without rescanning. Aliases listed as case-sensitive ("Go", "R",
+    "Excel") only match when the text has exactly that spelling, and aliases that
+    are also everyday words only count when the text around them looks like a
+    skill list (see CONTEXT_DISTANCE), so "Go to work" is not a Go mention.
+
+    Results are canonical names ranked by the number of mentions, ties broken by
+    the first mention, so the most prominent skills come first.
+    """
+
+    _TERMINAL = ""  # Trie key of the (category, canonical name, exact spelling, needs context) entries; never a token
+
+    def __init__(self, categories, case_sensitive=(), context_required=()):
+        """
+        Args:
+            categories (dict): Category -> {canonical name: [aliases]}
+            case_sensitive (iterable): Aliases that must match with their exact spelling
+            context_required (iterable): Aliases that only count next to other skills or in a list
+        """
+        case_sensitive = set(case_sensitive)
+        context_required = set(context_required)
+        self.categories = list(categories)
+        self.trie = {}
+        self.alias_count = 0
+        known_aliases = set()
+
+        for category, skills in categories.items():
+            for canonical, aliases in skills.items():
+                for alias in [canonical] + list(aliases):
+                    known_aliases.add(alias)
+                    self._insert(alias, category, canonical, alias if alias in case_sensitive else None,
+                                 alias in context_required)
+
+        unknown = case_sensitive - known_aliases
+        if unknown:
+            raise TaxonomyError(f"Case-sensitive entries without a matching alias: {', '.join(sorted(unknown))}")
+        unknown = context_required - known_aliases
+        if unknown:
+            raise TaxonomyError(f"Context-required entries without a matching alias: {', '.join(sorted(unknown))}")
+
+    def _insert(self, alias, category, canonical, exact, needs_context):
+        tokens = split_tokens(alias)
+        if not tokens or BREAK_TOKEN in tokens:
+            raise TaxonomyError(f"{canonical}: alias {alias!r} is empty or contains punctuation that breaks matching")
+
+        node = self.trie
+        for token in tokens:
+            node = node.setdefault(token.lower(), {})
+
+        exact_tokens = tokens if exact else None
+        entries = node.setdefault(self._TERMINAL, [])
+        for other_category, other_canonical, other_exact, _ in entries:
+            if other_exact == exact_tokens:
+                if (other_category, other_canonical) != (category, canonical):
+                    raise TaxonomyError(f"Alias {alias!r} maps to both {other_canonical!r} and {canonical!r}")
+                return  # Same alias listed twice for the same skill
+        # Case-sensitive spellings are checked before the case-insensitive fallback
+        entries.insert(0 if exact else len(entries), (category, canonical, exact_tokens, needs_context))
+        self.alias_count += 1
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Load a taxonomy JSON file.
+
+        Args:
+            path (str): Path to the file
+
+        Returns:
+            SkillMatcher: The compiled matcher
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as taxonomy_file:
+                taxonomy = json.load(taxonomy_file)
+        except (OSError, ValueError) as e:
+            raise TaxonomyError(f"Could not read skill taxonomy {path}: {str(e)}")
+
+        categories = taxonomy.get("categories") if isinstance(taxonomy, dict) else None
+        if not isinstance(categories, dict) or not all(
+                isinstance(skills, dict) and all(isinstance(aliases, list) for aliases in skills.values())
+                for skills in categories.values()):
+            raise TaxonomyError(f"{path}: expected \"categories\" mapping each category to {{skill: [aliases]}}")
+
+        matcher = cls(categories, taxonomy.get("case_sensitive", []), taxonomy.get("context_required", []))
+        skill_count = sum(len(skills) for skills in categories.values())
+        logging.info(f"Loaded skill taxonomy with {skill_count} skills and {matcher.alias_count} aliases")
+        return matcher
+
+    def find_all(self, text):
+        """
+        Find every skill mention in a text.
+
+        Args:
+            text (str): Text to scan
+
+        Returns:
+            list: (category, canonical name, matched text) tuples in text order
+        """
+        root = self.trie
+        terminal = self._TERMINAL
+        prepared = _prepare(text)
+        tokens = prepared.split()
+        folded = prepared.lower().split()
+        token_count = len(folded)
+        spans = []
+        resume_at = 0
+
+        # Only tokens that start an alias are visited; the lookups run in C
+        for index in compress(range(token_count), map(root.get, folded)):
+            if index < resume_at:
+                continue
+
+            # Follow the trie as far as the text allows and keep the longest alias that matches
+            node = root[folded[index]]
+            best = None
+            position = index
+            while node is not None:
+                for category, canonical, exact, needs_context in node.get(terminal, ()):
+                    if exact is None or tokens[index:position + 1] == exact:
+                        best = (category, canonical, index, position, needs_context)
+                        break
+                position += 1
+                node = node.get(folded[position]) if position < token_count else None
+
+            if best is not None:
+                spans.append(best)
+                resume_at = best[3] + 1
+
+        return [(category, canonical, " ".join(tokens[start:last + 1]))
+                for number, (category, canonical, start, last, needs_context) in enumerate(spans)
+                if not needs_context or _in_context(tokens, spans, number)]
+
+    def extract(self, text):
+        """
+        Extract the skills of each category, ranked by prominence.
+
+        Args:
+            text (str): Text to scan
+
+        Returns:
+            dict: Category -> canonical names, most mentioned first (ties by first mention)
+        """
+        counts = {category: {} for category in self.categories}
+        for category, canonical, _ in self.find_all(text):
+            # Dicts keep insertion order, so the first mention is the tie-breaker
+            category_counts = counts[category]
+            category_counts[canonical] = category_counts.get(canonical, 0) + 1
+
+        return {
+            category: sorted(category_counts, key=category_counts.get, reverse=True)
+            for category, category_counts in counts.items()
+        }
+
+
+# Built at import so that with gunicorn --preload the trie is created once in the
+# master process and shared copy-on-write by all workers
+skill_matcher = SkillMatcher.from_file(SKILL_TAXONOMY_PATH)
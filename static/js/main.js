@@ -214,9 +214,162 @@ document.addEventListener('DOMContentLoaded', function() {
     if (anschreibenForm) {
         anschreibenForm.addEventListener('submit', function(e) {
             const jobDescription = document.getElementById('job-description');
-            if (jobDescription && jobDescription.value.trim() !== '') {
+            if (!jobDescription || jobDescription.value.trim() === '') {
+                return;
+            }
+            
+            // Stream the letter into the page when the browser supports it
+            const streamUrl = anschreibenForm.getAttribute('data-stream-url');
+            if (streamUrl && window.fetch && window.ReadableStream && window.TextDecoder) {
+                e.preventDefault();
+                const regenerate = e.submitter && e.submitter.name === 'regenerate';
+                streamAnschreiben(anschreibenForm, streamUrl, regenerate);
+            } else {
                 showLoading('Generating your personalized cover letter...');
             }
         });
+        
+        // Show the keyword fit of the CV before a letter is generated
+        const matchButton = document.getElementById('check-match');
+        const matchUrl = anschreibenForm.getAttribute('data-match-url');
+        if (matchButton && matchUrl && window.fetch) {
+            matchButton.addEventListener('click', function() {
+                matchButton.disabled = true;
+                fetch(matchUrl, {
+                    method: 'POST',
+                    body: new FormData(anschreibenForm)
+                })
+                .then(response => response.json().then(data => {
+                    if (!response.ok) {
+                        throw new Error(data.error || 'Error checking the match.');
+                    }
+                    showMatch(data);
+                }))
+                .catch(error => {
+                    console.error('Error:', error);
+                    alert(error.message);
+                })
+                .finally(() => {
+                    matchButton.disabled = false;
+                });
+            });
+        }
+    }
+    
+    // Render the result of /anschreiben/match
+    function showMatch(data) {
+        const score = document.getElementById('match-score');
+        score.textContent = data.score + '%';
+        score.className = 'badge ' + (data.score >= 60 ? 'bg-success' : data.score >= 30 ? 'bg-warning' : 'bg-danger');
+        document.getElementById('match-matched').textContent = data.matched.join(', ') || '–';
+        document.getElementById('match-missing').textContent = data.missing.join(', ') || '–';
+        
+        // Required terms, rarest among stored job ads first
+        const coverage = document.getElementById('ats-coverage');
+        coverage.textContent = data.ats.coverage + '%';
+        coverage.className = 'badge ' + (data.ats.coverage >= 70 ? 'bg-success' : data.ats.coverage >= 40 ? 'bg-warning' : 'bg-danger');
+        document.getElementById('ats-present').textContent = data.ats.present.map(item => item.term).join(', ') || '–';
+        document.getElementById('ats-absent').textContent = data.ats.absent.map(item => item.term).join(', ') || '–';
+        document.getElementById('match-result').classList.remove('d-none');
+    }
+    
+    // Render a streamed cover letter incrementally
+    function streamAnschreiben(form, streamUrl, regenerate) {
+        const resultCard = document.getElementById('anschreiben-result');
+        const textArea = document.getElementById('anschreiben-text');
+        const textInput = document.getElementById('anschreiben-text-input');
+        const submitButtons = form.querySelectorAll('button[type="submit"]');
+        const regenerateButton = document.getElementById('regenerate-anschreiben');
+        
+        textArea.value = '';
+        resultCard.classList.remove('d-none');
+        resultCard.style.opacity = '1';
+        resultCard.style.transform = 'translateY(0)';
+        submitButtons.forEach(button => {
+            button.disabled = true;
+        });
+        
+        const formData = new FormData(form);
+        if (regenerate) {
+            formData.append('regenerate', '1');
+        }
+        
+        fetch(streamUrl, {
+            method: 'POST',
+            body: formData
+        })
+        .then(response => {
+            if (!response.ok) {
+                return response.json().then(data => {
+                    throw new Error(data.error || 'Error generating cover letter.');
+                });
+            }
+            return readEventStream(response, function(event, data) {
+                if (event === 'error') {
+                    throw new Error(data.error);
+                }
+                if (event === 'done') {
+                    textInput.value = textArea.value;
+                    if (regenerateButton) {
+                        regenerateButton.classList.remove('d-none');
+                    }
+                    return;
+                }
+                textArea.value += data.text;
+                textArea.scrollTop = textArea.scrollHeight;
+            });
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            alert(error.message);
+        })
+        .finally(() => {
+            submitButtons.forEach(button => {
+                button.disabled = false;
+            });
+        });
     }
 });
+
+// Read a Server-Sent Events response body and call onEvent(event, data) per message
+window.readEventStream = function(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    
+    function dispatch(message) {
+        let event = 'message';
+        const dataLines = [];
+        message.split('\n').forEach(line => {
+            if (line.startsWith('event:')) {
+                event = line.slice(6).trim();
+            } else if (line.startsWith('data:')) {
+                dataLines.push(line.slice(5).trim());
+            }
+        });
+        if (dataLines.length > 0) {
+            onEvent(event, JSON.parse(dataLines.join('\n')));
+        }
+    }
+    
+    function pump() {
+        return reader.read().then(({ done, value }) => {
+            if (done) {
+                if (buffer.trim() !== '') {
+                    dispatch(buffer);
+                }
+                return;
+            }
+            buffer += decoder.decode(value, { stream: true });
+            let boundary = buffer.indexOf('\n\n');
+            while (boundary !== -1) {
+                dispatch(buffer.slice(0, boundary));
+                buffer = buffer.slice(boundary + 2);
+                boundary = buffer.indexOf('\n\n');
+            }
+            return pump();
+        });
+    }
+    
+    return pump();
+};
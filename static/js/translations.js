@@ -57,6 +57,8 @@ const translations = {
         "suggested_improvements": "Suggested Improvements",
         "apply_all": "Apply All Corrections",
         "no_suggestions": "No suggestions found. Your resume looks good!",
+        "analysis_in_progress": "Analyzing your resume...",
+        "analysis_in_progress_desc": "Your corrections and scores will appear here as soon as they are ready.",
         "content_score": "Content",
         "format_score": "Format",
         "language_score": "Language",
@@ -90,6 +92,14 @@ const translations = {
         "paste_job_description": "Paste the job description here...",
         "job_description_help": "Add as much detail as possible for better results.",
         "generate_button": "Generate Cover Letter",
+        "regenerate_button": "Generate a New Version",
+        "check_match_button": "Check How Well My CV Matches",
+        "match_score": "CV match",
+        "matched_keywords": "Keywords in your CV:",
+        "missing_keywords": "Keywords missing from your CV:",
+        "ats_coverage": "Applicant tracking system keyword coverage",
+        "ats_present": "Required terms found:",
+        "ats_absent": "Required terms not found:",
         "generated_cover_letter": "Generated Cover Letter",
         "ai_cover_letter_note": "This is an AI-generated cover letter. Review and personalize it before use.",
         "copy_clipboard": "Copy to Clipboard",
@@ -162,6 +172,8 @@ const translations = {
         "suggested_improvements": "Vorgeschlagene Verbesserungen",
         "apply_all": "Alle Korrekturen anwenden",
         "no_suggestions": "Keine Vorschläge verfügbar. Ihr Lebenslauf sieht großartig aus!",
+        "analysis_in_progress": "Ihr Lebenslauf wird analysiert...",
+        "analysis_in_progress_desc": "Ihre Korrekturen und Bewertungen erscheinen hier, sobald sie bereit sind.",
         "content_score": "Inhalt",
         "format_score": "Format",
         "language_score": "Sprache",
@@ -195,6 +207,14 @@ const translations = {
         "paste_job_description": "Fügen Sie die Stellenbeschreibung hier ein...",
         "job_description_help": "Fügen Sie so viele Details wie möglich hinzu, um bessere Ergebnisse zu erzielen.",
         "generate_button": "Anschreiben generieren",
+        "regenerate_button": "Neue Version generieren",
+        "check_match_button": "Passung meines Lebenslaufs prüfen",
+        "match_score": "Passung des Lebenslaufs",
+        "matched_keywords": "Schlüsselwörter in Ihrem Lebenslauf:",
+        "missing_keywords": "Fehlende Schlüsselwörter:",
+        "ats_coverage": "Abdeckung der Bewerbermanagement-Schlüsselwörter",
+        "ats_present": "Gefundene Anforderungen:",
+        "ats_absent": "Nicht gefundene Anforderungen:",
         "generated_cover_letter": "Generiertes Anschreiben",
         "ai_cover_letter_note": "Dies ist ein KI-generiertes Anschreiben. Überprüfen und personalisieren Sie es vor der Verwendung.",
         "copy_clipboard": "In Zwischenablage kopieren",
@@ -267,6 +287,8 @@ const translations = {
         "suggested_improvements": "Запропоновані покращення",
         "apply_all": "Застосувати всі виправлення",
         "no_suggestions": "Немає пропозицій. Ваше резюме виглядає чудово!",
+        "analysis_in_progress": "Аналізуємо ваше резюме...",
+        "analysis_in_progress_desc": "Ваші виправлення та оцінки з'являться тут, щойно вони будуть готові.",
         "content_score": "Зміст",
         "format_score": "Формат",
         "language_score": "Мова",
@@ -300,6 +322,14 @@ const translations = {
         "paste_job_description": "Вставте опис вакансії тут...",
         "job_description_help": "Додайте якомога більше деталей для кращих результатів.",
         "generate_button": "Створити супровідний лист",
+        "regenerate_button": "Створити нову версію",
+        "check_match_button": "Перевірити відповідність резюме",
+        "match_score": "Відповідність резюме",
+        "matched_keywords": "Ключові слова у вашому резюме:",
+        "missing_keywords": "Відсутні ключові слова:",
+        "ats_coverage": "Покриття ключових слів для ATS",
+        "ats_present": "Знайдені вимоги:",
+        "ats_absent": "Відсутні вимоги:",
         "generated_cover_letter": "Створений супровідний лист",
         "ai_cover_letter_note": "Це супровідний лист, створений ШІ. Перевірте та персоналізуйте його перед використанням.",
         "copy_clipboard": "Копіювати в буфер обміну",
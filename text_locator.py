@@ -0,0 +1,221 @@
+import re
+from collections import deque
+
+# Characters the LLM commonly rewrites when quoting the CV back to us
+FOLD_EQUIVALENTS = {
+    "‘": "'", "’": "'", "‚": "'", "′": "'",
+    "“": '"', "”": '"', "„": '"', "″": '"',
+    "‐": "-", "‑": "-", "‒": "-", "–": "-", "—": "-", "−": "-",
+    "•": "*", "·": "*"
+}
+FOLD_TABLE = str.maketrans(FOLD_EQUIVALENTS)
+WHITESPACE_RUN = re.compile(r"[^\S ]\s*| \s+")  # Any whitespace other than a single plain space
+
+
+def _fold_char(char, _cache={}):
+    folded = _cache.get(char)
+    if folded is None:
+        folded = FOLD_EQUIVALENTS.get(char) or char.casefold()
+        _cache[char] = folded
+    return folded
+
+
+def normalize_phrase(phrase):
+    """
+    Fold a phrase the same way TextLocator folds the indexed text.
+
+    Args:
+        phrase (str): Text to normalize
+
+    Returns:
+        str: Case-folded text with typographic quotes/dashes unified and whitespace collapsed
+    """
+    return " ".join("".join(_fold_char(char) for char in (phrase or "")).split())
+
+
+class _AhoCorasick:
+    """Aho-Corasick automaton over a set of folded phrases."""
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for pattern_id, pattern in enumerate(patterns):
+            state = 0
+            for char in pattern:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = next_state
+            self.output[state].append((pattern_id, len(pattern)))
+
+        # Breadth-first pass to set failure links and merge outputs
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                if self.output[self.fail[next_state]]:
+                    self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def search(self, text):
+        """
+        Yield (pattern_id, start_index) for every occurrence of every pattern in text.
+        """
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        state = 0
+        for index, char in enumerate(text):
+            next_state = goto[state].get(char)
+            while next_state is None:
+                if not state:
+                    next_state = 0
+                    break
+                state = fail[state]
+                next_state = goto[state].get(char)
+            state = next_state
+            if output[state]:
+                for pattern_id, length in output[state]:
+                    yield pattern_id, index + 1 - length
+
+
+class TextLocator:
+    """
+    Finds where quoted phrases occur in a CV.
+
+    The text is folded once into an index (case-folded, typographic punctuation
+    unified, whitespace runs collapsed to one space) together with a map from every
+    index position back to its offset in the original text. All phrases are then
+    resolved in a single Aho-Corasick pass over the index, so the cost is linear in
+    the text length plus the number of matches instead of one scan per phrase.
+    """
+
+    def __init__(self, text):
+        self.text = text or ""
+        folded = self.text.translate(FOLD_TABLE).casefold()
+        if len(folded) == len(self.text):
+            self.index, self.offsets = self._collapse_whitespace(folded)
+        else:
+            # Some characters fold to several (e.g. "ß" -> "ss"), map them one by one
+            self.index, self.offsets = self._fold_per_char(self.text)
+
+    @staticmethod
+    def _collapse_whitespace(folded):
+        parts = []
+        offsets = []
+        position = 0
+        for match in WHITESPACE_RUN.finditer(folded):
+            start, end = match.span()
+            if start > position:
+                parts.append(folded[position:start])
+                offsets.extend(range(position, start))
+            # Runs of whitespace become one space, mapped to the first whitespace character
+            if parts:
+                parts.append(" ")
+                offsets.append(start)
+            position = end
+        if position < len(folded):
+            parts.append(folded[position:])
+            offsets.extend(range(position, len(folded)))
+        return "".join(parts), offsets
+
+    @staticmethod
+    def _fold_per_char(text):
+        folded = []
+        offsets = []
+        previous_space = True
+        for offset, char in enumerate(text):
+            if char.isspace():
+                if not previous_space:
+                    folded.append(" ")
+                    offsets.append(offset)
+                    previous_space = True
+                continue
+            previous_space = False
+            for folded_char in _fold_char(char):
+                folded.append(folded_char)
+                offsets.append(offset)
+        return "".join(folded), offsets
+
+    def _span(self, index_start, length):
+        start = self.offsets[index_start]
+        end = self.offsets[index_start + length - 1] + 1
+        return start, end
+
+    def find_all(self, phrases):
+        """
+        Find every occurrence of each phrase.
+
+        Args:
+            phrases (list): Phrases to look for
+
+        Returns:
+            list: For each phrase, a list of (start, end) spans in the original text, in text order
+        """
+        normalized = [normalize_phrase(phrase) for phrase in phrases]
+        pattern_ids = {}
+        for pattern in normalized:
+            if pattern and pattern not in pattern_ids:
+                pattern_ids[pattern] = len(pattern_ids)
+
+        occurrences = [[] for _ in pattern_ids]
+        if pattern_ids:
+            automaton = _AhoCorasick(list(pattern_ids))
+            lengths = [len(pattern) for pattern in pattern_ids]
+            for pattern_id, index_start in automaton.search(self.index):
+                occurrences[pattern_id].append(self._span(index_start, lengths[pattern_id]))
+
+        return [occurrences[pattern_ids[pattern]] if pattern else [] for pattern in normalized]
+
+    def locate_all(self, phrases):
+        """
+        Pick one position for each phrase.
+
+        Exact (case-sensitive) occurrences are preferred over folded ones. When the
+        same phrase is requested several times, each request gets the next
+        occurrence that has not been handed out yet, so repeated suggestions point
+        at repeated passages instead of all at the first one.
+
+        Args:
+            phrases (list): Phrases to locate
+
+        Returns:
+            list: For each phrase, a (start, end) span in the original text, or None if not found
+        """
+        spans = []
+        claimed = set()
+        for phrase, candidates in zip(phrases, self.find_all(phrases)):
+            if not candidates:
+                spans.append(None)
+                continue
+
+            exact = [span for span in candidates if self.text[span[0]:span[1]] == phrase]
+            ordered = exact + [span for span in candidates if self.text[span[0]:span[1]] != phrase]
+            span = next((span for span in ordered if span not in claimed), ordered[0])
+            claimed.add(span)
+            spans.append(span)
+
+        return spans
+
+    def locate(self, phrase):
+        """
+        Locate a single phrase.
+
+        Args:
+            phrase (str): Phrase to locate
+
+        Returns:
+            tuple: (start, end) span in the original text, or None if not found
+        """
+        return self.locate_all([phrase])[0]
@@ -0,0 +1,105 @@
+#!/bin/env python3
+import os
+import time
+import logging
+import argparse
+import threading
+import traceback
+from datetime import datetime, timedelta
+from app import app, db, AnalysisJob, process_analysis_job
+
+# Worker configuration
+WORKER_THREADS = int(os.environ.get("ANALYSIS_WORKER_THREADS", "4"))
+POLL_INTERVAL = float(os.environ.get("ANALYSIS_POLL_INTERVAL", "1.0"))  # Seconds between queue polls when idle
+STALE_JOB_SECONDS = int(os.environ.get("ANALYSIS_STALE_JOB_SECONDS", "600"))  # Running jobs older than this are requeued
+
+
+def claim_next_job():
+    """
+    Atomically move the oldest pending job to the running state.
+
+    Returns:
+        str: The claimed job ID, or None if the queue is empty
+    """
+    job = AnalysisJob.query.filter_by(status='pending').order_by(AnalysisJob.created_at).first()
+    if not job:
+        db.session.rollback()
+        return None
+
+    # Only one worker wins the conditional update
+    claimed = AnalysisJob.query.filter_by(id=job.id, status='pending').update(
+        {"status": "running", "started_at": datetime.utcnow()},
+        synchronize_session=False
+    )
+    db.session.commit()
+    return job.id if claimed else None
+
+
+def requeue_stale_jobs():
+    """Return jobs left running by a crashed worker to the queue."""
+    cutoff = datetime.utcnow() - timedelta(seconds=STALE_JOB_SECONDS)
+    requeued = AnalysisJob.query.filter(
+        AnalysisJob.status == 'running',
+        AnalysisJob.started_at < cutoff
+    ).update({"status": "pending", "started_at": None}, synchronize_session=False)
+    db.session.commit()
+    if requeued:
+        logging.warning(f"Requeued {requeued} stale analysis jobs")
+
+
+def work_loop(stop_event):
+    """Process queued analysis jobs until stop_event is set."""
+    with app.app_context():
+        while not stop_event.is_set():
+            try:
+                job_id = claim_next_job()
+                if not job_id:
+                    stop_event.wait(POLL_INTERVAL)
+                    continue
+
+                logging.info(f"Processing analysis job {job_id}")
+                process_analysis_job(job_id)
+            except Exception as e:
+                db.session.rollback()
+                logging.error(f"Analysis worker error: {str(e)}")
+                logging.error(traceback.format_exc())
+                stop_event.wait(POLL_INTERVAL)
+            finally:
+                db.session.remove()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Process queued CV analysis jobs.")
+    parser.add_argument("--threads", type=int, default=WORKER_THREADS, help="Number of worker threads")
+    args = parser.parse_args()
+
+    with app.app_context():
+        requeue_stale_jobs()
+
+    stop_event = threading.Event()
+    threads = []
+    for index in range(args.threads):
+        thread = threading.Thread(target=work_loop, args=(stop_event,), name=f"analysis-worker-{index}", daemon=True)
+        thread.start()
+        threads.append(thread)
+
+    logging.info(f"Started {args.threads} analysis worker threads")
+
+    try:
+        while True:
+            time.sleep(STALE_JOB_SECONDS)
+            with app.app_context():
+                try:
+                    requeue_stale_jobs()
+                except Exception as e:
+                    db.session.rollback()
+                    logging.error(f"Error requeueing stale jobs: {str(e)}")
+    except KeyboardInterrupt:
+        logging.info("Stopping analysis workers")
+        stop_event.set()
+        for thread in threads:
+            thread.join()
+
+
+if __name__ == "__main__":
+    main()